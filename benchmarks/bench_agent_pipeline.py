@@ -0,0 +1,132 @@
+"""
+Agent Pipeline Benchmark
+Throughput of AgentManager.process_contacts with stubbed LLM agents
+(simulated latency, no network): the sequential baseline
+(concurrency 1) against the staged concurrent pipeline.
+
+The personalizer sleeps --latency per call; the reviewer makes
+1 + 2 x revisions calls of --latency each (evaluate, then revise and
+re-evaluate), like ReviewerAgent when a message is rejected.
+
+Usage:
+    python benchmarks/bench_agent_pipeline.py --contacts 60 --latency 0.4 --concurrency 1 4 8
+"""
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.agent_manager import AgentManager
+from modules.coffee_chat_agents import ContactRankerAgent, ScamDetectionAgent
+from modules.data_validator import DataValidator
+from modules.hidden_job_detector import HiddenJobDetector
+
+
+class StubPersonalizer:
+    model = "stub-model"
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def generate_connection_message(self, contact):
+        time.sleep(self.latency)
+        return f"Hi {contact['name']}, I'd love to hear about your work at {contact['company']}."
+
+
+class StubReviewer:
+    model = "stub-model"
+
+    def __init__(self, latency: float, revisions: int):
+        self.latency = latency
+        self.revisions = revisions
+
+    def review_message(self, message, contact):
+        time.sleep(self.latency * (1 + 2 * self.revisions))
+        return message
+
+
+class StubMemory:
+    def contacted_ids(self, contact_ids):
+        return set()
+
+
+class StubRateLimiter:
+    def can_send_note(self):
+        return True
+
+
+def make_manager(latency: float, revisions: int, concurrency: int) -> AgentManager:
+    """AgentManager with real local filters and stubbed LLM agents"""
+    manager = AgentManager.__new__(AgentManager)
+    manager.validator = DataValidator()
+    manager.scam_detector = ScamDetectionAgent()
+    manager.ranker = ContactRankerAgent()
+    manager.hidden_job_detector = HiddenJobDetector()
+    manager.personalizer = StubPersonalizer(latency)
+    manager.reviewer = StubReviewer(latency, revisions)
+    manager.memory = StubMemory()
+    manager.rate_limiter = StubRateLimiter()
+    manager.note_concurrency = concurrency
+    manager.review_concurrency = concurrency
+    return manager
+
+
+def make_contacts(n: int, rng: random.Random):
+    """Synthetic search results; most are high-scoring alumni that get a note"""
+    return [
+        {
+            "name": f"Alex Chen {i}",
+            "company": rng.choice(["Shopify", "RBC", "D2L", "Coursera"]),
+            "title": "Learning Designer",
+            "connection_degree": "2nd",
+            "is_alumni": rng.random() < 0.8,
+            "domain_verified": True,
+            "mutual_connections": [f"m{j}" for j in range(10)],
+            "connections_count": 400,
+            "work_history": ["a", "b"],
+            "linkedin_url": f"https://www.linkedin.com/in/alex-chen-{i}",
+        }
+        for i in range(n)
+    ]
+
+
+def run(n_contacts: int, latency: float, revisions: int, concurrency_levels: list) -> dict:
+    """Run each concurrency level; returns {mode: {seconds, contacts_per_min, notes}}"""
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    print(f"Agent pipeline benchmark: {n_contacts} contacts, stub latency {latency * 1000:.0f}ms, "
+          f"{revisions} revision(s)")
+    print(f"{'mode':<28} {'time':>8} {'contacts/min':>14} {'notes':>7}")
+    print("-" * 60)
+    modes = {}
+    for concurrency in concurrency_levels:
+        manager = make_manager(latency, revisions, concurrency)
+        contacts = make_contacts(n_contacts, random.Random(7))
+        start = time.perf_counter()
+        results = manager.process_contacts_sync(contacts)
+        elapsed = time.perf_counter() - start
+        label = "sequential" if concurrency == 1 else f"staged (concurrency={concurrency})"
+        notes = sum(1 for contact in results if contact.get('note'))
+        print(f"{label:<28} {elapsed:7.2f}s {len(results) / elapsed * 60:14.0f} {notes:7d}")
+        modes[label] = {
+            "seconds": round(elapsed, 3),
+            "contacts_per_min": round(len(results) / elapsed * 60, 1),
+            "notes": notes
+        }
+    return modes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--contacts', type=int, default=40)
+    parser.add_argument('--latency', type=float, default=0.3, help="Seconds per simulated LLM call")
+    parser.add_argument('--revisions', type=int, default=0, help="Reviewer revision rounds per message")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 8])
+    args = parser.parse_args()
+
+    run(args.contacts, args.latency, args.revisions, args.concurrency)
@@ -0,0 +1,87 @@
+"""
+ATS Batch Scoring Benchmark
+Per-pair TF-IDF refits (score_resume's similarity step) vs one
+corpus-wide fit in score_resume_against_jobs, at 1k/10k/50k JDs.
+
+The per-pair path is timed on a sample and extrapolated, since 50k refits
+would take minutes.
+
+Usage:
+    python benchmarks/bench_ats_batch.py --sizes 1000 10000 50000
+"""
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.metrics.pairwise import cosine_similarity
+
+VOCAB = (
+    "python sql aws docker kubernetes react instructional design learning development "
+    "lms articulate storyline curriculum elearning workflow automation zapier n8n rpa "
+    "stakeholder management agile scrum product roadmap analytics tableau excel training "
+    "onboarding facilitation assessment evaluation adult learning theory ai machine "
+    "llm prompt engineering project management communication leadership budget vendor"
+).split()
+
+RESUME = (
+    "Instructional designer with 5 years building elearning in Articulate Storyline "
+    "and LMS administration. Automated onboarding workflows with Zapier and Python, "
+    "led AI pilot programs and stakeholder training across Ontario."
+)
+
+
+def make_jds(n: int, seed: int = 7):
+    """Synthetic JDs of ~120 words drawn from a skewed skill vocabulary"""
+    rng = random.Random(seed)
+    weights = [1 / (i + 1) for i in range(len(VOCAB))]
+    return [" ".join(rng.choices(VOCAB, weights=weights, k=120)) for _ in range(n)]
+
+
+def run(sizes, pair_sample: int) -> dict:
+    """Time each corpus size; returns {n_jds: {per_pair_seconds, batch_seconds, pairs_per_sec}}"""
+    from modules.ats_scorer import ATSScorer
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    scorer = ATSScorer(spill_to_redis=False)
+
+    print(f"{'JDs':>7} {'per-pair (est.)':>16} {'batch':>9} {'speedup':>9} {'pairs/s':>10}")
+    print("-" * 56)
+    sizes_out = {}
+
+    for n in sizes:
+        jds = make_jds(n)
+
+        sample = jds[:min(pair_sample, n)]
+        start = time.perf_counter()
+        for jd in sample:
+            vectors = scorer.vectorizer.fit_transform([RESUME, jd])
+            cosine_similarity(vectors[0:1], vectors[1:2])
+        per_pair = (time.perf_counter() - start) / len(sample) * n
+
+        start = time.perf_counter()
+        results = scorer.score_resume_against_jobs(RESUME, jds)
+        batch = time.perf_counter() - start
+        assert len(results) == n
+
+        print(f"{n:>7} {per_pair:>15.2f}s {batch:>8.2f}s {per_pair / batch:>8.0f}x {n / batch:>10.0f}")
+        sizes_out[str(n)] = {
+            "per_pair_seconds": round(per_pair, 3),
+            "batch_seconds": round(batch, 3),
+            "pairs_per_sec": round(n / batch, 1)
+        }
+    return sizes_out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--pair-sample', type=int, default=200, help="Pairs timed for the per-pair estimate")
+    args = parser.parse_args()
+
+    run(args.sizes, args.pair_sample)
@@ -0,0 +1,122 @@
+"""
+Cache Codec Benchmark
+Bytes stored and encode/decode time per cached job for the legacy
+json.dumps(default=str) format vs CacheCodec serializer/compression combos.
+
+Jobs are Apify items run through JobScraper._process_job_data. Pass an
+exported dataset (JSON array or JSON Lines) for real scraped data; the
+default is the test fixture with descriptions padded to typical Indeed
+length (~3.5 KB).
+
+Usage:
+    python benchmarks/bench_cache_codec.py
+    python benchmarks/bench_cache_codec.py --dataset exports/indeed_run.jsonl
+"""
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("APIFY_API_TOKEN", "bench")
+
+FIXTURE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "tests", "fixtures", "apify_indeed_items.json"
+)
+
+JD_VOCAB = (
+    "we are looking for a learning experience designer to partner with subject matter experts "
+    "build storyboards and develop interactive elearning in articulate storyline rise you will "
+    "manage the lms analyze learner data iterate on curriculum using ai tools stakeholders "
+    "onboarding compliance training programs instructional design models addie sam kirkpatrick "
+    "evaluation accessibility wcag video production facilitation workshops remote hybrid toronto "
+    "benefits dental vision pension flexible hours salary range equal opportunity employer "
+    "requirements bachelor degree years experience portfolio communication collaboration agile"
+).split()
+
+
+def make_description(rng: random.Random, words: int = 550) -> str:
+    """JD-length text with realistic (word-level) entropy, so compression ratios are honest"""
+    return " ".join(rng.choices(JD_VOCAB, k=words)).capitalize() + "."
+
+
+def load_jobs(dataset_path: str, pad: bool):
+    from modules.job_scraper import JobScraper, JsonFileDataset
+    logging.getLogger("scraper").setLevel(logging.CRITICAL)
+
+    scraper = JobScraper()
+    rng = random.Random(7)
+    items = JsonFileDataset(dataset_path).list_items().items
+    jobs = []
+    for item in items:
+        if pad:
+            item = dict(item, descriptionText=(item.get("descriptionText") or "") + " " + make_description(rng))
+        job = scraper._process_job_data(item)
+        if job:
+            jobs.append(job)
+    return jobs
+
+
+def bench(label: str, encode, decode, jobs, rounds: int):
+    blobs = [encode(job) for job in jobs]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for job in jobs:
+            encode(job)
+    encode_us = (time.perf_counter() - start) / (rounds * len(jobs)) * 1e6
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for blob in blobs:
+            decode(blob)
+    decode_us = (time.perf_counter() - start) / (rounds * len(jobs)) * 1e6
+
+    decoded = decode(blobs[0])
+    typed = type(decoded.get("posted_date")).__name__ if isinstance(decoded, dict) else "?"
+    avg_bytes = sum(len(blob) for blob in blobs) / len(blobs)
+    print(f"{label:<22} {avg_bytes:>9.0f} {encode_us:>10.1f} {decode_us:>10.1f}   {typed}")
+    return avg_bytes
+
+
+def run(dataset_path: str, pad: bool, rounds: int):
+    from modules.cache_codec import CacheCodec, zstandard
+
+    jobs = load_jobs(dataset_path, pad)
+    # Repeat small datasets so timings are stable
+    while len(jobs) < 200:
+        jobs = jobs + [dict(job, job_url=f"{job['job_url']}#{len(jobs)}") for job in jobs]
+    print(f"Cache codec benchmark: {len(jobs)} jobs from {os.path.basename(dataset_path)}")
+    print(f"{'codec':<22} {'avg bytes':>9} {'encode us':>10} {'decode us':>10}   posted_date")
+    print("-" * 66)
+
+    baseline = bench(
+        "json (legacy)",
+        lambda job: json.dumps(job, default=str).encode("utf-8"),
+        json.loads,
+        jobs, rounds
+    )
+    combos = [("json", None), ("json", "zlib"), ("msgpack", None), ("msgpack", "zlib")]
+    if zstandard is not None:
+        combos += [("json", "zstd"), ("msgpack", "zstd")]
+    for serializer, compression in combos:
+        codec = CacheCodec(serializer=serializer, compression=compression)
+        size = bench(f"{serializer}+{compression or 'none'}", codec.encode, codec.decode, jobs, rounds)
+        if compression:
+            print(f"{'':<22} {size / baseline:>8.0%} of legacy size")
+    if zstandard is None:
+        print("(zstd skipped: pip install zstandard)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dataset', default=FIXTURE, help="Apify dataset export (.json or .jsonl)")
+    parser.add_argument('--no-pad', action='store_true', help="Use descriptions as-is")
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    run(args.dataset, not args.no_pad, args.rounds)
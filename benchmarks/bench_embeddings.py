@@ -0,0 +1,139 @@
+"""
+Embedding Backend Benchmark
+Throughput and neighbour recall of the local hashed TF-IDF backend, and of
+OpenAI text-embedding-3-small when OPENAI_API_KEY is set.
+
+Corpus: synthetic contact profiles built the way CoffeeChatMemory builds
+them ("<title> at <company>. Alumni of <school>."). Queries are perturbed
+versions of a profile (case, plurals, seniority prefixes, dropped school)
+and a hit is any profile with the same title family and company.
+
+Reported:
+  texts/s      embedding throughput (batched, per backend/worker setting)
+  recall@k     fraction of the relevant profiles found in the top k
+  agree@k      overlap of the local top k with OpenAI's top k (remote only)
+
+Usage:
+    python benchmarks/bench_embeddings.py
+    python benchmarks/bench_embeddings.py --profiles 5000 --queries 200 --workers 1 4
+    OPENAI_API_KEY=... python benchmarks/bench_embeddings.py --remote
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TITLE_FAMILIES = {
+    "learning designer": ["Learning Designer", "Learning Experience Designer", "Learning Design Lead"],
+    "instructional designer": ["Instructional Designer", "Senior Instructional Designer", "Instructional Design Specialist"],
+    "software engineer": ["Software Engineer", "Backend Software Engineer", "Software Developer"],
+    "data scientist": ["Data Scientist", "Applied Data Scientist", "Machine Learning Scientist"],
+    "product manager": ["Product Manager", "Senior Product Manager", "Technical Product Manager"],
+    "recruiter": ["Technical Recruiter", "Talent Acquisition Partner", "Recruiter"],
+    "ux researcher": ["UX Researcher", "User Researcher", "Design Researcher"],
+    "hr manager": ["HR Manager", "People Partner", "HR Business Partner"],
+}
+COMPANIES = ["Shopify", "Amazon", "RBC", "Coursera", "D2L", "Wealthsimple", "Google", "TD Bank", "Ubisoft", "Cohere",
+             "OpenText", "Kinaxis", "Telus", "Rogers", "Lightspeed", "Top Hat"]
+SCHOOLS = ["University of Western Ontario", "University of Toronto", "McGill University", "UBC", "Queen's University", ""]
+QUERY_PREFIXES = ["", "Senior ", "Sr. ", "Lead ", "Associate "]
+
+
+def make_corpus(n: int, rng: random.Random):
+    profiles = []
+    for _ in range(n):
+        family = rng.choice(list(TITLE_FAMILIES))
+        company = rng.choice(COMPANIES)
+        school = rng.choice(SCHOOLS)
+        text = f"{rng.choice(TITLE_FAMILIES[family])} at {company}. "
+        if school:
+            text += f"Alumni of {school}. "
+        profiles.append({"family": family, "company": company, "text": text})
+    return profiles
+
+
+def make_queries(profiles, n: int, rng: random.Random):
+    queries = []
+    for profile in rng.sample(profiles, min(n, len(profiles))):
+        title = rng.choice(TITLE_FAMILIES[profile["family"]])
+        if rng.random() < 0.5:
+            title = title.lower() + "s"
+        text = f"{rng.choice(QUERY_PREFIXES)}{title} at {profile['company']}"
+        relevant = {i for i, p in enumerate(profiles) if p["family"] == profile["family"] and p["company"] == profile["company"]}
+        queries.append({"text": text, "relevant": relevant})
+    return queries
+
+
+def timed_embed(provider, texts):
+    start = time.perf_counter()
+    vectors = provider.embed(texts)
+    return vectors, len(texts) / (time.perf_counter() - start)
+
+
+def top_k(np, corpus_vectors, query_vectors, k):
+    corpus = np.asarray(corpus_vectors, dtype=np.float32)
+    corpus /= np.linalg.norm(corpus, axis=1, keepdims=True) + 1e-12
+    queries = np.asarray(query_vectors, dtype=np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True) + 1e-12
+    scores = queries @ corpus.T
+    return [list(row) for row in np.argsort(-scores, axis=1)[:, :k]]
+
+
+def recall(neighbours, queries, k):
+    total = 0.0
+    for found, query in zip(neighbours, queries):
+        total += len(set(found) & query["relevant"]) / min(k, len(query["relevant"]))
+    return total / len(queries)
+
+
+def run(n_profiles: int, n_queries: int, k: int, dims: list, workers: list, remote: bool):
+    import numpy as np
+    from modules.embedding_provider import HashingEmbeddingProvider, OpenAIEmbeddingProvider
+
+    rng = random.Random(11)
+    profiles = make_corpus(n_profiles, rng)
+    queries = make_queries(profiles, n_queries, rng)
+    corpus_texts = [p["text"] for p in profiles]
+    query_texts = [q["text"] for q in queries]
+    print(f"Embedding benchmark: {len(corpus_texts)} profiles, {len(query_texts)} queries, k={k}")
+    print(f"{'backend':<34} {'texts/s':>10} {f'recall@{k}':>10} {f'agree@{k}':>10}")
+    print("-" * 68)
+
+    remote_neighbours = None
+    if remote:
+        provider = OpenAIEmbeddingProvider()
+        corpus_vectors, rate = timed_embed(provider, corpus_texts)
+        query_vectors = provider.embed(query_texts)
+        remote_neighbours = top_k(np, corpus_vectors, query_vectors, k)
+        print(f"{provider.model:<34} {rate:>10.0f} {recall(remote_neighbours, queries, k):>10.1%} {'-':>10}")
+
+    for dimensions in dims:
+        for worker_count in workers:
+            provider = HashingEmbeddingProvider(dimensions=dimensions, max_workers=worker_count)
+            corpus_vectors, rate = timed_embed(provider, corpus_texts)
+            neighbours = top_k(np, corpus_vectors, provider.embed(query_texts), k)
+            agree = "-"
+            if remote_neighbours is not None:
+                overlap = sum(len(set(a) & set(b)) for a, b in zip(neighbours, remote_neighbours))
+                agree = f"{overlap / (k * len(queries)):.1%}"
+            label = f"{provider.model} ({worker_count} thread{'s' if worker_count > 1 else ''})"
+            print(f"{label:<34} {rate:>10.0f} {recall(neighbours, queries, k):>10.1%} {agree:>10}")
+    if not remote:
+        print("(remote model skipped: pass --remote with OPENAI_API_KEY set)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profiles', type=int, default=2000)
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('-k', type=int, default=10)
+    parser.add_argument('--dims', type=int, nargs='+', default=[256, 512, 1024])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4])
+    parser.add_argument('--remote', action='store_true', help="Also benchmark OpenAI embeddings")
+    args = parser.parse_args()
+
+    run(args.profiles, args.queries, args.k, args.dims, args.workers, args.remote)
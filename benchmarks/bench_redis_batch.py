@@ -0,0 +1,111 @@
+"""
+Redis Job Cache Benchmark
+Per-job get_cached_job + cache_job (two round trips per job) vs
+get_cached_jobs (MGET) + cache_jobs (pipelined SETEX) per chunk.
+
+Uses a real Redis when --redis-url is given, otherwise an in-process
+fakeredis TCP server (real sockets, loopback latency only).
+
+Usage:
+    python benchmarks/bench_redis_batch.py --sizes 10 100 500 1000
+    python benchmarks/bench_redis_batch.py --redis-url redis://localhost:6379/15
+"""
+import os
+import sys
+import time
+import logging
+import argparse
+import threading
+from urllib.parse import urlparse
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_jobs(n: int, prefix: str):
+    """Synthetic processed jobs keyed by URL"""
+    return {
+        f"https://example.com/{prefix}/{i}": {
+            "title": f"Instructional Designer {i}",
+            "company": f"EdTech Co {i % 37}",
+            "description": "Design learning experiences with AI tools. " * 20,
+            "job_url": f"https://example.com/{prefix}/{i}",
+        }
+        for i in range(n)
+    }
+
+
+def start_fake_server():
+    from fakeredis import TcpFakeServer
+    server = TcpFakeServer(("127.0.0.1", 0), server_type="redis")
+    # The fake server flushes each pipelined reply separately; without
+    # TCP_NODELAY, Nagle + delayed ACK adds ~40ms to every batched call
+    server.RequestHandlerClass.disable_nagle_algorithm = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"redis://127.0.0.1:{server.server_address[1]}/0"
+
+
+def count_round_trips(client):
+    """Count connection checkouts: one per command, one per pipeline execute"""
+    counter = {"n": 0}
+    pool = client.connection_pool
+    get_connection = pool.get_connection
+
+    def _counted(*args, **kwargs):
+        counter["n"] += 1
+        return get_connection(*args, **kwargs)
+
+    pool.get_connection = _counted
+    return counter
+
+
+def run(sizes, redis_url: str):
+    parsed = urlparse(redis_url)
+    os.environ["REDIS_HOST"] = parsed.hostname
+    os.environ["REDIS_PORT"] = str(parsed.port or 6379)
+    os.environ["REDIS_DB"] = (parsed.path or "/0").lstrip("/") or "0"
+
+    from modules.cache_manager import CacheManager
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    cache = CacheManager()
+    assert not cache.demo_mode, f"Redis not reachable at {redis_url}"
+    round_trips = count_round_trips(cache.redis_client)
+
+    print(f"{'jobs':>6} {'mode':<9} {'time':>9} {'jobs/s':>9} {'round trips':>12}")
+    print("-" * 50)
+    for n in sizes:
+        for mode in ("per-job", "batch"):
+            # Half of each chunk is already cached, as on a re-scrape
+            jobs = make_jobs(n, f"{mode}-{n}")
+            cache.cache_jobs(dict(list(jobs.items())[:n // 2]))
+
+            round_trips["n"] = 0
+            start = time.perf_counter()
+            if mode == "per-job":
+                for job_url, job_data in jobs.items():
+                    if cache.get_cached_job(job_url) is None:
+                        cache.cache_job(job_url, job_data)
+            else:
+                cached = cache.get_cached_jobs(list(jobs))
+                cache.cache_jobs({url: job for url, job in jobs.items() if url not in cached})
+            elapsed = time.perf_counter() - start
+
+            print(f"{n:>6} {mode:<9} {elapsed * 1000:>7.1f}ms {n / elapsed:>9.0f} {round_trips['n']:>12}")
+        cache.clear_cache("job:https://example.com/*")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 50, 100, 500, 1000])
+    parser.add_argument('--redis-url', default=os.getenv("BENCH_REDIS_URL"))
+    args = parser.parse_args()
+
+    server = None
+    if not args.redis_url:
+        server, args.redis_url = start_fake_server()
+    try:
+        run(args.sizes, args.redis_url)
+    finally:
+        if server:
+            server.shutdown()
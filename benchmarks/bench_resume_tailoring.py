@@ -0,0 +1,109 @@
+"""
+Resume Tailoring Benchmark
+Resumes tailored per minute through the LLM gateway's 'resume' route
+against the local stub LLM server (no network, no API cost): sequential
+calls vs a thread pool, for AIAgent.optimize_resume and
+ResumeGenerator.tailor_resume.
+
+Throughput is capped by LLM_ROUTES['resume'] (concurrency and rpm), so the
+pooled numbers show the configured ceiling, not just the stub latency.
+
+Usage:
+    python benchmarks/bench_resume_tailoring.py --resumes 20 --latency 0.3 --concurrency 4
+"""
+import os
+import sys
+import time
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stub_llm_server import StubLLMServer, TAILORED_RESUME
+
+MASTER_RESUME = {
+    "name": "Stub Candidate",
+    "summary": "Instructional designer with 5 years of elearning and LMS experience.",
+    "experience": [
+        {"company": "EdTech Co", "role": "Instructional Designer", "duration": "2020 - Present",
+         "bullets": ["Built elearning modules", "Ran LMS administration"]},
+        {"company": "Training Inc", "role": "Training Coordinator", "duration": "2017 - 2020",
+         "bullets": ["Coordinated onboarding", "Facilitated workshops"]}
+    ],
+    "skills": ["Instructional Design", "Articulate Storyline", "LMS"],
+    "education": "M.Ed., University of Toronto"
+}
+
+
+def make_jds(n: int):
+    """Synthetic job descriptions, distinct so nothing is served from a cache"""
+    return [
+        (f"Learning Experience Designer {i}", f"EdTech Co {i % 13}",
+         f"Posting {i}: design learning programs with AI tools, Storyline and workflow automation. " * 12)
+        for i in range(n)
+    ]
+
+
+def run(n_resumes: int, latency: float, jitter: float, error_rate: float, concurrency: int) -> dict:
+    """Run each tailoring path; returns {mode: {seconds, resumes_per_min, tailored}}"""
+    stub = StubLLMServer(latency=latency, jitter=jitter, error_rate=error_rate, seed=7).start()
+    os.environ["OPENAI_BASE_URL"] = stub.base_url
+    os.environ["OPENAI_API_KEY"] = "stub"
+
+    from modules.ai_agent import AIAgent
+    from modules.llm_gateway import llm_gateway
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    paths = {"optimize_resume": lambda jd: AIAgent().optimize_resume(MASTER_RESUME, jd[2])}
+    try:
+        from modules.resume_generator import ResumeGenerator
+        generator = ResumeGenerator()
+        paths["tailor_resume"] = lambda jd: generator.tailor_resume(MASTER_RESUME, jd[2], jd[0], jd[1])
+    except ImportError as e:
+        print(f"tailor_resume skipped: {e}")
+
+    jds = make_jds(n_resumes)
+    print(f"Resume tailoring benchmark: {n_resumes} resumes, stub latency {latency * 1000:.0f}ms, "
+          f"429 rate {error_rate:.0%}")
+    print(f"{'mode':<36} {'time':>8} {'resumes/min':>12} {'tailored':>9}")
+    print("-" * 68)
+
+    modes = {}
+    for name, tailor in paths.items():
+        for workers in (1, concurrency):
+            llm_gateway.reset_limits()
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(tailor, jds))
+            elapsed = time.perf_counter() - start
+            # Failures fall back to the master resume; count only real answers
+            tailored = sum(1 for result in results if result.get("summary") == TAILORED_RESUME["summary"])
+            label = f"{name} ({'sequential' if workers == 1 else f'{workers} workers'})"
+            print(f"{label:<36} {elapsed:7.2f}s {n_resumes / elapsed * 60:12.1f} {tailored:9d}")
+            modes[label] = {
+                "seconds": round(elapsed, 3),
+                "resumes_per_min": round(n_resumes / elapsed * 60, 1),
+                "tailored": tailored
+            }
+
+    print("-" * 68)
+    for key, stats in llm_gateway.get_stats().items():
+        if key.startswith("resume/"):
+            print(f"{key}: {stats['calls']} calls, p50 {stats['latency_p50'] * 1000:.0f}ms, "
+                  f"p95 {stats['latency_p95'] * 1000:.0f}ms, ${stats['cost']:.4f}")
+    stub.stop()
+    return modes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resumes', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.3)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--concurrency', type=int, default=4)
+    args = parser.parse_args()
+
+    run(args.resumes, args.latency, args.jitter, args.error_rate, args.concurrency)
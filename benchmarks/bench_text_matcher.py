@@ -0,0 +1,209 @@
+"""
+Text Matcher Benchmark
+Keyword scans before and after KeywordMatcher on a corpus of long job
+descriptions and company posts, per call site:
+
+    _categorize_job          four category tables over title + description
+    _demo_score_job          role and salary tables
+    _analyze_post            hiring-signal tables plus a context snippet per hit
+    extract_company_domain   ATS/aggregator blocklist
+
+Each legacy scan is reproduced here, and its results are checked against
+the new code for every document. A second table times the two
+KeywordMatcher engines (str.find sweep vs trie automaton) as the keyword
+table grows. That is where AUTOMATON_MIN_KEYWORDS comes from.
+
+Usage:
+    python benchmarks/bench_text_matcher.py --docs 2000 --words 800
+"""
+import os
+import sys
+import time
+import random
+import string
+import logging
+import argparse
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("APIFY_API_TOKEN", "bench")
+
+from modules import text_matcher
+from modules.text_matcher import KeywordMatcher
+
+JD_VOCAB = (
+    "we are looking for a learning experience designer to partner with subject matter experts "
+    "build storyboards and develop interactive elearning in articulate storyline rise you will "
+    "manage the lms analyze learner data iterate on curriculum using ai tools stakeholders "
+    "onboarding compliance training programs instructional design models addie sam kirkpatrick "
+    "evaluation accessibility wcag video production facilitation workshops remote hybrid toronto "
+    "benefits dental vision pension flexible hours salary range equal opportunity employer "
+    "requirements bachelor degree years experience portfolio communication collaboration agile "
+    "python sql cloud platform services scalable engineers code review deploy monitoring"
+).split()
+
+POST_PHRASES = [
+    "we're hiring", "join our team", "growing team", "series b", "new office", "expanding",
+    "proud of our customers", "great quarter", "thank you to our community", "launch", "funding",
+]
+
+URLS = [
+    "https://careers.openai.com/apply/1", "https://boards.greenhouse.io/acme/jobs/2",
+    "https://www.shopify.com/careers", "https://acme.wd5.myworkdayjobs.com/x", "https://jobs.lever.co/d2l/3",
+    "https://apply.coursera.org/4", "https://ca.indeed.com/viewjob?jk=5", "https://hiring.rbc.com/6",
+]
+
+
+def make_corpus(n_docs: int, words: int, seed: int = 7):
+    """(title, description, company post) triples; descriptions of `words` words"""
+    rng = random.Random(seed)
+    titles = ["Instructional Designer", "Software Engineer", "AI Product Manager", "Data Analyst", "Trainer"]
+    corpus = []
+    for _ in range(n_docs):
+        description = " ".join(rng.choice(JD_VOCAB) for _ in range(words))
+        post = " ".join(rng.choice(JD_VOCAB) for _ in range(words // 4))
+        post += " " + " ".join(rng.sample(POST_PHRASES, 2)).title()
+        corpus.append((rng.choice(titles), description, post))
+    return corpus
+
+
+# ============================================================
+# Legacy scans (as they were before KeywordMatcher)
+# ============================================================
+
+def legacy_categorize(title, description):
+    text = f"{title} {description}".lower()
+    if any(kw in text for kw in ["edtech", "education technology", "instructional", "learning management", "lms"]):
+        return "edtech"
+    if any(kw in text for kw in ["ai product", "ai pm", "ai manager", "machine learning product"]):
+        return "ai_pm"
+    if any(kw in text for kw in ["automation", "workflow", "rpa", "process automation", "n8n", "zapier"]):
+        return "automation"
+    if any(kw in text for kw in ["learning development", "l&d", "training", "professional development"]):
+        return "l&d"
+    return "other"
+
+
+def legacy_demo_role(title, description):
+    title, description = title.lower(), description.lower()
+    if any(kw in title + description for kw in ['instructional', 'edtech', 'learning', 'training']):
+        return "edtech"
+    if any(kw in title + description for kw in ['ai', 'automation', 'workflow']):
+        return "ai"
+    return None
+
+
+def legacy_analyze_post(post_text):
+    from modules.hidden_job_detector import HIRING_SIGNALS
+
+    def extract_context(text, keyword, window=50):
+        text_lower = text.lower()
+        idx = text_lower.find(keyword.lower())
+        start = max(0, idx - window)
+        end = min(len(text), idx + len(keyword) + window)
+        return "..." + text[start:end] + "..."
+
+    signals = []
+    post_lower = post_text.lower()
+    for strength, keywords in HIRING_SIGNALS.items():
+        for keyword in keywords:
+            if keyword in post_lower:
+                signals.append({'keyword': keyword, 'strength': strength, 'context': extract_context(post_text, keyword)})
+    return signals
+
+
+def legacy_blocked(domain):
+    from modules.job_scraper import ATS_AND_AGGREGATOR_DOMAINS
+    return any(blocked in domain for blocked, _ in ATS_AND_AGGREGATOR_DOMAINS._keys.values())
+
+
+def _timed(fn, items):
+    start = time.perf_counter()
+    results = [fn(*item) for item in items]
+    return time.perf_counter() - start, results
+
+
+def run_call_sites(n_docs: int, words: int) -> dict:
+    """Legacy vs KeywordMatcher per call site; returns {site: {legacy_us, matcher_us, speedup}}"""
+    from modules.job_scraper import JobScraper, ATS_AND_AGGREGATOR_DOMAINS
+    from modules.ai_agent import DEMO_ROLE_MATCHER
+    from modules.hidden_job_detector import HiddenJobDetector
+    logging.getLogger("app").setLevel(logging.WARNING)
+    logging.getLogger("scraper").setLevel(logging.WARNING)
+
+    corpus = make_corpus(n_docs, words)
+    scraper = JobScraper.__new__(JobScraper)
+    detector = HiddenJobDetector()
+
+    def demo_role(title, description):
+        return DEMO_ROLE_MATCHER.first_label(title + description)
+
+    domains = [(url.split("//")[1].split("/")[0],) for url in URLS] * max(1, n_docs // len(URLS))
+    sites = {
+        "_categorize_job": (legacy_categorize, scraper._categorize_job, [(t, d) for t, d, _ in corpus]),
+        "_demo_score_job (roles)": (legacy_demo_role, demo_role, [(t, d) for t, d, _ in corpus]),
+        "_analyze_post": (legacy_analyze_post, detector._analyze_post, [(p,) for _, _, p in corpus]),
+        "domain blocklist": (legacy_blocked, ATS_AND_AGGREGATOR_DOMAINS.contains_any, domains),
+    }
+
+    avg_chars = sum(len(d) for _, d, _ in corpus) // len(corpus)
+    print(f"Call sites: {n_docs} documents, ~{avg_chars} chars per description")
+    print(f"{'call site':<26} {'legacy':>11} {'matcher':>11} {'speedup':>8}")
+    print("-" * 60)
+    results = {}
+    for name, (legacy, current, items) in sites.items():
+        legacy_time, expected = _timed(legacy, items)
+        matcher_time, actual = _timed(current, items)
+        assert actual == expected, f"{name}: results differ from the legacy scan"
+        legacy_us = legacy_time / len(items) * 1e6
+        matcher_us = matcher_time / len(items) * 1e6
+        print(f"{name:<26} {legacy_us:9.1f}us {matcher_us:9.1f}us {legacy_us / matcher_us:7.2f}x")
+        results[name] = {
+            "legacy_us": round(legacy_us, 2),
+            "matcher_us": round(matcher_us, 2),
+            "speedup": round(legacy_us / matcher_us, 2)
+        }
+    return results
+
+
+def run_engines(table_sizes, words: int) -> dict:
+    """find_all per document for each engine as the keyword table grows"""
+    rng = random.Random(11)
+    docs = [" ".join(rng.choice(JD_VOCAB) for _ in range(words)) for _ in range(20)]
+    print(f"\nEngines: find_all over {len(docs)} documents of ~{sum(map(len, docs)) // len(docs)} chars")
+    print(f"{'keywords':>9} {'str.find':>11} {'automaton':>11}")
+    print("-" * 34)
+    results = {}
+    threshold = text_matcher.AUTOMATON_MIN_KEYWORDS
+    try:
+        for size in table_sizes:
+            keywords = rng.sample(JD_VOCAB, 20) + [
+                "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 12))) for _ in range(size - 20)
+            ]
+            timings = {}
+            for engine, minimum in (("find", size + 1), ("automaton", 1)):
+                text_matcher.AUTOMATON_MIN_KEYWORDS = minimum
+                matcher = KeywordMatcher(keywords)
+                start = time.perf_counter()
+                for doc in docs:
+                    matcher.find_all(doc)
+                timings[engine] = (time.perf_counter() - start) / len(docs) * 1e6
+            print(f"{size:>9} {timings['find']:9.0f}us {timings['automaton']:9.0f}us")
+            results[str(size)] = {"find_us": round(timings['find'], 1), "automaton_us": round(timings['automaton'], 1)}
+    finally:
+        text_matcher.AUTOMATON_MIN_KEYWORDS = threshold
+    return results
+
+
+def run(n_docs: int, words: int, table_sizes) -> dict:
+    return {"call_sites": run_call_sites(n_docs, words), "engines": run_engines(table_sizes, words)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--docs', type=int, default=2000)
+    parser.add_argument('--words', type=int, default=800, help="Words per job description")
+    parser.add_argument('--table-sizes', type=int, nargs='+', default=[25, 100, 300, 1000, 3000])
+    args = parser.parse_args()
+
+    run(args.docs, args.words, args.table_sizes)
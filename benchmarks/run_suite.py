@@ -0,0 +1,161 @@
+"""
+Benchmark Suite
+Runs the throughput benchmarks against the local stub LLM server (no
+network) and saves one JSON file per run, so regressions show up between
+commits:
+
+    jobs scored / min          bench_job_scoring
+    contacts processed / min   bench_agent_pipeline
+    resumes tailored / min     bench_resume_tailoring
+    ATS pairs / sec            bench_ats_batch
+    keyword scan speedup       bench_text_matcher (call sites vs the legacy scans)
+
+Each run is written to benchmarks/results/<timestamp>_<commit>.json and
+compared with the previous file there (or --baseline).
+
+Usage:
+    python benchmarks/run_suite.py                 # quick sizes
+    python benchmarks/run_suite.py --full          # the scripts' default sizes
+    python benchmarks/run_suite.py --only jobs ats --baseline benchmarks/results/old.json
+"""
+import os
+import sys
+import json
+import glob
+import time
+import platform
+import argparse
+import subprocess
+import traceback
+from datetime import datetime
+from typing import Dict, Optional
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# Latency/jitter/error settings shared by every LLM benchmark
+STUB = {"latency": 0.2, "jitter": 0.05, "error_rate": 0.02}
+
+# name -> (headline metric, quick settings, full settings)
+SUITE = {
+    "jobs": ("jobs_per_min", {"n_jobs": 40}, {"n_jobs": 200}),
+    "contacts": ("contacts_per_min", {"n_contacts": 24}, {"n_contacts": 60}),
+    "resumes": ("resumes_per_min", {"n_resumes": 8}, {"n_resumes": 20}),
+    "ats": ("pairs_per_sec", {"sizes": [1000, 10000]}, {"sizes": [1000, 10000, 50000]}),
+    "text": ("speedup", {"n_docs": 500, "words": 800}, {"n_docs": 2000, "words": 800}),
+}
+
+
+def _run_benchmark(name: str, settings: Dict) -> Dict:
+    """Run one benchmark in-process; returns its per-mode results"""
+    if name == "jobs":
+        from benchmarks import bench_job_scoring
+        return bench_job_scoring.run(
+            settings["n_jobs"], STUB["latency"], STUB["error_rate"], concurrency=8, pack_size=10, jitter=STUB["jitter"]
+        )
+    if name == "contacts":
+        from benchmarks import bench_agent_pipeline
+        return bench_agent_pipeline.run(settings["n_contacts"], STUB["latency"], revisions=1, concurrency_levels=[1, 4, 8])
+    if name == "resumes":
+        from benchmarks import bench_resume_tailoring
+        return bench_resume_tailoring.run(
+            settings["n_resumes"], STUB["latency"], STUB["jitter"], STUB["error_rate"], concurrency=4
+        )
+    if name == "ats":
+        from benchmarks import bench_ats_batch
+        return bench_ats_batch.run(settings["sizes"], pair_sample=100)
+    if name == "text":
+        from benchmarks import bench_text_matcher
+        return bench_text_matcher.run_call_sites(settings["n_docs"], settings["words"])
+    raise ValueError(f"Unknown benchmark '{name}'")
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def _latest_result(exclude: Optional[str] = None) -> Optional[str]:
+    files = sorted(f for f in glob.glob(os.path.join(RESULTS_DIR, "*.json")) if f != exclude)
+    return files[-1] if files else None
+
+
+def compare(current: Dict, baseline: Dict) -> Dict[str, Dict[str, float]]:
+    """
+    Headline metric of every mode present in both runs
+
+    Returns:
+        {benchmark: {mode: percent change}} (positive = faster)
+    """
+    changes = {}
+    for name, result in current["benchmarks"].items():
+        before = baseline.get("benchmarks", {}).get(name)
+        if not before or "modes" not in result or "modes" not in before:
+            continue
+        for mode, values in result["modes"].items():
+            old = before["modes"].get(mode, {}).get(result["metric"])
+            new = values.get(result["metric"])
+            if old and new is not None:
+                changes.setdefault(name, {})[mode] = round((new - old) / old * 100, 1)
+    return changes
+
+
+def run(names, full: bool = False, output: Optional[str] = None, baseline: Optional[str] = None) -> Dict:
+    """Run the selected benchmarks, save the JSON and print the comparison"""
+    result = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "stub": STUB,
+        "benchmarks": {}
+    }
+    for name in names:
+        metric, quick, full_settings = SUITE[name]
+        settings = full_settings if full else quick
+        print(f"\n=== {name} ===")
+        start = time.perf_counter()
+        try:
+            modes = _run_benchmark(name, settings)
+            result["benchmarks"][name] = {"metric": metric, "settings": settings, "modes": modes}
+        except Exception as e:
+            # Keep going: one broken benchmark should not hide the others
+            traceback.print_exc()
+            result["benchmarks"][name] = {"metric": metric, "settings": settings, "error": f"{type(e).__name__}: {e}"}
+        result["benchmarks"][name]["wall_seconds"] = round(time.perf_counter() - start, 2)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = output or os.path.join(
+        RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}_{result['commit']}.json"
+    )
+    baseline = baseline or _latest_result(exclude=os.path.abspath(output))
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+
+    print(f"\nResults saved to {output}")
+    if baseline and os.path.exists(baseline):
+        with open(baseline, "r", encoding="utf-8") as f:
+            changes = compare(result, json.load(f))
+        print(f"Compared with {baseline}:")
+        for name, modes in changes.items():
+            for mode, change in modes.items():
+                print(f"  {name:<9} {mode:<36} {change:+6.1f}%")
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', nargs='+', choices=list(SUITE), default=list(SUITE))
+    parser.add_argument('--full', action='store_true', help="Use the larger sizes")
+    parser.add_argument('--output', help="Result file (default: benchmarks/results/<timestamp>_<commit>.json)")
+    parser.add_argument('--baseline', help="Result file to compare against (default: the previous run)")
+    args = parser.parse_args()
+
+    run(args.only, full=args.full, output=args.output, baseline=args.baseline)
@@ -0,0 +1,338 @@
+"""
+Stub LLM Server
+Local OpenAI- and Gemini-compatible endpoint with injected latency, jitter
+and errors, used by the benchmarks (and tests) so they run without network
+access or API cost.
+
+Answers come from, in order:
+  1. a cassette of recorded responses (replay), keyed by model-independent
+     prompt text, so one recording serves both providers
+  2. deterministic synthetic answers for the prompts the benchmarks send
+
+With --record, misses are forwarded to a real upstream OpenAI-compatible
+API and written to the cassette, so later runs replay them offline.
+
+Usage:
+    python benchmarks/stub_llm_server.py --port 8765 --latency 0.3 --jitter 0.1 --error-rate 0.05
+
+    # Point the clients at it
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=stub python ...
+    GEMINI_BASE_URL=http://127.0.0.1:8765 GOOGLE_API_KEY=stub python ...
+
+    # Record real responses once (needs network and a real key)
+    python benchmarks/stub_llm_server.py --cassette benchmarks/cassettes/run.json \\
+        --record https://api.openai.com/v1
+"""
+import os
+import re
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+# Gemini REST path: /v1beta/models/{model}:generateContent
+GEMINI_PATH = re.compile(r'/models/(?P<model>[^/:]+):generateContent$')
+
+TAILORED_RESUME = {
+    "name": "Stub Candidate",
+    "summary": "Instructional designer tailoring learning programs with AI tools and workflow automation.",
+    "experience": [
+        {
+            "company": "EdTech Co",
+            "role": "Instructional Designer",
+            "duration": "2020 - Present",
+            "bullets": [
+                "Designed 40+ elearning modules in Articulate Storyline",
+                "Automated onboarding workflows with Zapier and Python, saving 10 hours a week"
+            ]
+        }
+    ],
+    "skills": ["Instructional Design", "Articulate Storyline", "LMS", "Python", "Zapier"],
+    "education": "M.Ed., University of Toronto"
+}
+
+
+def prompt_key(messages: List[Dict]) -> str:
+    """Cassette key: hash of the prompt text (system and user turns in order)"""
+    text = "\n\n".join(str(message.get('content', '')) for message in messages)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:32]
+
+
+def estimate_tokens(text: str) -> int:
+    """~4 characters per token, enough for cost accounting in benchmarks"""
+    return max(1, len(text) // 4)
+
+
+class StubLLMServer:
+    """
+    Minimal OpenAI- and Gemini-compatible server
+
+    - POST /v1/chat/completions (OpenAI) and
+      POST /v1beta/models/{model}:generateContent (Gemini)
+    - Recorded answers from `cassette` are replayed first; with `record_upstream`
+      set, misses are fetched from the upstream OpenAI API and recorded
+    - Packed scoring prompts ("Jobs (JSON array)") get one result per job id
+    - latency/jitter are applied per request; error_rate returns HTTP 429,
+      server_error_rate returns HTTP 500
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.2,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        server_error_rate: float = 0.0,
+        cassette: Optional[str] = None,
+        record_upstream: Optional[str] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            latency: Seconds added to every request
+            jitter: Uniform +/- seconds around latency
+            error_rate: Fraction of requests answered with 429
+            server_error_rate: Fraction of requests answered with 500
+            cassette: JSON file of recorded responses (created when recording)
+            record_upstream: OpenAI-compatible base URL to record misses from
+            seed: Seed for latency/error draws (reproducible runs)
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.server_error_rate = server_error_rate
+        self.cassette = cassette
+        self.record_upstream = record_upstream.rstrip('/') if record_upstream else None
+        self.stats = {'requests': 0, 'rate_limited': 0, 'server_errors': 0, 'replayed': 0, 'recorded': 0, 'synthetic': 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._recordings: Dict[str, str] = self._load_cassette()
+
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                status, payload = server.handle(self.path, body)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                if status == 429:
+                    self.send_header('Retry-After', '0.05')
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output clean
+
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """OpenAI base URL (OPENAI_BASE_URL)"""
+        return f"{self.root_url}/v1"
+
+    @property
+    def root_url(self) -> str:
+        """Server root (GEMINI_BASE_URL)"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    # ============================================================
+    # Requests
+    # ============================================================
+
+    def handle(self, path: str, body: Dict) -> Tuple[int, Dict]:
+        """Build (status, payload) for a request"""
+        with self._lock:
+            self.stats['requests'] += 1
+            draw = self._rng.random()
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            rate_limited = draw < self.error_rate
+            server_error = not rate_limited and draw < self.error_rate + self.server_error_rate
+            if rate_limited:
+                self.stats['rate_limited'] += 1
+            elif server_error:
+                self.stats['server_errors'] += 1
+
+        time.sleep(delay)
+
+        if rate_limited:
+            return 429, {"error": {"message": "Rate limit reached (stub)", "type": "rate_limit_error", "code": 429}}
+        if server_error:
+            return 500, {"error": {"message": "Internal error (stub)", "type": "server_error", "code": 500}}
+
+        route = path.split('?', 1)[0].rstrip('/')
+        if route.endswith('/chat/completions'):
+            messages = body.get('messages', [])
+            model = body.get('model', 'stub')
+            return 200, self._openai_completion(model, self._answer(messages, body), messages)
+
+        match = GEMINI_PATH.search(route)
+        if match:
+            # Gemini sends one user turn with the prompt parts; map it to chat messages
+            messages = [
+                {"role": content.get('role', 'user'), "content": "".join(part.get('text', '') for part in content.get('parts', []))}
+                for content in body.get('contents', [])
+            ]
+            return 200, self._gemini_completion(self._answer(messages, {"model": match.group('model'), "messages": messages}), messages)
+
+        return 404, {"error": {"message": f"Unknown path {path}"}}
+
+    def _answer(self, messages: List[Dict], body: Dict) -> str:
+        """Recorded answer if there is one, else record from upstream, else synthesize"""
+        key = prompt_key(messages)
+        with self._lock:
+            recorded = self._recordings.get(key)
+            if recorded is not None:
+                self.stats['replayed'] += 1
+                return recorded
+
+        if self.record_upstream:
+            content = self._fetch_upstream(body)
+            with self._lock:
+                self._recordings[key] = content
+                self.stats['recorded'] += 1
+                self._save_cassette()
+            return content
+
+        with self._lock:
+            self.stats['synthetic'] += 1
+        return self._synthetic_answer(messages[-1].get('content', '') if messages else '')
+
+    def _fetch_upstream(self, body: Dict) -> str:
+        request = urllib.request.Request(
+            f"{self.record_upstream}/chat/completions",
+            data=json.dumps(body).encode(),
+            headers={
+                'Content-Type': 'application/json',
+                'Authorization': f"Bearer {os.getenv('UPSTREAM_API_KEY', '')}"
+            }
+        )
+        with urllib.request.urlopen(request, timeout=120) as response:
+            return json.load(response)['choices'][0]['message']['content']
+
+    @staticmethod
+    def _synthetic_answer(prompt: str) -> str:
+        """Deterministic answer derived from the prompt"""
+        if "Jobs (JSON array)" in prompt:
+            ids = [int(i) for i in re.findall(r'"id":\s*(\d+)', prompt)]
+            return json.dumps({"results": [
+                {"id": i, "score": (len(prompt) + i) % 11, "reasoning": "Stub packed score"}
+                for i in ids
+            ]})
+        if "Master Resume" in prompt or "Current Resume" in prompt:
+            return json.dumps(TAILORED_RESUME)
+        return json.dumps({"score": len(prompt) % 11, "reasoning": "Stub score"})
+
+    @staticmethod
+    def _openai_completion(model: str, content: str, messages: List[Dict]) -> Dict:
+        prompt_tokens = estimate_tokens("".join(str(m.get('content', '')) for m in messages))
+        completion_tokens = estimate_tokens(content)
+        return {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+
+    @staticmethod
+    def _gemini_completion(content: str, messages: List[Dict]) -> Dict:
+        prompt_tokens = estimate_tokens("".join(m['content'] for m in messages))
+        completion_tokens = estimate_tokens(content)
+        return {
+            "candidates": [{
+                "content": {"role": "model", "parts": [{"text": content}]},
+                "finishReason": "STOP",
+                "index": 0
+            }],
+            "usageMetadata": {
+                "promptTokenCount": prompt_tokens,
+                "candidatesTokenCount": completion_tokens,
+                "totalTokenCount": prompt_tokens + completion_tokens
+            }
+        }
+
+    # ============================================================
+    # Cassette
+    # ============================================================
+
+    def _load_cassette(self) -> Dict[str, str]:
+        if not self.cassette or not os.path.exists(self.cassette):
+            return {}
+        with open(self.cassette, 'r', encoding='utf-8') as f:
+            return json.load(f).get('responses', {})
+
+    def _save_cassette(self):
+        """Write recordings atomically (caller holds the lock)"""
+        if not self.cassette:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.cassette)), exist_ok=True)
+        tmp_file = f"{self.cassette}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({"version": 1, "responses": self._recordings}, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, self.cassette)
+
+    def start(self) -> "StubLLMServer":
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "StubLLMServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument('--server-error-rate', type=float, default=0.0, help="Fraction answered with 500")
+    parser.add_argument('--cassette', help="Recorded responses to replay (and record into)")
+    parser.add_argument('--record', metavar='UPSTREAM_URL',
+                        help="Record misses from this OpenAI-compatible API (key from UPSTREAM_API_KEY)")
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+
+    stub = StubLLMServer(
+        port=args.port, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        server_error_rate=args.server_error_rate, cassette=args.cassette, record_upstream=args.record,
+        seed=args.seed
+    )
+    print(f"Stub LLM server listening on {stub.base_url} (Gemini: {stub.root_url})")
+    try:
+        stub.httpd.serve_forever()
+    except KeyboardInterrupt:
+        stub.stop()
+        sys.exit(0)
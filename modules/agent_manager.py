@@ -4,20 +4,30 @@ Agent Manager
 """
 import os
 import sys
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from datetime import datetime
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from modules.lazy_loader import lazy_singleton
 from modules.logger_config import app_logger
+from modules.llm_gateway import llm_gateway
 from modules.coffee_chat_agents import ContactRankerAgent, ScamDetectionAgent, PersonalizationAgent
 from modules.coffee_chat_memory import CoffeeChatMemory
+from modules.contacted_index import contact_key
+from modules.contact_rules import scam_stage_stats
 from modules.data_validator import DataValidator
 from modules.hidden_job_detector import HiddenJobDetector
 from modules.rate_limiter import RateLimiter
 from modules.checkpoint import Checkpoint
 
+# LLM 阶段的并发上限（每个阶段各自计算）
+NOTE_CONCURRENCY = int(os.getenv("AGENT_NOTE_CONCURRENCY", 4))
+REVIEW_CONCURRENCY = int(os.getenv("AGENT_REVIEW_CONCURRENCY", 4))
+
 
 class ReviewerAgent:
     """
@@ -26,18 +36,7 @@ class ReviewerAgent:
     MAX_REVISIONS = 3
     
     def __init__(self):
-        self.client = None
-        self._init_openai()
-    
-    def _init_openai(self):
-        """初始化OpenAI客户端"""
-        try:
-            from openai import OpenAI
-            api_key = os.getenv('OPENAI_API_KEY')
-            if api_key:
-                self.client = OpenAI(api_key=api_key)
-        except Exception as e:
-            app_logger.warning(f"OpenAI not available: {e}")
+        self.model = "gpt-4o-mini"
     
     def review_message(self, message: str, contact: Dict) -> str:
         """
@@ -50,7 +49,7 @@ class ReviewerAgent:
         Returns:
             审核/修改后的消息
         """
-        if not self.client or not message:
+        if not message or not llm_gateway.is_available('review', self.model):
             return message
         
         try:
@@ -98,8 +97,9 @@ Return JSON only:
 }}
 """
             
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
+            response = llm_gateway.complete(
+                "review",
+                model=self.model,
                 messages=[
                     {"role": "system", "content": "You are an expert at detecting AI-generated text. Return only valid JSON."},
                     {"role": "user", "content": prompt}
@@ -109,7 +109,7 @@ Return JSON only:
             )
             
             import json
-            return json.loads(response.choices[0].message.content.strip())
+            return json.loads(response.text.strip())
             
         except Exception as e:
             app_logger.error(f"Message evaluation failed: {e}")
@@ -135,8 +135,9 @@ Requirements:
 Return ONLY the revised message text, nothing else.
 """
             
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
+            response = llm_gateway.complete(
+                "review",
+                model=self.model,
                 messages=[
                     {"role": "system", "content": "You are helping make messages sound more human and genuine."},
                     {"role": "user", "content": prompt}
@@ -145,7 +146,7 @@ Return ONLY the revised message text, nothing else.
                 temperature=0.8
             )
             
-            revised = response.choices[0].message.content.strip().strip('"')
+            revised = response.text.strip().strip('"')
             
             # Ensure under 300 chars
             if len(revised) > 280:
@@ -168,6 +169,10 @@ class AgentManager:
     3. ContactRankerAgent - 打分排序
     4. PersonalizationAgent - 生成消息
     5. ReviewerAgent - 审核消息
+    
+    1-3（以及去重、Hidden Job 加分）是本地规则，先对整批跑完；
+    4-5 调用 LLM，在线程里并发执行，每个阶段有并发上限；每次 LLM 请求的
+    速率限制由 llm_gateway 按用途负责。
     """
     
     def __init__(self):
@@ -181,6 +186,9 @@ class AgentManager:
         self.rate_limiter = RateLimiter()
         self.checkpoint = Checkpoint()
         
+        self.note_concurrency = NOTE_CONCURRENCY
+        self.review_concurrency = REVIEW_CONCURRENCY
+        
         app_logger.info("AgentManager initialized with all agents")
     
     async def process_contacts(
@@ -200,15 +208,55 @@ class AgentManager:
         Returns:
             处理后的联系人列表（按分数排序）
         """
-        results = []
-        skipped = {'validation': 0, 'scam': 0, 'duplicate': 0}
+        skipped = {'validation': 0, 'scam': 0, 'duplicate': 0, 'note': 0}
+        
+        # 阶段一：本地规则，整批执行
+        results = self._prefilter(contacts, user_profile, skipped)
+        
+        # 阶段二：LLM（高分联系人生成并审核消息）
+        if generate_notes and self.rate_limiter.can_send_note():
+            targets = [contact for contact in results if contact['priority_score'] >= 70]
+            if targets:
+                failed = await self._write_notes(targets)
+                skipped['note'] = len(failed)
+                results = [contact for contact in results if id(contact) not in failed]
+        
+        # 按分数排序
+        results = sorted(results, key=lambda x: x.get('priority_score', 0), reverse=True)
+        
+        app_logger.info(
+            f"AgentManager processed {len(contacts)} contacts: "
+            f"{len(results)} valid, "
+            f"{skipped['duplicate']} duplicates, "
+            f"{skipped['validation']} validation failed, "
+            f"{skipped['scam']} scam detected, "
+            f"{skipped['note']} note errors"
+        )
+        
+        return results
+    
+    def _prefilter(self, contacts: List[Dict], user_profile: Optional[Dict], skipped: Dict) -> List[Dict]:
+        """
+        不调用 LLM 的步骤：去重 → 验证 → 诈骗检测 → 打分 → Hidden Job 加分
+        
+        Args:
+            contacts: 联系人列表
+            user_profile: 用户配置
+            skipped: 各原因跳过的计数（就地更新）
+            
+        Returns:
+            通过的联系人（保持输入顺序，已带 scam_risk / priority_score）
+        """
+        passed = []
+        scam_before = scam_stage_stats.snapshot()
+        
+        # 一次批量查询已联系过的人（ContactedIndex），而不是逐个查
+        contacted = self.memory.contacted_ids([contact_key(contact) for contact in contacts])
         
         for contact in contacts:
             try:
-                contact_id = contact.get('linkedin_url', contact.get('name', ''))
-                
                 # Step 0: 检查是否已处理
-                if self.memory.has_contacted(contact_id):
+                if contact_key(contact) in contacted:
                     skipped['duplicate'] += 1
                     continue
                 
@@ -235,8 +283,7 @@ class AgentManager:
                 contact['scam_risk'] = scam_result['risk_score']
                 
                 # Step 3: 打分
-                score = self.ranker.rank_contact(contact, user_profile=user_profile)
-                contact['priority_score'] = score
+                contact['priority_score'] = self.ranker.rank_contact(contact, user_profile=user_profile)
                 
                 # Step 4: 检查Hidden Job信号（如果有公司帖子）
                 company_posts = contact.get('company_posts', [])
@@ -251,38 +298,59 @@ class AgentManager:
                         contact['priority_score'] = min(100, contact['priority_score'] + boost)
                         contact['hiring_signals'] = hiring_result['signals']
                 
-                # Step 5: 生成个性化消息（高分联系人）
-                if generate_notes and contact['priority_score'] >= 70:
-                    if self.rate_limiter.can_send_note():
-                        note = self.personalizer.generate_connection_message(contact)
-                        
-                        # Step 6: 审核消息
-                        note = self.reviewer.review_message(note, contact)
-                        
-                        # 添加AI披露
-                        if note and "(AI-assisted" not in note:
-                            note += "\n\n(AI-assisted via job-autopilot)"
-                        
-                        contact['note'] = note
-                
-                results.append(contact)
+                passed.append(contact)
                 
             except Exception as e:
                 app_logger.error(f"Agent error for {contact.get('name', 'Unknown')}: {e}")
                 continue
         
-        # 按分数排序
-        results = sorted(results, key=lambda x: x.get('priority_score', 0), reverse=True)
+        # 规则直接判定 / 交给 LLM 各占多少
+        scam_stage_stats.log_since(scam_before, label=f"batch of {len(contacts)}")
+        return passed
+    
+    async def _write_notes(self, contacts: List[Dict]) -> set:
+        """
+        并发生成并审核消息（Step 5-6）
         
-        app_logger.info(
-            f"AgentManager processed {len(contacts)} contacts: "
-            f"{len(results)} valid, "
-            f"{skipped['duplicate']} duplicates, "
-            f"{skipped['validation']} validation failed, "
-            f"{skipped['scam']} scam detected"
-        )
+        每个联系人独立走完 生成 → 审核，不等整批生成完；两个阶段各有
+        信号量。
         
-        return results
+        Args:
+            contacts: 需要消息的联系人（就地写入 contact['note']）
+            
+        Returns:
+            出错的联系人 id() 集合（与原来一样，出错的联系人不返回）
+        """
+        note_slots = asyncio.Semaphore(self.note_concurrency)
+        review_slots = asyncio.Semaphore(self.review_concurrency)
+        loop = asyncio.get_running_loop()
+        # 自己的线程池：默认线程池在少核机器上只有几个线程，会压低并发
+        executor = ThreadPoolExecutor(max_workers=self.note_concurrency + self.review_concurrency)
+        
+        async def write(contact: Dict):
+            async with note_slots:
+                note = await loop.run_in_executor(executor, self.personalizer.generate_connection_message, contact)
+            
+            # Step 6: 审核消息（可能再调用 MAX_REVISIONS 轮 LLM）
+            async with review_slots:
+                note = await loop.run_in_executor(executor, self.reviewer.review_message, note, contact)
+            
+            # 添加AI披露
+            if note and "(AI-assisted" not in note:
+                note += "\n\n(AI-assisted via job-autopilot)"
+            
+            contact['note'] = note
+        
+        try:
+            outcomes = await asyncio.gather(*(write(contact) for contact in contacts), return_exceptions=True)
+        finally:
+            executor.shutdown(wait=False)
+        failed = set()
+        for contact, outcome in zip(contacts, outcomes):
+            if isinstance(outcome, Exception):
+                app_logger.error(f"Agent error for {contact.get('name', 'Unknown')}: {outcome}")
+                failed.add(id(contact))
+        return failed
     
     def process_contacts_sync(
         self,
@@ -317,12 +385,11 @@ class AgentManager:
             过滤后的列表
         """
         filtered = []
+        contacted = self.memory.contacted_ids([contact_key(contact) for contact in contacts])
         
         for contact in contacts:
-            contact_id = contact.get('linkedin_url', contact.get('name', ''))
-            
             # 去重
-            if self.memory.has_contacted(contact_id):
+            if contact_key(contact) in contacted:
                 continue
             
             # 基本验证
@@ -337,8 +404,8 @@ class AgentManager:
         return filtered
 
 
-# 全局实例
-agent_manager = AgentManager()
+# 全局实例（首次使用时创建）
+agent_manager = lazy_singleton("agent_manager", AgentManager)
 
 
 if __name__ == "__main__":
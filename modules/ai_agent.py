@@ -2,28 +2,83 @@
 # GPT-4o-mini for job scoring, resume optimization, and email generation
 
 import os
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from dotenv import load_dotenv
-from openai import OpenAI
+from modules.lazy_loader import lazy_singleton
 from modules.logger_config import app_logger
+from modules.llm_gateway import llm_gateway
+from modules.score_cache import ScoreCache
+from modules.single_flight import SingleFlight
+from modules.text_matcher import KeywordMatcher
 
 load_dotenv()
 
+# Shared scoring rubric (used by single and packed scoring prompts)
+SCORING_CRITERIA = """Scoring Criteria:
+- EdTech/L&D/Instructional Design field: 4 points
+- AI PM/AI application/Automation/Workflow roles: 4 points
+- Salary >$25/hr or $50,080/year or $4,800/month: 3 points
+- Remote position: 1 point
+- Keywords (System Implementation, Pilot Program, Workflow Automation, POC): 1 point
+- Benefits offered: 1 point
+- Full-time position: 1 point
+- Ontario, Canada location: 1 point
+
+Total: 10 points maximum"""
+
+# Bump whenever the scoring prompt/rubric changes so cached scores are invalidated
+SCORE_PROMPT_VERSION = "v1"
+
+# Demo-mode scoring keywords (substring match on title + description, in priority order)
+DEMO_ROLE_MATCHER = KeywordMatcher.from_groups({
+    "edtech": ["instructional", "edtech", "learning", "training"],
+    "ai": ["ai", "automation", "workflow"],
+})
+DEMO_SALARY_MATCHER = KeywordMatcher(["$50", "$60", "$70", "$80"])
+
 class AIAgent:
     """AI-powered job matching, resume optimization, and email generation"""
     
     def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
+        if not os.getenv("OPENAI_API_KEY"):
             app_logger.warning("OPENAI_API_KEY not found - running in DEMO mode")
             self.demo_mode = True
-            self.client = None
         else:
-            self.client = OpenAI(api_key=api_key)
             self.demo_mode = False
-            app_logger.info("OpenAI client initialized")
+            app_logger.info("LLM gateway ready (OpenAI)")
         
         self.model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+        
+        # Scores keyed on job content + resume + prompt version + model
+        self.score_cache = ScoreCache()
+        
+        # Concurrent requests for the same cache key share one LLM call
+        # (cross-process too when SINGLE_FLIGHT_DISTRIBUTED=true)
+        self._score_flight = SingleFlight("score_job", redis=self.score_cache.redis_client)
+    
+    def _complete(self, purpose: str, system: str, prompt: str, **kwargs) -> str:
+        """
+        Run a system + user prompt through the LLM gateway (pooled client,
+        per-purpose concurrency/rate limits, 429 backoff, provider fallback)
+        
+        Args:
+            purpose: LLM_ROUTES key
+            system: System message
+            prompt: User message
+            **kwargs: model, temperature, max_tokens, response_format
+        
+        Returns:
+            Completion text
+        """
+        kwargs.setdefault("model", self.model)
+        messages = [
+            {"role": "system", "content": system},
+            {"role": "user", "content": prompt}
+        ]
+        return llm_gateway.complete(purpose, messages, **kwargs).text
     
     def score_job(self, job_data: Dict, resume_summary: str) -> Dict:
         """
@@ -39,21 +94,29 @@ class AIAgent:
         if self.demo_mode:
             return self._demo_score_job(job_data)
         
+        cache_key = self._score_cache_key(job_data, resume_summary)
+        cached = self.score_cache.get(cache_key)
+        if cached is not None:
+            app_logger.debug(f"Score cache hit: {job_data.get('title')}")
+            return cached
+        
+        return self._score_job_coalesced(job_data, resume_summary, cache_key)
+    
+    def _score_job_coalesced(self, job_data: Dict, resume_summary: str, cache_key: str) -> Dict:
+        """Score a cache miss, sharing the LLM call with concurrent requests for the same key"""
+        return self._score_flight.do(
+            cache_key,
+            lambda: self._score_job_uncached(job_data, resume_summary, cache_key),
+            recheck=lambda: self.score_cache.get(cache_key)
+        )
+    
+    def _score_job_uncached(self, job_data: Dict, resume_summary: str, cache_key: str) -> Dict:
+        """Ask the LLM for a score and store it under cache_key"""
         try:
             prompt = f"""
 You are an intelligent job matching system. Rate this job from 0-10 based on the candidate's profile.
 
-Scoring Criteria:
-- EdTech/L&D/Instructional Design field: 4 points
-- AI PM/AI application/Automation/Workflow roles: 4 points
-- Salary >$25/hr or $50,080/year or $4,800/month: 3 points
-- Remote position: 1 point
-- Keywords (System Implementation, Pilot Program, Workflow Automation, POC): 1 point
-- Benefits offered: 1 point
-- Full-time position: 1 point
-- Ontario, Canada location: 1 point
-
-Total: 10 points maximum
+{SCORING_CRITERIA}
 
 Job Details:
 Title: {job_data.get('title', '')}
@@ -70,44 +133,174 @@ Provide your response in JSON format:
 {{"score": <0-10>, "reasoning": "<brief explanation>"}}
 """
             
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a job matching expert."},
-                    {"role": "user", "content": prompt}
-                ],
+            content = self._complete(
+                "ranking",
+                "You are a job matching expert.",
+                prompt,
                 response_format={"type": "json_object"},
                 temperature=0.3
             )
             
-            import json
-            result = json.loads(response.choices[0].message.content)
+            result = json.loads(content)
             app_logger.info(f"Job scored: {job_data.get('title')} - {result['score']}/10")
+            self.score_cache.set(cache_key, result)
             return result
         
         except Exception as e:
             app_logger.error(f"Job scoring failed: {e}", exc_info=True)
             return {"score": 5, "reasoning": "Error during scoring"}
     
+    def _score_cache_key(self, job_data: Dict, resume_summary: str) -> str:
+        """Content-addressed score cache key for this agent's prompt/model"""
+        return ScoreCache.make_key(job_data, resume_summary, SCORE_PROMPT_VERSION, self.model)
+    
+    def score_jobs_batch(
+        self,
+        jobs: List[Dict],
+        resume_summary: str,
+        concurrency: int = 5,
+        pack_size: int = 1
+    ) -> List[Dict]:
+        """
+        Score many jobs concurrently
+        
+        Args:
+            jobs: List of job detail dicts
+            resume_summary: User's resume summary
+            concurrency: Max number of requests in flight for this batch
+            pack_size: Jobs per request. >1 packs several jobs into one
+                structured JSON prompt to cut per-request overhead
+        
+        Returns:
+            list: {"score": int, "reasoning": str} per job, in input order
+        """
+        if not jobs:
+            return []
+        
+        if self.demo_mode:
+            return [self._demo_score_job(job) for job in jobs]
+        
+        # Resolve cached scores first so only misses reach the LLM
+        results: List[Optional[Dict]] = [
+            self.score_cache.get(self._score_cache_key(job, resume_summary)) for job in jobs
+        ]
+        pending = [i for i, result in enumerate(results) if result is None]
+        
+        pack_size = max(1, pack_size)
+        chunks = [pending[i:i + pack_size] for i in range(0, len(pending), pack_size)]
+        
+        def _score_chunk(indices: List[int]) -> List[Dict]:
+            if len(indices) == 1:
+                job = jobs[indices[0]]
+                return [self._score_job_coalesced(job, resume_summary, self._score_cache_key(job, resume_summary))]
+            return self._score_jobs_packed([jobs[i] for i in indices], resume_summary)
+        
+        start = time.perf_counter()
+        
+        # pool.map preserves input order regardless of completion order
+        if chunks:
+            with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+                for indices, chunk_results in zip(chunks, pool.map(_score_chunk, chunks)):
+                    for i, result in zip(indices, chunk_results):
+                        results[i] = result
+        
+        elapsed = time.perf_counter() - start
+        app_logger.info(
+            f"Batch scored {len(jobs)} jobs in {elapsed:.1f}s "
+            f"({len(jobs) - len(pending)} cached, {len(chunks)} requests, "
+            f"concurrency={concurrency}, pack_size={pack_size})"
+        )
+        return results
+    
+    def _score_jobs_packed(self, jobs: List[Dict], resume_summary: str) -> List[Dict]:
+        """
+        Score several jobs with a single structured JSON prompt
+        
+        Jobs missing from the model's answer are re-scored one by one.
+        
+        Args:
+            jobs: Small list of job dicts (one pack)
+            resume_summary: User's resume summary
+        
+        Returns:
+            list: Score dicts in the same order as jobs
+        """
+        packed_jobs = [
+            {
+                "id": i,
+                "title": job.get('title', ''),
+                "company": job.get('company', ''),
+                "location": job.get('location', ''),
+                "salary": job.get('salary', 'Not specified'),
+                "remote": bool(job.get('is_remote', False)),
+                "description": (job.get('description') or '')[:500]
+            }
+            for i, job in enumerate(jobs)
+        ]
+        
+        prompt = f"""
+You are an intelligent job matching system. Rate EACH job below from 0-10 based on the candidate's profile.
+
+{SCORING_CRITERIA}
+
+Candidate Profile:
+{resume_summary}
+
+Jobs (JSON array):
+{json.dumps(packed_jobs, ensure_ascii=False)}
+
+Provide your response in JSON format, with one entry per job id:
+{{"results": [{{"id": <job id>, "score": <0-10>, "reasoning": "<brief explanation>"}}]}}
+"""
+        
+        scored = {}
+        try:
+            content = self._complete(
+                "ranking",
+                "You are a job matching expert.",
+                prompt,
+                response_format={"type": "json_object"},
+                temperature=0.3
+            )
+            
+            payload = json.loads(content)
+            for item in payload.get("results", []):
+                try:
+                    i = int(item["id"])
+                    result = {"score": item["score"], "reasoning": item.get("reasoning", "")}
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if 0 <= i < len(jobs):
+                    scored[i] = result
+                    self.score_cache.set(self._score_cache_key(jobs[i], resume_summary), result)
+            
+            app_logger.info(f"Packed scoring: {len(scored)}/{len(jobs)} jobs scored in one request")
+        
+        except Exception as e:
+            app_logger.error(f"Packed job scoring failed: {e}", exc_info=True)
+        
+        return [
+            scored[i] if i in scored
+            else self._score_job_coalesced(job, resume_summary, self._score_cache_key(job, resume_summary))
+            for i, job in enumerate(jobs)
+        ]
+    
     def _demo_score_job(self, job_data: Dict) -> Dict:
         """Demo mode scoring based on keywords"""
-        title = job_data.get('title', '').lower()
-        description = job_data.get('description', '').lower()
-        
         score = 0
         reasons = []
         
         # Check category
-        if any(kw in title + description for kw in ['instructional', 'edtech', 'learning', 'training']):
+        role = DEMO_ROLE_MATCHER.first_label(job_data.get('title', '') + job_data.get('description', ''))
+        if role == 'edtech':
             score += 4
             reasons.append("EdTech/L&D role (+4)")
-        elif any(kw in title + description for kw in ['ai', 'automation', 'workflow']):
+        elif role == 'ai':
             score += 4
             reasons.append("AI/Automation role (+4)")
         
         # Salary check
-        salary_text = job_data.get('salary', '').lower()
-        if any(indicator in salary_text for indicator in ['$50', '$60', '$70', '$80']):
+        if DEMO_SALARY_MATCHER.contains_any(job_data.get('salary', '')):
             score += 3
             reasons.append("Good salary (+3)")
         
@@ -168,18 +361,15 @@ Current Resume:
 Return optimized resume in the SAME JSON structure with condensed content.
 """
             
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a professional resume writer specializing in ATS optimization."},
-                    {"role": "user", "content": prompt}
-                ],
+            content = self._complete(
+                "resume",
+                "You are a professional resume writer specializing in ATS optimization.",
+                prompt,
                 response_format={"type": "json_object"},
                 temperature=0.5
             )
             
-            import json
-            optimized = json.loads(response.choices[0].message.content)
+            optimized = json.loads(content)
             app_logger.info("Resume optimized successfully")
             return optimized
         
@@ -246,16 +436,12 @@ Job: {job_data.get('title')} at {job_data.get('company')}
 Return only the email body.
 """
             
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a professional cold email writer."},
-                    {"role": "user", "content": prompt}
-                ],
+            email_body = self._complete(
+                "email",
+                "You are a professional cold email writer.",
+                prompt,
                 temperature=0.7
             )
-            
-            email_body = response.choices[0].message.content
             app_logger.info(f"Generated {stage} email for {job_data.get('title')}")
             return email_body
         
@@ -292,8 +478,8 @@ Looking forward to discussing how I can contribute to {job_data.get('company')}.
 Best,
 Yuting Sun"""
 
-# Global AI agent instance
-ai_agent = AIAgent()
+# Global AI agent instance (created on first use)
+ai_agent = lazy_singleton("ai_agent", AIAgent)
 
 if __name__ == "__main__":
     # Test in demo mode
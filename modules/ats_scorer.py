@@ -2,13 +2,31 @@
 # ATS compatibility scoring inspired by Resume-Matcher
 # License: Apache-2.0 (Resume-Matcher) compatible with AGPL-3.0
 
+import json
 import hashlib
-from typing import Dict, List
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.feature_extraction.text import TfidfVectorizer
-import spacy
+from collections import Counter
+from typing import Dict, List, Optional
+from modules.lru_cache import LRUCache
+from modules.lazy_loader import lazy_singleton
 from modules.logger_config import app_logger
 
+# spaCy, scikit-learn and numpy are imported inside ATSScorer so that importing
+# this module (e.g. on every Streamlit page load) stays cheap
+
+# Bump when scoring logic changes so Redis-spilled results are not reused
+ATS_CACHE_VERSION = "v2"
+
+# Keyword extraction only needs POS tags (tok2vec → tagger → attribute_ruler) and NER
+SPACY_DISABLED_COMPONENTS = ["parser", "lemmatizer"]
+
+RESUME_STOPWORDS = frozenset({
+    "experience", "work", "job", "role", "team", "year", "years", "time", "date",
+    "project", "company", "clients", "business", "skills", "tools", "summary",
+    "education", "university", "college", "school", "degree", "certification",
+    "requirements", "qualifications", "responsibilities", "duties", "description",
+    "opportunity", "candidate", "position", "applicant", "application"
+})
+
 class ATSScorer:
     """
     ATS compatibility scorer inspired by Resume-Matcher
@@ -19,13 +37,32 @@ class ATSScorer:
     - TF-IDF + cosine similarity matching
     - Missing keyword detection
     - Improvement suggestions
-    - In-memory caching to reduce API costs
+    - Bounded LRU cache (TTL + byte limit) with optional Redis spill
     """
     
-    def __init__(self):
-        """Initialize ATS scorer with spaCy and caching"""
+    def __init__(
+        self,
+        cache_size: int = 512,
+        cache_ttl_seconds: float = 6 * 3600,
+        cache_max_bytes: int = 16 * 1024 * 1024,
+        spill_to_redis: bool = True,
+        keyword_cache_size: int = 4096
+    ):
+        """
+        Initialize ATS scorer with spaCy and caching
+        
+        Args:
+            cache_size: Max cached score results in memory
+            cache_ttl_seconds: In-memory entry lifetime
+            cache_max_bytes: Cap on serialized size of cached results
+            spill_to_redis: Also store/lookup results via CacheManager.cache_ats_analysis
+            keyword_cache_size: Per-document keyword Counters kept in memory
+        """
+        import spacy
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
         try:
-            self.nlp = spacy.load("en_core_web_sm")
+            self.nlp = spacy.load("en_core_web_sm", disable=SPACY_DISABLED_COMPONENTS)
             app_logger.info("ATS Scorer initialized with spaCy model")
         except OSError:
             app_logger.error("spaCy model 'en_core_web_sm' not found. Run: python -m spacy download en_core_web_sm")
@@ -36,7 +73,16 @@ class ATSScorer:
             max_features=1000,
             ngram_range=(1, 2)  # Unigrams and bigrams
         )
-        self.cache = {}  # Simple in-memory cache
+        self.cache = LRUCache(
+            max_entries=cache_size,
+            ttl_seconds=cache_ttl_seconds,
+            max_bytes=cache_max_bytes,
+            sizeof=lambda result: len(json.dumps(result))
+        )
+        self.spill_to_redis = spill_to_redis
+        self.redis_hits = 0
+        # Text digest -> keyword Counter, so each JD is parsed once across resumes
+        self.keyword_cache = LRUCache(max_entries=keyword_cache_size)
         app_logger.info("TF-IDF vectorizer initialized")
     
     def score_resume(self, resume_text: str, job_description: str) -> Dict:
@@ -56,39 +102,31 @@ class ATSScorer:
         """
         # Check cache first
         cache_key = self._get_cache_key(resume_text, job_description)
-        if cache_key in self.cache:
+        cached = self._cache_get(cache_key)
+        if cached is not None:
             app_logger.info("Returning cached ATS score")
-            return self.cache[cache_key]
+            return cached
         
         app_logger.info("Calculating ATS score...")
         
+        from sklearn.metrics.pairwise import cosine_similarity
+        
         try:
             # 1. Calculate text similarity using TF-IDF + cosine similarity
             vectors = self.vectorizer.fit_transform([resume_text, job_description])
             similarity = cosine_similarity(vectors[0:1], vectors[1:2])[0][0]
             score = int(similarity * 100)
             
-            # 2. Extract keywords from both texts
-            jd_keywords = self._extract_keywords(job_description)
-            resume_keywords = self._extract_keywords(resume_text)
-            
-            # 3. Find missing keywords
-            missing = set(jd_keywords) - set(resume_keywords)
-            missing_sorted = sorted(missing, key=lambda x: jd_keywords.count(x), reverse=True)
+            # 2. Extract keywords from both texts (one nlp.pipe pass)
+            jd_keywords, resume_keywords = self._extract_keywords_batch([job_description, resume_text])
             
-            # 4. Generate suggestions
-            suggestions = self._generate_suggestions(missing_sorted[:5])
-            
-            result = {
-                "score": score,
-                "missing_keywords": missing_sorted[:10],  # Top 10
-                "suggestions": suggestions
-            }
+            # 3-4. Find missing keywords and generate suggestions
+            result = {"score": score, **self._keyword_gap(jd_keywords, resume_keywords)}
             
             # Cache result
-            self.cache[cache_key] = result
+            self._cache_set(cache_key, result)
             
-            app_logger.info(f"ATS Score: {score}/100, Missing {len(missing)} keywords")
+            app_logger.info(f"ATS Score: {score}/100, Missing {result['missing_count']} keywords")
             
             return result
         
@@ -100,6 +138,83 @@ class ATSScorer:
                 "suggestions": ["Error calculating ATS score. Please try again."]
             }
     
+    def score_resume_against_jobs(
+        self,
+        resume_text: str,
+        job_descriptions: List[str],
+        include_keywords: bool = False
+    ) -> List[Dict]:
+        """
+        Score one resume against many job descriptions in a single pass
+        
+        TF-IDF is fitted once over the whole JD corpus (so IDF weights are
+        meaningful), the resume is transformed once, and all cosine
+        similarities come from one sparse matrix-vector product. Rows are
+        L2-normalized by TfidfVectorizer, so the dot product is the cosine.
+        
+        Args:
+            resume_text: Full resume text
+            job_descriptions: Job description texts
+            include_keywords: Also add missing_keywords/suggestions per JD
+                (keywords extracted in one batched nlp.pipe pass)
+        
+        Returns:
+            list: {'score': int (0-100), ...} per job description, in input order
+        """
+        if not job_descriptions:
+            return []
+        
+        import numpy as np
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        
+        vectorizer = TfidfVectorizer(
+            stop_words='english',
+            max_features=20000,  # Corpus-wide vocabulary, larger than the pairwise one
+            ngram_range=(1, 2),
+            dtype=np.float32
+        )
+        
+        try:
+            jd_matrix = vectorizer.fit_transform(job_descriptions)
+        except ValueError:
+            # Empty vocabulary (blank or stop-word-only JDs)
+            app_logger.warning("ATS batch scoring: no usable terms in job descriptions")
+            scores = np.zeros(len(job_descriptions), dtype=int)
+        else:
+            resume_vector = vectorizer.transform([resume_text])
+            similarities = np.asarray((jd_matrix @ resume_vector.T).todense()).ravel()
+            # Small epsilon so float32 rounding (0.99999994) doesn't truncate a perfect match to 99
+            scores = np.clip(similarities.astype(np.float64) * 100 + 1e-3, 0, 100).astype(int)
+            
+            app_logger.info(
+                f"ATS batch scored {len(job_descriptions)} JDs "
+                f"(vocab {len(vectorizer.vocabulary_)}, best {scores.max()}/100)"
+            )
+        
+        results = [{"score": int(score)} for score in scores]
+        
+        if include_keywords:
+            resume_keywords, *jd_keywords = self._extract_keywords_batch([resume_text, *job_descriptions])
+            for result, keywords in zip(results, jd_keywords):
+                result.update(self._keyword_gap(keywords, resume_keywords))
+        
+        return results
+    
+    def _keyword_gap(self, jd_keywords: Counter, resume_keywords: Counter) -> Dict:
+        """
+        Missing keywords ranked by JD frequency, plus suggestions
+        
+        Ties keep first-appearance order in the JD.
+        """
+        missing = [kw for kw in jd_keywords if kw not in resume_keywords]
+        missing_sorted = sorted(missing, key=lambda kw: jd_keywords[kw], reverse=True)
+        
+        return {
+            "missing_keywords": missing_sorted[:10],  # Top 10
+            "missing_count": len(missing_sorted),
+            "suggestions": self._generate_suggestions(missing_sorted[:5])
+        }
+    
     def _extract_keywords(self, text: str) -> List[str]:
         """
         Extract important keywords using spaCy NLP
@@ -108,31 +223,66 @@ class ATSScorer:
             text: Input text
         
         Returns:
-            List of keywords (lowercase)
-        """
-        if not hasattr(self, 'RESUME_STOPWORDS'):
-            self.RESUME_STOPWORDS = {
-                "experience", "work", "job", "role", "team", "year", "years", "time", "date",
-                "project", "company", "clients", "business", "skills", "tools", "summary",
-                "education", "university", "college", "school", "degree", "certification",
-                "requirements", "qualifications", "responsibilities", "duties", "description",
-                "opportunity", "candidate", "position", "applicant", "application"
-            }
-
-        doc = self.nlp(text.lower())
+            List of keywords (lowercase, with repeats)
+        """
+        return list(self._extract_keywords_batch([text])[0].elements())
+    
+    def _extract_keywords_batch(
+        self,
+        texts: List[str],
+        batch_size: int = 64,
+        n_process: int = 1
+    ) -> List[Counter]:
+        """
+        Extract keyword counts for many texts with one nlp.pipe pass
+        
+        Results are memoized per text digest, so a JD scored against many
+        resumes is parsed only once; duplicate texts in a batch are parsed
+        once as well.
+        
+        Args:
+            texts: Input texts
+            batch_size: spaCy pipe batch size
+            n_process: spaCy worker processes (>1 for large corpora)
+        
+        Returns:
+            List of keyword Counters (lowercase), aligned with texts
+        """
+        digests = [hashlib.sha256(text.encode("utf-8")).hexdigest() for text in texts]
+        counts: Dict[str, Counter] = {}
+        
+        to_parse = {}
+        for digest, text in zip(digests, texts):
+            cached = self.keyword_cache.get(digest)
+            if cached is not None:
+                counts[digest] = cached
+            elif digest not in to_parse:
+                to_parse[digest] = text.lower()
+        
+        if to_parse:
+            docs = self.nlp.pipe(to_parse.values(), batch_size=batch_size, n_process=n_process)
+            for digest, doc in zip(to_parse, docs):
+                counts[digest] = self._keywords_from_doc(doc)
+                self.keyword_cache.set(digest, counts[digest])
+        
+        return [counts[digest] for digest in digests]
+    
+    @staticmethod
+    def _keywords_from_doc(doc) -> Counter:
+        """Keyword counts from a parsed (already lowercased) document"""
+        keywords = Counter()
         
-        keywords = []
         for token in doc:
             # Extract nouns, proper nouns, and adjectives
-            if token.pos_ in ["NOUN", "PROPN", "ADJ"] and not token.is_stop:
-                if len(token.text) > 2 and token.text.lower() not in self.RESUME_STOPWORDS:
-                    keywords.append(token.text)
+            if token.pos_ in ("NOUN", "PROPN", "ADJ") and not token.is_stop:
+                if len(token.text) > 2 and token.text not in RESUME_STOPWORDS:
+                    keywords[token.text] += 1
         
         # Also extract named entities (companies, technologies, etc.)
         for ent in doc.ents:
-            if ent.label_ in ["ORG", "PRODUCT", "SKILL", "PERSON", "GPE"]:
-                if ent.text.lower() not in self.RESUME_STOPWORDS:
-                    keywords.append(ent.text.lower())
+            if ent.label_ in ("ORG", "PRODUCT", "SKILL", "PERSON", "GPE"):
+                if ent.text not in RESUME_STOPWORDS:
+                    keywords[ent.text] += 1
         
         return keywords
     
@@ -165,18 +315,65 @@ class ATSScorer:
         return suggestions
     
     def _get_cache_key(self, resume_text: str, job_description: str) -> str:
-        """Generate cache key from text hashes"""
-        combined = f"{resume_text[:100]}_{job_description[:100]}"
-        return hashlib.md5(combined.encode()).hexdigest()
+        """
+        Generate cache key from a digest of the full resume and JD
+        
+        Each text is hashed separately and the digests combined, so no
+        separator choice can make two different pairs collide.
+        """
+        resume_digest = hashlib.sha256(resume_text.encode("utf-8")).hexdigest()
+        jd_digest = hashlib.sha256(job_description.encode("utf-8")).hexdigest()
+        combined = f"{ATS_CACHE_VERSION}:{resume_digest}:{jd_digest}"
+        return hashlib.sha256(combined.encode("utf-8")).hexdigest()
+    
+    def _cache_get(self, cache_key: str) -> Optional[Dict]:
+        """Look up a result in memory, then in Redis"""
+        result = self.cache.get(cache_key)
+        if result is not None or not self.spill_to_redis:
+            return result
+        
+        try:
+            from modules.cache_manager import cache_manager
+            result = cache_manager.get_cached_ats_analysis(cache_key)
+        except Exception as e:
+            app_logger.warning(f"ATS Redis lookup failed: {e}")
+            return None
+        
+        if result is not None:
+            self.redis_hits += 1
+            self.cache.set(cache_key, result)
+        return result
+    
+    def _cache_set(self, cache_key: str, result: Dict):
+        """Store a result in memory and spill it to Redis"""
+        self.cache.set(cache_key, result)
+        if not self.spill_to_redis:
+            return
+        try:
+            from modules.cache_manager import cache_manager
+            cache_manager.cache_ats_analysis(cache_key, result)
+        except Exception as e:
+            app_logger.warning(f"ATS Redis spill failed: {e}")
+    
+    def get_cache_stats(self) -> Dict:
+        """
+        Cache statistics
+        
+        Returns:
+            dict: hits, misses, evictions, expirations, bytes (in-memory) and redis_hits
+        """
+        stats = self.cache.get_stats()
+        stats["redis_hits"] = self.redis_hits
+        return stats
     
     def clear_cache(self):
         """Clear the in-memory cache"""
-        self.cache = {}
+        self.cache.clear()
         app_logger.info("ATS cache cleared")
 
 
-# Global instance
-ats_scorer = ATSScorer()
+# Global instance, built on first use
+ats_scorer = lazy_singleton("ats_scorer", ATSScorer)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,216 @@
+# Job Autopilot - Cache Codec
+# Compact binary encoding for cached payloads: msgpack (or JSON) + typed datetimes + optional compression
+
+import os
+import json
+import zlib
+from datetime import date, datetime
+from typing import Any, Optional, Union
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack is in requirements.txt
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Blob layout: 1 header byte, then the (optionally compressed) payload.
+# Header = 0x80 | serializer << 2 | compression. Legacy JSON strings written
+# before the codec existed start with an ASCII byte (< 0x80), so they are
+# still decoded correctly.
+HEADER_FLAG = 0x80
+SERIALIZERS = {"json": 0, "msgpack": 1}
+COMPRESSIONS = {None: 0, "zlib": 1, "zstd": 2}
+
+# Payloads smaller than this are stored uncompressed
+DEFAULT_COMPRESS_THRESHOLD = 1024
+
+# msgpack extension type codes
+EXT_DATETIME = 1
+EXT_DATE = 2
+
+# JSON tags for typed values
+JSON_DATETIME_TAG = "__datetime__"
+JSON_DATE_TAG = "__date__"
+
+
+# ============================================================
+# Typed JSON (also used for the SQL cache_entries JSON column)
+# ============================================================
+
+def to_json_compatible(value: Any) -> Any:
+    """Replace datetime/date values with tagged dicts so they survive JSON"""
+    if isinstance(value, datetime):
+        return {JSON_DATETIME_TAG: value.isoformat()}
+    if isinstance(value, date):
+        return {JSON_DATE_TAG: value.isoformat()}
+    if isinstance(value, dict):
+        return {key: to_json_compatible(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json_compatible(item) for item in value]
+    return value
+
+
+def _json_object_hook(obj: dict) -> Any:
+    if len(obj) == 1:
+        if JSON_DATETIME_TAG in obj:
+            return datetime.fromisoformat(obj[JSON_DATETIME_TAG])
+        if JSON_DATE_TAG in obj:
+            return date.fromisoformat(obj[JSON_DATE_TAG])
+    return obj
+
+
+def from_json_compatible(value: Any) -> Any:
+    """Inverse of to_json_compatible"""
+    if isinstance(value, dict):
+        return _json_object_hook({key: from_json_compatible(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return [from_json_compatible(item) for item in value]
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {JSON_DATETIME_TAG: value.isoformat()}
+    if isinstance(value, date):
+        return {JSON_DATE_TAG: value.isoformat()}
+    return str(value)
+
+
+# ============================================================
+# msgpack extension hooks
+# ============================================================
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return msgpack.ExtType(EXT_DATETIME, value.isoformat().encode("ascii"))
+    if isinstance(value, date):
+        return msgpack.ExtType(EXT_DATE, value.isoformat().encode("ascii"))
+    return str(value)
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    if code == EXT_DATETIME:
+        return datetime.fromisoformat(data.decode("ascii"))
+    if code == EXT_DATE:
+        return date.fromisoformat(data.decode("ascii"))
+    return msgpack.ExtType(code, data)
+
+
+class CacheCodec:
+    """
+    Pluggable serializer + compressor for cache values
+
+    datetime and date values round-trip as their own types (not strings),
+    naive or tz-aware. Payloads at or above compress_threshold bytes are
+    compressed with zstd or zlib when that actually makes them smaller.
+    """
+
+    def __init__(
+        self,
+        serializer: str = "msgpack",
+        compression: Optional[str] = "zlib",
+        compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD,
+        level: Optional[int] = None
+    ):
+        """
+        Args:
+            serializer: 'msgpack' or 'json'
+            compression: 'zstd', 'zlib' or None
+            compress_threshold: Minimum serialized size (bytes) to compress
+            level: Compression level (default: zstd 3, zlib 6)
+        """
+        if serializer not in SERIALIZERS:
+            raise ValueError(f"Unknown cache serializer '{serializer}'")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown cache compression '{compression}'")
+        if serializer == "msgpack" and msgpack is None:
+            raise ValueError("msgpack serializer requires the msgpack package")
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("zstd compression requires the zstandard package")
+
+        self.serializer = serializer
+        self.compression = compression
+        self.compress_threshold = compress_threshold
+        self.level = level
+
+        if compression == "zstd":
+            self._zstd_compressor = zstandard.ZstdCompressor(level=level or 3)
+            self._zstd_decompressor = zstandard.ZstdDecompressor()
+
+    def __repr__(self) -> str:
+        return f"CacheCodec({self.serializer}, {self.compression}, threshold={self.compress_threshold})"
+
+    def encode(self, value: Any) -> bytes:
+        """Serialize (and maybe compress) a value to a self-describing blob"""
+        if self.serializer == "msgpack":
+            payload = msgpack.packb(value, default=_msgpack_default, use_bin_type=True, datetime=False)
+        else:
+            payload = json.dumps(value, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+        compression = None
+        if self.compression and len(payload) >= self.compress_threshold:
+            compressed = self._compress(payload)
+            if len(compressed) < len(payload):
+                payload, compression = compressed, self.compression
+
+        header = HEADER_FLAG | SERIALIZERS[self.serializer] << 2 | COMPRESSIONS[compression]
+        return bytes([header]) + payload
+
+    def decode(self, blob: Union[bytes, str]) -> Any:
+        """
+        Decode a blob written by any CacheCodec configuration, or a legacy
+        plain-JSON string
+        """
+        if isinstance(blob, str):
+            return json.loads(blob, object_hook=_json_object_hook)
+        if not blob or not blob[0] & HEADER_FLAG:
+            return json.loads(blob, object_hook=_json_object_hook)
+
+        header = blob[0]
+        payload = self._decompress(blob[1:], header & 0x03)
+        if header >> 2 & 0x1F == SERIALIZERS["msgpack"]:
+            if msgpack is None:
+                raise ValueError("Cached value is msgpack-encoded but msgpack is not installed")
+            return msgpack.unpackb(payload, ext_hook=_msgpack_ext_hook, raw=False, strict_map_key=False)
+        return json.loads(payload, object_hook=_json_object_hook)
+
+    def _compress(self, payload: bytes) -> bytes:
+        if self.compression == "zstd":
+            return self._zstd_compressor.compress(payload)
+        return zlib.compress(payload, self.level if self.level is not None else 6)
+
+    @staticmethod
+    def _decompress(payload: bytes, compression_id: int) -> bytes:
+        if compression_id == COMPRESSIONS["zlib"]:
+            return zlib.decompress(payload)
+        if compression_id == COMPRESSIONS["zstd"]:
+            if zstandard is None:
+                raise ValueError("Cached value is zstd-compressed but zstandard is not installed")
+            return zstandard.ZstdDecompressor().decompress(payload)
+        return payload
+
+
+_default_codec: Optional[CacheCodec] = None
+
+
+def get_default_codec() -> CacheCodec:
+    """
+    Process-wide codec, configured from the environment:
+    CACHE_SERIALIZER (msgpack|json), CACHE_COMPRESSION (zstd|zlib|none),
+    CACHE_COMPRESS_THRESHOLD (bytes). Defaults to msgpack + zstd, falling
+    back to json / zlib when those packages are not installed.
+    """
+    global _default_codec
+    if _default_codec is None:
+        serializer = os.getenv("CACHE_SERIALIZER", "msgpack" if msgpack is not None else "json")
+        compression = os.getenv("CACHE_COMPRESSION", "zstd" if zstandard is not None else "zlib")
+        _default_codec = CacheCodec(
+            serializer=serializer,
+            compression=None if compression.lower() == "none" else compression,
+            compress_threshold=int(os.getenv("CACHE_COMPRESS_THRESHOLD", DEFAULT_COMPRESS_THRESHOLD))
+        )
+    return _default_codec
@@ -2,30 +2,61 @@
 # Handles caching for jobs, HR contacts, and ATS analysis
 
 import redis
-import json
-from datetime import timedelta
-from typing import Optional, Dict, Any
+import time
+import fnmatch
+from typing import Optional, Dict, Any, Callable, List, Union
 import os
 from dotenv import load_dotenv
+from modules.lazy_loader import lazy_singleton
+from modules.tiered_cache import TieredCache, live_tiered_caches
+from modules.single_flight import SingleFlight, get_single_flight_stats
 from modules.logger_config import app_logger
 
 load_dotenv()
 
+# Keys per MGET in batch lookups (bounds request/response size)
+MGET_CHUNK_SIZE = 500
+
+# Namespaces that can be invalidated in O(1) by bumping their generation,
+# with their cache_entries.cache_type and default TTL (days)
+NAMESPACE_SETTINGS = {
+    "job": ("job", 7),
+    "hr": ("hr_contact", 30),
+    "ats_analysis": ("ats_analysis", 14),
+}
+CACHE_NAMESPACES = tuple(NAMESPACE_SETTINGS)
+GENERATION_KEY = "cache_gen:{namespace}"
+
+# How long a process trusts its copy of a namespace generation. Bumps made
+# by other processes become visible within this window.
+GENERATION_CACHE_SECONDS = 5.0
+
+# Keys per SCAN page / UNLINK call when clearing
+SCAN_BATCH_SIZE = 500
+
 class CacheManager:
-    """Redis cache manager with automatic expiration"""
+    """
+    Cache for jobs, HR contacts and ATS analysis
+    
+    Each namespace is a TieredCache: in-process LRU → Redis → SQL
+    cache_entries. If Redis is unreachable (DEMO mode) lookups keep working
+    from the in-process and SQL tiers.
+    """
     
     def __init__(self):
         self.redis_host = os.getenv("REDIS_HOST", "redis")
         self.redis_port = int(os.getenv("REDIS_PORT", 6379))
         self.redis_db = int(os.getenv("REDIS_DB", 0))
         self.demo_mode = False
+        # namespace -> (generation, fetched_at monotonic)
+        self._generations: Dict[str, tuple] = {}
         
         try:
             self.redis_client = redis.Redis(
                 host=self.redis_host,
                 port=self.redis_port,
                 db=self.redis_db,
-                decode_responses=True,
+                decode_responses=False,  # Values are binary CacheCodec blobs
                 socket_connect_timeout=2  # Short timeout
             )
             # Test connection
@@ -35,22 +66,51 @@ class CacheManager:
             app_logger.warning(f"Redis connection failed (running in DEMO mode): {e}")
             self.redis_client = None
             self.demo_mode = True
+        
+        # L1 (in-process) → L2 (Redis, skipped in DEMO mode) → L3 (cache_entries)
+        use_sql = os.getenv("CACHE_SQL_TIER", "true").lower() == "true"
+        self.tiers = {
+            namespace: TieredCache(namespace, cache_type, ttl_days=ttl_days, redis=self.redis_client, use_sql=use_sql)
+            for namespace, (cache_type, ttl_days) in NAMESPACE_SETTINGS.items()
+        }
+        # Concurrent misses on the same key share one computation
+        self.flights = {
+            namespace: SingleFlight(f"cache:{namespace}", redis=self.redis_client)
+            for namespace in NAMESPACE_SETTINGS
+        }
     
-    def _serialize(self, data: Any) -> str:
-        """Serialize data to JSON string"""
-        try:
-            return json.dumps(data, default=str)
-        except Exception as e:
-            app_logger.error(f"Failed to serialize data: {e}")
-            raise
+    # ============================================================
+    # Namespaced Keys
+    # ============================================================
     
-    def _deserialize(self, data: str) -> Any:
-        """Deserialize JSON string to Python object"""
+    def _generation(self, namespace: str) -> int:
+        """Current generation of a namespace (0 until first invalidated, or without Redis)"""
+        if self.demo_mode:
+            return 0
+        
+        cached = self._generations.get(namespace)
+        if cached is not None and time.monotonic() - cached[1] < GENERATION_CACHE_SECONDS:
+            return cached[0]
+        
         try:
-            return json.loads(data)
+            generation = int(self.redis_client.get(GENERATION_KEY.format(namespace=namespace)) or 0)
         except Exception as e:
-            app_logger.error(f"Failed to deserialize data: {e}")
-            return None
+            app_logger.warning(f"Failed to read cache generation for '{namespace}': {e}")
+            return cached[0] if cached else 0
+        self._generations[namespace] = (generation, time.monotonic())
+        return generation
+    
+    def _key(self, namespace: str, ident: Any) -> str:
+        """
+        Build a versioned key: "{namespace}:{generation}:{ident}"
+        
+        Generation 0 keeps the original unversioned "{namespace}:{ident}"
+        form, so entries written before versioning stay readable.
+        """
+        generation = self._generation(namespace)
+        if generation:
+            return f"{namespace}:{generation}:{ident}"
+        return f"{namespace}:{ident}"
     
     # ============================================================
     # Job Caching
@@ -68,16 +128,8 @@ class CacheManager:
         Returns:
             bool: Success status
         """
-        if self.demo_mode:
-            return False
-        
         try:
-            key = f"job:{job_url}"
-            self.redis_client.setex(
-                key,
-                timedelta(days=ttl_days),
-                self._serialize(job_data)
-            )
+            self.tiers["job"].set(self._key("job", job_url), job_data, ttl_days)
             app_logger.debug(f"Cached job: {job_url}")
             return True
         except Exception as e:
@@ -94,28 +146,70 @@ class CacheManager:
         Returns:
             dict or None: Job data if exists
         """
-        if self.demo_mode:
-            return None
-        
         try:
-            key = f"job:{job_url}"
-            data = self.redis_client.get(key)
-            if data:
+            data = self.tiers["job"].get(self._key("job", job_url))
+            if data is not None:
                 app_logger.debug(f"Cache hit: {job_url}")
-                return self._deserialize(data)
+                return data
             app_logger.debug(f"Cache miss: {job_url}")
             return None
         except Exception as e:
             app_logger.error(f"Failed to get cached job {job_url}: {e}")
             return None
     
+    def cache_jobs(self, jobs: Dict[str, Dict], ttl_days: int = 7) -> int:
+        """
+        Cache many jobs in one round trip (pipelined SETEX)
+        
+        Args:
+            jobs: job_url -> job data
+            ttl_days: Time to live in days
+        
+        Returns:
+            int: Number of jobs cached
+        """
+        if not jobs:
+            return 0
+        
+        try:
+            cached = self.tiers["job"].set_many(
+                {self._key("job", job_url): job_data for job_url, job_data in jobs.items()},
+                ttl_days
+            )
+            app_logger.debug(f"Cached {cached} jobs")
+            return cached
+        except Exception as e:
+            app_logger.error(f"Failed to cache {len(jobs)} jobs: {e}")
+            return 0
+    
+    def get_cached_jobs(self, job_urls: List[str]) -> Dict[str, Dict]:
+        """
+        Retrieve many cached jobs with MGET (one round trip per MGET_CHUNK_SIZE URLs)
+        
+        Args:
+            job_urls: Job URLs
+        
+        Returns:
+            dict: job_url -> job data, for cache hits only
+        """
+        if not job_urls:
+            return {}
+        
+        found = {}
+        try:
+            for start in range(0, len(job_urls), MGET_CHUNK_SIZE):
+                keys = {self._key("job", job_url): job_url for job_url in job_urls[start:start + MGET_CHUNK_SIZE]}
+                for key, job_data in self.tiers["job"].get_many(list(keys)).items():
+                    found[keys[key]] = job_data
+            app_logger.debug(f"Job cache: {len(found)}/{len(job_urls)} hits")
+        except Exception as e:
+            app_logger.error(f"Failed to get {len(job_urls)} cached jobs: {e}")
+        return found
+    
     def cache_hr_contact(self, company_name: str, contact_data: Dict, ttl_days: int = 30) -> bool:
         """Cache HR contact for 30 days"""
-        if self.demo_mode:
-            return False
         try:
-            key = f"hr:{company_name.lower().strip()}"
-            self.redis_client.setex(key, timedelta(days=ttl_days), self._serialize(contact_data))
+            self.tiers["hr"].set(self._key("hr", company_name.lower().strip()), contact_data, ttl_days)
             app_logger.info(f"Cached HR contact for: {company_name}")
             return True
         except Exception as e:
@@ -124,48 +218,84 @@ class CacheManager:
     
     def get_cached_hr_contact(self, company_name: str) -> Optional[Dict]:
         """Retrieve cached HR contact"""
-        if self.demo_mode:
-            return None
         try:
-            key = f"hr:{company_name.lower().strip()}"
-            data = self.redis_client.get(key)
-            if data:
+            data = self.tiers["hr"].get(self._key("hr", company_name.lower().strip()))
+            if data is not None:
                 app_logger.info(f"Cache hit for HR: {company_name}")
-                return self._deserialize(data)
+                return data
             app_logger.debug(f"No cached HR for: {company_name}")
             return None
         except Exception as e:
             app_logger.error(f"Failed to get cached HR for {company_name}: {e}")
             return None
     
-    def cache_ats_analysis(self, job_id: int, ats_data: Dict, ttl_days: int = 14) -> bool:
-        """Cache ATS analysis for 14 days"""
-        if self.demo_mode:
-            return False
+    def cache_ats_analysis(self, job_id: Union[int, str], ats_data: Dict, ttl_days: int = 14) -> bool:
+        """Cache ATS analysis for 14 days (keyed by job ID or resume/JD digest)"""
         try:
-            key = f"ats_analysis:{job_id}"
-            self.redis_client.setex(key, timedelta(days=ttl_days), self._serialize(ats_data))
+            self.tiers["ats_analysis"].set(self._key("ats_analysis", job_id), ats_data, ttl_days)
             app_logger.debug(f"Cached ATS analysis for job {job_id}")
             return True
         except Exception as e:
             app_logger.error(f"Failed to cache ATS analysis for job {job_id}: {e}")
             return False
     
-    def get_cached_ats_analysis(self, job_id: int) -> Optional[Dict]:
+    def get_cached_ats_analysis(self, job_id: Union[int, str]) -> Optional[Dict]:
         """Retrieve cached ATS analysis"""
-        if self.demo_mode:
-            return None
         try:
-            key = f"ats_analysis:{job_id}"
-            data = self.redis_client.get(key)
-            if data:
+            data = self.tiers["ats_analysis"].get(self._key("ats_analysis", job_id))
+            if data is not None:
                 app_logger.debug(f"Cache hit for ATS analysis: job {job_id}")
-                return self._deserialize(data)
-            return None
+            return data
         except Exception as e:
             app_logger.error(f"Failed to get ATS analysis for job {job_id}: {e}")
             return None
     
+    def get_or_compute(
+        self,
+        namespace: str,
+        ident: Any,
+        compute: Callable[[], Optional[Dict]],
+        ttl_days: Optional[int] = None
+    ) -> Optional[Dict]:
+        """
+        Return the cached value, or compute and cache it on a miss
+        
+        Concurrent misses for the same key (threads here, or other
+        processes when SINGLE_FLIGHT_DISTRIBUTED=true) run compute() once;
+        the rest receive its result.
+        
+        Args:
+            namespace: 'job', 'hr' or 'ats_analysis'
+            ident: Key within the namespace (job URL, company name, ...)
+            compute: Produces the value on a miss; None results are not cached
+            ttl_days: Expiry (default: the namespace's TTL)
+        
+        Returns:
+            Cached or computed value (None if compute() found nothing)
+        """
+        if namespace == "hr":
+            ident = str(ident).lower().strip()
+        tier = self.tiers[namespace]
+        key = self._key(namespace, ident)
+        try:
+            cached = tier.get(key)
+        except Exception as e:
+            app_logger.error(f"Cache lookup failed for {key}: {e}")
+            cached = None
+        if cached is not None:
+            return cached
+        
+        def _compute_and_store():
+            value = compute()
+            if value is not None:
+                try:
+                    tier.set(key, value, ttl_days or NAMESPACE_SETTINGS[namespace][1])
+                except Exception as e:
+                    app_logger.error(f"Failed to cache {key}: {e}")
+            return value
+        
+        return self.flights[namespace].do(key, _compute_and_store, recheck=lambda: tier.get(key))
+    
     # ============================================================
     # Utility Functions
     # ============================================================
@@ -174,40 +304,148 @@ class CacheManager:
         """
         Clear cache by pattern
         
+        Walks the keyspace with SCAN and frees keys with UNLINK in batches of
+        SCAN_BATCH_SIZE, so Redis is never blocked by a single KEYS/DEL and
+        no giant argument list is built. Namespaces the pattern covers
+        entirely (e.g. "job:*", or "score:*" for ScoreCache) also lose their
+        in-process entries, in every live TieredCache, and their
+        cache_entries rows, so the SQL tier cannot serve them again. Prefer
+        invalidate_namespace() for dropping a whole namespace.
+        
         Args:
             pattern: Redis key pattern (e.g., "job:*", "hr:*")
         
         Returns:
-            int: Number of keys deleted
+            int: Number of Redis keys deleted
         """
+        for tier in live_tiered_caches():
+            if not fnmatch.fnmatchcase(f"{tier.namespace}:", pattern):
+                continue
+            tier.delete_local()
+            try:
+                purged = tier.purge_sql()
+                if purged:
+                    app_logger.info(f"Cleared {purged} SQL cache rows for '{tier.namespace}'")
+            except Exception as e:
+                app_logger.error(f"Failed to clear SQL cache rows for '{tier.namespace}': {e}")
+        
+        if self.demo_mode:
+            return 0
+        
         try:
-            keys = self.redis_client.keys(pattern)
-            if keys:
-                deleted = self.redis_client.delete(*keys)
+            deleted = self._unlink_matching(pattern)
+            if pattern == "*" or pattern.startswith("cache_gen:"):
+                self._generations.clear()
+            if deleted:
                 app_logger.info(f"Cleared {deleted} cache entries matching '{pattern}'")
-                return deleted
-            return 0
+            return deleted
         except Exception as e:
             app_logger.error(f"Failed to clear cache: {e}")
             return 0
     
+    def invalidate_namespace(self, namespace: str, reclaim: bool = True) -> Dict:
+        """
+        Invalidate every entry in a namespace in O(1)
+        
+        Bumps the namespace generation, so all existing keys stop being
+        addressed immediately (other processes see the bump within
+        GENERATION_CACHE_SECONDS). The orphaned keys would expire via their
+        TTL anyway; with reclaim=True they are also freed now with a
+        SCAN + UNLINK pass, and the namespace's cache_entries rows are
+        deleted. This process's in-process tier is always dropped.
+        
+        Without Redis (DEMO mode) there is no shared generation to bump, so
+        the cache_entries rows are always deleted, whatever reclaim says.
+        
+        Args:
+            namespace: One of CACHE_NAMESPACES ('job', 'hr', 'ats_analysis')
+            reclaim: Unlink keys from previous generations right away
+        
+        Returns:
+            dict: {'namespace', 'generation', 'reclaimed', 'sql_reclaimed'}
+                (reclaimed Redis keys / SQL rows)
+        """
+        if namespace not in CACHE_NAMESPACES:
+            raise ValueError(f"Unknown cache namespace '{namespace}' (expected one of {CACHE_NAMESPACES})")
+        
+        result = {"namespace": namespace, "generation": None, "reclaimed": 0, "sql_reclaimed": 0}
+        tier = self.tiers[namespace]
+        tier.delete_local()
+        
+        try:
+            if not self.demo_mode:
+                generation = self.redis_client.incr(GENERATION_KEY.format(namespace=namespace))
+                self._generations[namespace] = (generation, time.monotonic())
+                result["generation"] = generation
+                if reclaim:
+                    result["reclaimed"] = self.reclaim_namespace(namespace)
+            
+            if reclaim or self.demo_mode:
+                result["sql_reclaimed"] = tier.purge_sql()
+            app_logger.info(
+                f"Invalidated cache namespace '{namespace}' (generation {result['generation']}, "
+                f"{result['reclaimed']} keys / {result['sql_reclaimed']} SQL rows reclaimed)"
+            )
+        except Exception as e:
+            app_logger.error(f"Failed to invalidate cache namespace '{namespace}': {e}")
+        return result
+    
+    def reclaim_namespace(self, namespace: str) -> int:
+        """
+        Unlink keys of a namespace left over from previous generations
+        
+        Returns:
+            int: Number of keys reclaimed
+        """
+        if self.demo_mode:
+            return 0
+        
+        current_prefix = f"{namespace}:{self._generation(namespace)}:"
+        try:
+            return self._unlink_matching(f"{namespace}:*", keep=lambda key: key.decode("utf-8", "replace").startswith(current_prefix))
+        except Exception as e:
+            app_logger.error(f"Failed to reclaim cache namespace '{namespace}': {e}")
+            return 0
+    
+    def _unlink_matching(self, pattern: str, keep=None) -> int:
+        """SCAN for pattern and UNLINK matches in SCAN_BATCH_SIZE batches"""
+        deleted = 0
+        batch = []
+        for key in self.redis_client.scan_iter(match=pattern, count=SCAN_BATCH_SIZE):
+            if keep is not None and keep(key):
+                continue
+            batch.append(key)
+            if len(batch) >= SCAN_BATCH_SIZE:
+                deleted += self.redis_client.unlink(*batch)
+                batch = []
+        if batch:
+            deleted += self.redis_client.unlink(*batch)
+        return deleted
+    
     def get_cache_stats(self) -> Dict:
-        """Get cache statistics"""
+        """Get cache statistics (Redis server info plus per-namespace tier counters)"""
+        tiers = {namespace: tier.get_stats() for namespace, tier in self.tiers.items()}
+        single_flight = get_single_flight_stats()
+        if self.demo_mode:
+            return {"tiers": tiers, "single_flight": single_flight}
+        
         try:
             info = self.redis_client.info()
             stats = {
                 "total_keys": self.redis_client.dbsize(),
                 "memory_used": info.get("used_memory_human", "N/A"),
                 "connected_clients": info.get("connected_clients", 0),
-                "uptime_days": info.get("uptime_in_days", 0)
+                "uptime_days": info.get("uptime_in_days", 0),
+                "tiers": tiers,
+                "single_flight": single_flight
             }
             return stats
         except Exception as e:
             app_logger.error(f"Failed to get cache stats: {e}")
             return {}
 
-# Global cache manager instance
-cache_manager = CacheManager()
+# Global cache manager instance (connects to Redis on first use)
+cache_manager = lazy_singleton("cache_manager", CacheManager)
 
 if __name__ == "__main__":
     # Test Redis connection
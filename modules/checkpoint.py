@@ -1,131 +1,234 @@
 """
 Checkpoint Manager for LinkedIn Automation
 保存处理进度，支持中断恢复
+
+磁盘格式：
+  checkpoint.json           快照（与旧版格式相同）
+  checkpoint.journal.jsonl  快照之后的变更，每行一条，只追加
+每次变更只追加一行日志；日志超过 COMPACT_EVERY 行时合并进快照并清空日志。
+启动时先读快照再重放日志，所以进程崩溃时最多丢失最后一行未写完的记录。
 """
+import os
 import json
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Tuple
 
+from modules.lazy_loader import lazy_singleton
 from modules.logger_config import app_logger
 
+# 日志行数超过这个值时压缩进快照
+COMPACT_EVERY = 500
+
 
 class Checkpoint:
     """
     保存处理进度，支持中断恢复
+
+    processed/pending 在内存里是有序 dict（当作有序集合用），
+    标记一个联系人是 O(1)，写盘是追加一行 JSON。
     """
-    def __init__(self, checkpoint_file: str = 'data/checkpoint.json'):
+    def __init__(self, checkpoint_file: str = 'data/checkpoint.json', fsync: bool = False):
+        """
+        Args:
+            checkpoint_file: 快照文件路径（日志文件放在旁边）
+            fsync: 每条日志都 fsync（防断电；默认只 flush，防进程崩溃）
+        """
         self.checkpoint_file = Path(checkpoint_file)
+        self.journal_file = self.checkpoint_file.with_suffix('.journal.jsonl')
+        self.fsync = fsync
+        self._lock = threading.RLock()
+        self._journal = None
+        self._journal_lines = 0
         self._load()
-    
+
     def _load(self):
-        """加载检查点"""
+        """加载快照并重放日志"""
+        self._init_state()
         if self.checkpoint_file.exists():
             try:
                 with open(self.checkpoint_file, 'r', encoding='utf-8') as f:
-                    self.state = json.load(f)
-                app_logger.info(f"Loaded checkpoint: {len(self.state.get('processed_contacts', []))} processed")
+                    state = json.load(f)
+                self._processed = dict.fromkeys(state.pop('processed_contacts', []))
+                self._pending = dict.fromkeys(state.pop('pending_contacts', []))
+                self.state.update(state)
             except Exception as e:
                 app_logger.error(f"Failed to load checkpoint: {e}")
                 self._init_state()
-        else:
-            self._init_state()
-    
+
+        replayed, torn = self._replay_journal()
+        if torn:
+            # 不能在半行后面继续追加，先压缩掉
+            self.save()
+        app_logger.info(f"Loaded checkpoint: {len(self._processed)} processed ({replayed} journal entries replayed)")
+
+    def _replay_journal(self) -> Tuple[int, bool]:
+        """
+        重放日志
+
+        日志里的操作对快照是幂等的（加入集合 / 整体替换 / 清空已处理），
+        所以压缩时如果在写完快照、清空日志之前崩溃，重放一遍也不会出错。
+
+        Returns:
+            (重放条数, 是否有写坏的行)
+        """
+        if not self.journal_file.exists():
+            return 0, False
+        replayed, torn = 0, False
+        try:
+            with open(self.journal_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # 崩溃时写了一半的最后一行
+                        app_logger.warning("Skipping truncated checkpoint journal entry")
+                        torn = True
+                        continue
+                    self._apply(entry)
+                    replayed += 1
+        except Exception as e:
+            app_logger.error(f"Failed to replay checkpoint journal: {e}")
+        self._journal_lines = replayed
+        return replayed, torn
+
     def _init_state(self):
         """初始化状态"""
         self.state = {
             'current_company': None,
             'current_school': None,
-            'processed_contacts': [],
-            'pending_contacts': [],
             'last_updated': None,
             'session_start': datetime.now().isoformat()
         }
-    
+        self._processed: Dict[str, None] = {}
+        self._pending: Dict[str, None] = {}
+
+    # ============================================================
+    # 日志
+    # ============================================================
+
+    def _apply(self, entry: Dict):
+        """把一条日志应用到内存状态"""
+        op = entry.get('op')
+        if op == 'search':
+            self.state['current_company'] = entry.get('company')
+            self.state['current_school'] = entry.get('school')
+        elif op == 'processed':
+            self._processed[entry['id']] = None
+            self._pending.pop(entry['id'], None)
+        elif op == 'pending':
+            self._pending = dict.fromkeys(entry['ids'])
+        elif op == 'clear_processed':
+            self._processed = {}
+        self.state['last_updated'] = entry.get('ts', self.state.get('last_updated'))
+
+    def _record(self, op: str, **fields):
+        """应用一条变更并追加到日志"""
+        entry = {'op': op, 'ts': datetime.now().isoformat(), **fields}
+        with self._lock:
+            self._apply(entry)
+            try:
+                if self._journal is None:
+                    self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+                    self._journal = open(self.journal_file, 'a', encoding='utf-8')
+                self._journal.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                self._journal.flush()
+                if self.fsync:
+                    os.fsync(self._journal.fileno())
+                self._journal_lines += 1
+            except Exception as e:
+                app_logger.error(f"Failed to write checkpoint journal: {e}")
+                return
+            if self._journal_lines >= COMPACT_EVERY:
+                self.save()
+
     def save(self):
-        """保存检查点"""
-        try:
-            self.checkpoint_file.parent.mkdir(exist_ok=True)
-            self.state['last_updated'] = datetime.now().isoformat()
-            with open(self.checkpoint_file, 'w', encoding='utf-8') as f:
-                json.dump(self.state, f, indent=2)
-            app_logger.debug("Checkpoint saved")
-        except Exception as e:
-            app_logger.error(f"Failed to save checkpoint: {e}")
-    
+        """压缩：写完整快照（原子替换）并清空日志"""
+        with self._lock:
+            try:
+                self.checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
+                self.state['last_updated'] = datetime.now().isoformat()
+                snapshot = {
+                    **self.state,
+                    'processed_contacts': list(self._processed),
+                    'pending_contacts': list(self._pending)
+                }
+                tmp_file = self.checkpoint_file.with_suffix('.json.tmp')
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(snapshot, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, self.checkpoint_file)
+
+                if self._journal is not None:
+                    self._journal.close()
+                    self._journal = None
+                open(self.journal_file, 'w').close()
+                self._journal_lines = 0
+                app_logger.debug("Checkpoint compacted")
+            except Exception as e:
+                app_logger.error(f"Failed to save checkpoint: {e}")
+
+    def close(self):
+        """压缩并关闭日志文件"""
+        self.save()
+
+    # ============================================================
+    # 进度
+    # ============================================================
+
     def set_current_search(self, company: str, school: str):
         """设置当前搜索目标"""
-        self.state['current_company'] = company
-        self.state['current_school'] = school
-        self.save()
-    
+        self._record('search', company=company, school=school)
+
     def mark_contact_processed(self, contact_id: str):
         """标记联系人已处理"""
-        if contact_id not in self.state['processed_contacts']:
-            self.state['processed_contacts'].append(contact_id)
-        self._remove_from_pending(contact_id)
-        self.save()
+        self._record('processed', id=contact_id)
         app_logger.debug(f"Contact processed: {contact_id}")
-    
-    def _remove_from_pending(self, contact_id: str):
-        """从pending列表移除"""
-        self.state['pending_contacts'] = [
-            c for c in self.state['pending_contacts'] 
-            if c != contact_id
-        ]
-    
+
     def set_pending_contacts(self, contacts: List[Dict]):
         """设置待处理联系人列表"""
-        self.state['pending_contacts'] = [
-            c.get('linkedin_url') or c.get('name', '') 
-            for c in contacts
-        ]
-        self.save()
+        self._record('pending', ids=[c.get('linkedin_url') or c.get('name', '') for c in contacts])
         app_logger.info(f"Set {len(contacts)} pending contacts")
-    
+
     def get_resume_point(self) -> List[str]:
         """获取需要恢复处理的联系人ID列表"""
-        pending = self.state.get('pending_contacts', [])
-        processed = self.state.get('processed_contacts', [])
-        return [c for c in pending if c not in processed]
-    
+        return [c for c in self._pending if c not in self._processed]
+
     def is_contact_processed(self, contact_id: str) -> bool:
         """检查联系人是否已处理"""
-        return contact_id in self.state.get('processed_contacts', [])
-    
+        return contact_id in self._processed
+
     def has_pending_work(self) -> bool:
         """检查是否有未完成的工作"""
-        return len(self.get_resume_point()) > 0
-    
+        return any(c not in self._processed for c in self._pending)
+
     def get_progress(self) -> Dict:
         """获取进度统计"""
-        total = len(self.state.get('pending_contacts', []))
-        processed = len(self.state.get('processed_contacts', []))
-        remaining = len(self.get_resume_point())
-        
         return {
-            'total': total,
-            'processed': processed,
-            'remaining': remaining,
+            'total': len(self._pending),
+            'processed': len(self._processed),
+            'remaining': len(self.get_resume_point()),
             'current_company': self.state.get('current_company'),
             'current_school': self.state.get('current_school'),
             'last_updated': self.state.get('last_updated')
         }
-    
+
     def clear(self):
         """清空检查点（开始新会话）"""
-        self._init_state()
-        self.save()
+        with self._lock:
+            self._init_state()
+            self.save()
         app_logger.info("Checkpoint cleared")
-    
+
     def clear_processed(self):
         """只清空已处理列表（保留pending）"""
-        self.state['processed_contacts'] = []
-        self.save()
+        self._record('clear_processed')
 
 
-# 全局实例
-checkpoint = Checkpoint()
+# 全局实例（首次使用时加载状态文件）
+checkpoint = lazy_singleton("checkpoint", Checkpoint)
 
 
 if __name__ == "__main__":
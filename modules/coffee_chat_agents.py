@@ -6,7 +6,6 @@ import os
 import sys
 from typing import Dict, List, Optional
 from datetime import datetime
-from openai import OpenAI
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -16,6 +15,10 @@ load_dotenv()
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from modules.logger_config import app_logger
+from modules.llm_gateway import llm_gateway
+from modules.contact_rules import (
+    ACCEPT, UNCERTAIN, SCAM_CAUTION_SCORE, SCAM_SKIP_SCORE, scam_rules, scam_stage_stats
+)
 
 
 class ContactRankerAgent:
@@ -130,11 +133,10 @@ class ContactRankerAgent:
 class PersonalizationAgent:
     """
     Generates personalized messages for connection requests and coffee chats
-    Uses OpenAI GPT-4 for natural language generation
+    Uses OpenAI (via the LLM gateway) for natural language generation
     """
     
     def __init__(self):
-        self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
         self.model = os.getenv('OPENAI_MODEL', 'gpt-4o-mini')
     
     def generate_connection_message(
@@ -179,7 +181,8 @@ Requirements:
 
 Generate the message:"""
             
-            response = self.client.chat.completions.create(
+            response = llm_gateway.complete(
+                "message_generation",
                 model=self.model,
                 messages=[
                     {"role": "system", "content": "You are a professional networking expert helping craft authentic LinkedIn messages."},
@@ -189,7 +192,7 @@ Generate the message:"""
                 temperature=0.7
             )
             
-            message = response.choices[0].message.content.strip().strip('"')
+            message = response.text.strip().strip('"')
             
             # Ensure it's under 300 chars
             if len(message) > 300:
@@ -269,7 +272,8 @@ Requirements:
 
 Generate the message:"""
             
-            response = self.client.chat.completions.create(
+            response = llm_gateway.complete(
+                "message_generation",
                 model=self.model,
                 messages=[
                     {"role": "system", "content": "You are a career coach helping craft authentic coffee chat invitations."},
@@ -279,7 +283,7 @@ Generate the message:"""
                 temperature=0.7
             )
             
-            message = response.choices[0].message.content.strip().strip('"')
+            message = response.text.strip().strip('"')
             
             app_logger.info(f"Generated coffee chat message for {name}")
             
@@ -317,12 +321,13 @@ Generate the message:"""
             Return ONLY the hooks as a bulleted list.
             """
             
-            analysis_res = self.client.chat.completions.create(
+            analysis_res = llm_gateway.complete(
+                "profile_analysis",
                 model=self.model,
                 messages=[{"role": "user", "content": analysis_prompt}],
                 max_tokens=150
             )
-            hooks = analysis_res.choices[0].message.content.strip()
+            hooks = analysis_res.text.strip()
             
             # 2. Generate Message
             msg_prompt = f"""Write a warm, professional LinkedIn cold message to {contact_name}.
@@ -343,13 +348,14 @@ Generate the message:"""
             - End with a low-pressure ask ("Open to a brief chat?").
             """
             
-            msg_res = self.client.chat.completions.create(
+            msg_res = llm_gateway.complete(
+                "message_generation",
                 model=self.model,
                 messages=[{"role": "user", "content": msg_prompt}],
                 max_tokens=200
             )
             
-            return msg_res.choices[0].message.content.strip().replace('"', '')
+            return msg_res.text.strip().replace('"', '')
 
         except Exception as e:
             app_logger.error(f"Deep dive generation failed: {e}")
@@ -363,7 +369,6 @@ class ScamDetectionAgent:
     """
     
     def __init__(self):
-        self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
         self.model = os.getenv('OPENAI_MODEL', 'gpt-4o-mini')
     
     def analyze_profile(
@@ -381,49 +386,26 @@ class ScamDetectionAgent:
         Returns:
             Dict with risk_score, is_safe, flags, recommendation
         """
-        risk_score = 0
-        flags = []
-        
-        # Basic checks (without snapshot)
-        
-        # 1. Connection count
-        connections = contact.get('connections_count', 0)
-        if connections < 50:
-            risk_score += 3
-            flags.append("Low connections (<50)")
-        elif connections > 5000:
-            risk_score += 1
-            flags.append("Very high connections (>5000)")
-        
-        # 2. Profile photo
-        if not contact.get('has_photo', True):
-            risk_score += 2
-            flags.append("No profile photo")
-        
-        # 3. Work history
-        work_history = contact.get('work_history', [])
-        if len(work_history) < 2:
-            risk_score += 2
-            flags.append("Limited work history (<2 positions)")
-        
-        # 4. Generic title
-        title = contact.get('title', '').lower()
-        generic_titles = ['entrepreneur', 'founder', 'ceo', 'business owner', 'consultant']
-        if any(g in title for g in generic_titles) and connections < 100:
-            risk_score += 2
-            flags.append("Generic title with low connections")
-        
-        # 5. AI-enhanced analysis (if snapshot available)
-        if linkedin_snapshot:
+        # Deterministic rules first; the LLM only sees the band where its
+        # answer (0-5 extra risk) could change the outcome
+        decision, risk_score, flags = scam_rules(contact)
+        decided_by = 'rules'
+        if decision == UNCERTAIN and linkedin_snapshot and llm_gateway.is_available('scam_detection', self.model):
+            scam_stage_stats.record('llm')
             ai_result = self._ai_check(contact, linkedin_snapshot)
             risk_score += ai_result.get('risk_score', 0)
             flags.extend(ai_result.get('flags', []))
+            decided_by = 'llm'
+        elif decision == UNCERTAIN:
+            scam_stage_stats.record('no_llm')
+        else:
+            scam_stage_stats.record('rules_accept' if decision == ACCEPT else 'rules_reject')
         
         # Determine recommendation
-        is_safe = risk_score < 7
-        if risk_score < 4:
+        is_safe = risk_score < SCAM_SKIP_SCORE
+        if risk_score < SCAM_CAUTION_SCORE:
             recommendation = 'safe'
-        elif risk_score < 7:
+        elif risk_score < SCAM_SKIP_SCORE:
             recommendation = 'caution'
         else:
             recommendation = 'skip'
@@ -432,10 +414,11 @@ class ScamDetectionAgent:
             'risk_score': risk_score,
             'is_safe': is_safe,
             'flags': flags,
-            'recommendation': recommendation
+            'recommendation': recommendation,
+            'decided_by': decided_by
         }
         
-        app_logger.info(f"Scam check for {contact.get('name')}: {recommendation} (score: {risk_score})")
+        app_logger.info(f"Scam check for {contact.get('name')}: {recommendation} (score: {risk_score}, by {decided_by})")
         
         return result
     
@@ -473,7 +456,8 @@ Return JSON with:
 Only return the JSON, nothing else.
 """
             
-            response = self.client.chat.completions.create(
+            response = llm_gateway.complete(
+                "scam_detection",
                 model=self.model,
                 messages=[
                     {"role": "system", "content": "You are a LinkedIn profile authenticity analyzer. Return only JSON."},
@@ -484,7 +468,7 @@ Only return the JSON, nothing else.
             )
             
             import json
-            result = json.loads(response.choices[0].message.content.strip())
+            result = json.loads(response.text.strip())
             
             return result
             
@@ -3,11 +3,12 @@ Coffee Chat Memory Layer using ChromaDB
 Stores interaction history, learns from successful messages, and optimizes outreach
 """
 import os
+import re
 import sys
-from typing import List, Dict, Optional
+import hashlib
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import chromadb
-from openai import OpenAI
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -16,47 +17,104 @@ load_dotenv()
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from modules.logger_config import app_logger
+from modules.single_flight import SingleFlight
+from modules.embedding_provider import EMBEDDING_MODEL, EmbeddingError, EmbeddingProvider, get_embedding_provider
+from modules.embedding_cache import CachedEmbeddingProvider
+from modules.contact_store import ContactStore, MESSAGES, MESSAGES_ACCEPTED, INTERACTIONS, MIGRATED
+from modules.contacted_index import ContactedIndex
+
+# Records per bulk collection.add/upsert (Chroma caps a single batch)
+WRITE_CHUNK_SIZE = 1000
 
 
 class CoffeeChatMemory:
     """
     Memory layer for Coffee Chat automation
-    Uses ChromaDB for vector storage and retrieval
+    Uses ChromaDB for vector storage and retrieval, and a relational
+    ContactStore for contact status, search history and counters
     """
     
-    def __init__(self, persist_directory: str = "./chroma_data"):
+    def __init__(
+        self,
+        persist_directory: str = "./chroma_data",
+        embedder: Optional[EmbeddingProvider] = None,
+        store: Optional[ContactStore] = None,
+        contacted_index: Optional[ContactedIndex] = None
+    ):
         """
         Initialize ChromaDB client
         
         Args:
             persist_directory: Directory to persist ChromaDB data
+            embedder: Embedding provider (default: EMBEDDING_BACKEND, behind the
+                persistent embedding cache unless EMBEDDING_CACHE=false)
+            store: Contact status store (default: tables in the main database)
+            contacted_index: Membership index for has_contacted/contacted_ids
+                (default: built over the store on first use)
         """
         # Use PersistentClient to ensure data is saved to disk
         self.client = chromadb.PersistentClient(path=persist_directory)
         
-        self.openai_client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        if embedder is None:
+            embedder = get_embedding_provider()
+            if os.getenv("EMBEDDING_CACHE", "true").lower() == "true":
+                embedder = CachedEmbeddingProvider(embedder)
+        self.embedder = embedder
         
-        # Create collections
-        self.messages_collection = self.client.get_or_create_collection(
-            name="coffee_chat_messages",
-            metadata={"description": "Message history and templates"}
+        # Create collections (one set per embedding backend, since vectors
+        # from different models/dimensions can't share an index)
+        self.messages_collection = self._get_collection(
+            "coffee_chat_messages", "Message history and templates"
         )
         
-        self.contacts_collection = self.client.get_or_create_collection(
-            name="coffee_chat_contacts",
-            metadata={"description": "Contact profiles and interactions"}
+        self.contacts_collection = self._get_collection(
+            "coffee_chat_contacts", "Contact profiles and interactions"
         )
         
-        self.interactions_collection = self.client.get_or_create_collection(
-            name="coffee_chat_interactions",
-            metadata={"description": "Interaction logs and outcomes"}
+        self.interactions_collection = self._get_collection(
+            "coffee_chat_interactions", "Interaction logs and outcomes"
         )
         
-        app_logger.info("Memory layer initialized")
+        # Concurrent saves/searches embedding the same text share one API call
+        self._embedding_flight = SingleFlight("embedding")
+        
+        self.store = store or ContactStore()
+        self._migrate_from_chroma()
+        self._contacted_index = contacted_index
+        self._persist_directory = persist_directory
+        
+        app_logger.info(f"Memory layer initialized (embeddings: {self.embedder.model})")
+    
+    def _get_collection(self, base_name: str, description: str):
+        """
+        Get or create the collection for this embedding backend
+        
+        The OpenAI model keeps the original collection names so existing
+        data stays in place; other backends get a '__<model>' suffix.
+        """
+        name = base_name
+        if self.embedder.model != EMBEDDING_MODEL:
+            name = f"{base_name}__{re.sub(r'[^a-zA-Z0-9_-]', '-', self.embedder.model)}"[:63]
+        return self.client.get_or_create_collection(
+            name=name,
+            metadata={
+                "description": description,
+                "embedding_model": self.embedder.model,
+                "dimensions": self.embedder.dimensions
+            }
+        )
+    
+    @property
+    def contacted_index(self) -> ContactedIndex:
+        """In-memory contacted-id index (loaded on first use)"""
+        if self._contacted_index is None:
+            path = os.getenv("CONTACTED_INDEX_PATH") or os.path.join(self._persist_directory, "contacted_index.bin")
+            self._contacted_index = ContactedIndex(self.store, path=path)
+        return self._contacted_index
     
     def _get_embedding(self, text: str) -> List[float]:
         """
-        Get OpenAI embedding for text
+        Get embedding for text
         
         Args:
             text: Text to embed
@@ -64,16 +122,156 @@ class CoffeeChatMemory:
         Returns:
             Embedding vector
         """
+        key = hashlib.sha256(f"{self.embedder.model}\x1f{text}".encode("utf-8")).hexdigest()
+        return self._embedding_flight.do(key, lambda: self._get_embeddings([text])[0])
+    
+    def _get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed many texts with as few provider requests as possible
+        
+        Duplicate texts are embedded once. There is no placeholder fallback:
+        a zero vector would be stored and matched as if it were real, so
+        callers skip the write/query instead.
+        
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            One vector per text, in input order
+        
+        Raises:
+            EmbeddingError: The backend failed or returned malformed vectors
+        """
+        unique = list(dict.fromkeys(texts))
         try:
-            response = self.openai_client.embeddings.create(
-                model="text-embedding-3-small",
-                input=text
-            )
-            return response.data[0].embedding
+            embedded = self.embedder.embed(unique)
         except Exception as e:
-            app_logger.error(f"Failed to get embedding: {e}")
-            # Return dummy embedding (1536 dims) as fallback
-            return [0.0] * 1536
+            raise EmbeddingError(f"{self.embedder.model}: failed to embed {len(unique)} texts: {e}") from e
+        if len(embedded) != len(unique) or any(len(vector) != self.embedder.dimensions for vector in embedded):
+            raise EmbeddingError(f"{self.embedder.model}: expected {len(unique)} vectors of {self.embedder.dimensions} dims")
+        vectors = dict(zip(unique, embedded))
+        return [vectors[text] for text in texts]
+    
+    def _migrate_from_chroma(self):
+        """
+        One-time copy of contacts, search history and counters that older
+        versions kept only in Chroma metadata into the ContactStore
+        """
+        try:
+            if MIGRATED in self.store.counters():
+                return
+            
+            contacts = self.contacts_collection.get(include=["documents", "metadatas"])
+            records = {
+                contact_id: {
+                    'profile_text': contacts['documents'][i] if contacts['documents'] else '',
+                    'metadata': (contacts['metadatas'] or [None] * len(contacts['ids']))[i] or {}
+                }
+                for i, contact_id in enumerate(contacts['ids'])
+            }
+            self.store.add_contacts(records)
+            
+            searches = self.interactions_collection.get(where={"type": "search"}, include=["metadatas"])
+            for metadata in searches['metadatas'] or []:
+                self.store.record_search(metadata.get('company', ''), metadata.get('school'), metadata.get('results_count', 0))
+            
+            accepted = self.messages_collection.get(where={"response_status": "accepted"}, include=[])
+            self.store.increment({
+                MESSAGES: self.messages_collection.count(),
+                MESSAGES_ACCEPTED: len(accepted['ids']),
+                INTERACTIONS: self.interactions_collection.count() - len(searches['ids']),
+            })
+            self.store.increment({MIGRATED: 1})
+            if records or searches['ids']:
+                app_logger.info(f"Migrated {len(records)} contacts and {len(searches['ids'])} searches from Chroma metadata")
+        except Exception as e:
+            app_logger.error(f"Failed to migrate memory metadata from Chroma: {e}")
+    
+    def get_embedding_stats(self) -> Dict:
+        """Embedding cache hit rate and provider calls since the last reset (empty without a cache)"""
+        if isinstance(self.embedder, CachedEmbeddingProvider):
+            return self.embedder.get_stats()
+        return {}
+    
+    def reset_embedding_stats(self):
+        """Start a new embedding stats window (e.g. per import run)"""
+        if isinstance(self.embedder, CachedEmbeddingProvider):
+            self.embedder.reset_stats()
+    
+    # ============================================================
+    # Record builders (shared by single and bulk saves)
+    # ============================================================
+    
+    @staticmethod
+    def _message_record(
+        contact_id: str,
+        message_text: str,
+        message_type: str,
+        response_status: Optional[str] = None,
+        response_time_hours: Optional[int] = None,
+        metadata: Optional[Dict] = None
+    ) -> Tuple[str, Dict]:
+        """Build the (id, metadata) pair stored for a sent message"""
+        now = datetime.utcnow()
+        message_id = f"msg_{contact_id}_{now.timestamp()}"
+        msg_metadata = {
+            'contact_id': contact_id,
+            'type': message_type,
+            'sent_at': now.isoformat(),
+            'response_status': response_status or 'pending',
+            'response_time_hours': response_time_hours or 0
+        }
+        if metadata:
+            msg_metadata.update(metadata)
+        return message_id, msg_metadata
+    
+    @staticmethod
+    def _contact_record(contact_data: Dict) -> Tuple[str, Dict]:
+        """Build the (profile text, metadata) pair stored for a contact"""
+        # Create profile text for embedding
+        profile_text = f"{contact_data.get('title', '')} at {contact_data.get('company', '')}. "
+        if contact_data.get('school_name'):
+            profile_text += f"Alumni of {contact_data['school_name']}. "
+        
+        # Prepare metadata - save all fields from contact_data
+        # ChromaDB metadata must be simple types (str, int, float, bool)
+        metadata = {}
+        for key, value in contact_data.items():
+            # Convert all values to strings for ChromaDB compatibility
+            if value is not None and not isinstance(value, (list, dict)):
+                metadata[key] = str(value)
+        
+        # Ensure required fields
+        if 'name' not in metadata:
+            metadata['name'] = ''
+        if 'first_contact_date' not in metadata:
+            metadata['first_contact_date'] = datetime.utcnow().isoformat()
+        if 'relationship_status' not in metadata:
+            metadata['relationship_status'] = 'pending'
+        return profile_text, metadata
+    
+    def _bulk_write(
+        self,
+        collection,
+        ids: List[str],
+        documents: List[str],
+        metadatas: Optional[List[Dict]] = None,
+        upsert: bool = False
+    ):
+        """Embed documents in batches and write them with one add/upsert per chunk"""
+        write = collection.upsert if upsert else collection.add
+        for start in range(0, len(ids), WRITE_CHUNK_SIZE):
+            end = start + WRITE_CHUNK_SIZE
+            write(
+                ids=ids[start:end],
+                embeddings=self._get_embeddings(documents[start:end]),
+                documents=documents[start:end],
+                metadatas=metadatas[start:end] if metadatas else None
+            )
+    
+    # ============================================================
+    # Saves
+    # ============================================================
     
     def save_message(
         self,
@@ -96,36 +294,61 @@ class CoffeeChatMemory:
             metadata: Additional metadata
         """
         try:
-            message_id = f"msg_{contact_id}_{datetime.utcnow().timestamp()}"
-            
-            # Get embedding
-            embedding = self._get_embedding(message_text)
-            
-            # Prepare metadata
-            msg_metadata = {
-                'contact_id': contact_id,
-                'type': message_type,
-                'sent_at': datetime.utcnow().isoformat(),
-                'response_status': response_status or 'pending',
-                'response_time_hours': response_time_hours or 0
-            }
-            
-            if metadata:
-                msg_metadata.update(metadata)
+            message_id, msg_metadata = self._message_record(
+                contact_id, message_text, message_type, response_status, response_time_hours, metadata
+            )
             
             # Save to ChromaDB
             self.messages_collection.add(
                 ids=[message_id],
-                embeddings=[embedding],
+                embeddings=[self._get_embedding(message_text)],
                 documents=[message_text],
                 metadatas=[msg_metadata]
             )
+            self.store.increment({
+                MESSAGES: 1,
+                MESSAGES_ACCEPTED: int(msg_metadata['response_status'] == 'accepted')
+            })
             
             app_logger.info(f"Saved message: {message_id}")
             
         except Exception as e:
             app_logger.error(f"Failed to save message: {e}")
     
+    def save_messages(self, messages: List[Dict]) -> int:
+        """
+        Save many sent messages with batched embeddings and bulk writes
+        
+        Args:
+            messages: Dicts with save_message's arguments (contact_id,
+                message_text, message_type, and optionally response_status,
+                response_time_hours, metadata)
+            
+        Returns:
+            Number of messages saved
+        """
+        if not messages:
+            return 0
+        try:
+            ids, documents, metadatas = [], [], []
+            for i, message in enumerate(messages):
+                message_id, msg_metadata = self._message_record(**message)
+                # Batch entries can share a timestamp; keep ids unique
+                ids.append(f"{message_id}_{i}")
+                documents.append(message['message_text'])
+                metadatas.append(msg_metadata)
+            
+            self._bulk_write(self.messages_collection, ids, documents, metadatas)
+            self.store.increment({
+                MESSAGES: len(ids),
+                MESSAGES_ACCEPTED: sum(1 for metadata in metadatas if metadata['response_status'] == 'accepted')
+            })
+            app_logger.info(f"Saved {len(ids)} messages")
+            return len(ids)
+        except Exception as e:
+            app_logger.error(f"Failed to save {len(messages)} messages: {e}")
+            return 0
+    
     def save_contact(
         self,
         contact_id: str,
@@ -138,43 +361,51 @@ class CoffeeChatMemory:
             contact_id: Unique contact identifier
             contact_data: Contact information
         """
-        try:
-            # Create profile text for embedding
-            profile_text = f"{contact_data.get('title', '')} at {contact_data.get('company', '')}. "
-            if contact_data.get('school_name'):
-                profile_text += f"Alumni of {contact_data['school_name']}. "
-            
-            # Get embedding
-            embedding = self._get_embedding(profile_text)
-            
-            # Prepare metadata - save all fields from contact_data
-            # ChromaDB metadata must be simple types (str, int, float, bool)
-            metadata = {}
-            for key, value in contact_data.items():
-                # Convert all values to strings for ChromaDB compatibility
-                if value is not None and not isinstance(value, (list, dict)):
-                    metadata[key] = str(value)
-            
-            # Ensure required fields
-            if 'name' not in metadata:
-                metadata['name'] = ''
-            if 'first_contact_date' not in metadata:
-                metadata['first_contact_date'] = datetime.utcnow().isoformat()
-            if 'relationship_status' not in metadata:
-                metadata['relationship_status'] = 'pending'
-            
-            # Save to ChromaDB
-            self.contacts_collection.add(
-                ids=[contact_id],
-                embeddings=[embedding],
-                documents=[profile_text],
-                metadatas=[metadata]
-            )
-            
+        if self.save_contacts({contact_id: contact_data}):
             app_logger.info(f"Saved contact: {contact_id}")
+    
+    def save_contacts(self, contacts: Dict[str, Dict], upsert: bool = False) -> int:
+        """
+        Save many contact profiles with batched embeddings and bulk writes
+        
+        Contacts go to the ContactStore first, so they count as contacted
+        even if embedding fails; only their profile vectors go to Chroma.
+        Contacts already in memory are skipped without being embedded,
+        unless upsert=True.
+        
+        Args:
+            contacts: contact_id -> contact information
+            upsert: Overwrite existing contacts instead of skipping them
             
+        Returns:
+            Number of contacts written
+        """
+        if not contacts:
+            return 0
+        try:
+            records = {}
+            for contact_id, contact_data in contacts.items():
+                profile_text, metadata = self._contact_record(contact_data)
+                records[contact_id] = {'profile_text': profile_text, 'metadata': metadata}
+            written = self.store.add_contacts(records, upsert=upsert)
+            if self._contacted_index is not None:
+                self._contacted_index.add(written)
+        except Exception as e:
+            app_logger.error(f"Failed to save {len(contacts)} contacts: {e}")
+            return 0
+        
+        try:
+            self._bulk_write(
+                self.contacts_collection,
+                written,
+                [records[contact_id]['profile_text'] for contact_id in written],
+                upsert=True
+            )
         except Exception as e:
-            app_logger.error(f"Failed to save contact: {e}")
+            app_logger.error(f"Saved {len(written)} contacts without profile vectors: {e}")
+        
+        app_logger.info(f"Saved {len(written)} contacts ({len(contacts) - len(written)} already in memory)")
+        return len(written)
     
     def save_interaction(
         self,
@@ -216,6 +447,7 @@ class CoffeeChatMemory:
                 documents=[content],
                 metadatas=[metadata]
             )
+            self.store.increment({INTERACTIONS: 1})
             
             app_logger.info(f"Saved interaction: {interaction_id}")
             
@@ -288,11 +520,16 @@ class CoffeeChatMemory:
                 n_results=limit
             )
             
+            # Current status/attributes come from the store (one IN query)
+            stored = self.store.get_contacts(results['ids'][0])
             contacts = []
             for i, doc in enumerate(results['documents'][0]):
+                contact_id = results['ids'][0][i]
+                metadata = stored.get(contact_id) or (results['metadatas'][0][i] if results['metadatas'] else None) or {}
+                metadata = {key: value for key, value in metadata.items() if key not in ('id', 'profile')}
                 contacts.append({
                     'profile': doc,
-                    'metadata': results['metadatas'][0][i],
+                    'metadata': metadata,
                     'similarity': results['distances'][0][i] if 'distances' in results else None
                 })
             
@@ -312,11 +549,32 @@ class CoffeeChatMemory:
         Returns:
             True if already contacted
         """
+        return contact_id in self.contacted_ids([contact_id])
+    
+    def contacted_ids(self, contact_ids: List[str]) -> set:
+        """
+        Which of these contacts we've already contacted, in one call
+        
+        Answered from the ContactedIndex (no per-id store query), so
+        filter a whole batch with this rather than calling has_contacted
+        in a loop.
+        
+        Args:
+            contact_ids: Contact identifiers
+            
+        Returns:
+            Set of the identifiers already in memory
+        """
+        contact_ids = list(contact_ids)
         try:
-            result = self.contacts_collection.get(ids=[contact_id])
-            return len(result['ids']) > 0
-        except:
-            return False
+            return self.contacted_index.contacted(contact_ids)
+        except Exception as e:
+            app_logger.error(f"Contacted index unavailable, checking store directly: {e}")
+        try:
+            return self.store.existing_ids(contact_ids)
+        except Exception as e:
+            app_logger.error(f"Failed to check {len(contact_ids)} contacts: {e}")
+            return set()
     
     def get_stats(self) -> Dict:
         """
@@ -326,21 +584,15 @@ class CoffeeChatMemory:
             Dict with stats
         """
         try:
-            messages_count = self.messages_collection.count()
-            contacts_count = self.contacts_collection.count()
-            interactions_count = self.interactions_collection.count()
-            
-            # Get success rate
-            accepted = self.messages_collection.get(
-                where={"response_status": "accepted"}
-            )
-            accepted_count = len(accepted['ids'])
+            counters = self.store.counters()
+            messages_count = counters.get(MESSAGES, 0)
+            accepted_count = counters.get(MESSAGES_ACCEPTED, 0)
             success_rate = (accepted_count / messages_count * 100) if messages_count > 0 else 0
             
             return {
                 'total_messages': messages_count,
-                'total_contacts': contacts_count,
-                'total_interactions': interactions_count,
+                'total_contacts': self.store.contact_count(),
+                'total_interactions': counters.get(INTERACTIONS, 0),
                 'accepted_connections': accepted_count,
                 'success_rate': success_rate
             }
@@ -348,6 +600,19 @@ class CoffeeChatMemory:
             app_logger.error(f"Failed to get stats: {e}")
             return {}
     
+    def get_status_counts(self) -> Dict[str, int]:
+        """
+        Count contacts per relationship status
+        
+        Returns:
+            Dict of status -> number of contacts
+        """
+        try:
+            return self.store.status_counts()
+        except Exception as e:
+            app_logger.error(f"Failed to count contacts by status: {e}")
+            return {}
+    
     def get_pending_contacts(self) -> List[str]:
         """
         Get list of contact IDs with pending status
@@ -356,10 +621,7 @@ class CoffeeChatMemory:
             List of contact IDs
         """
         try:
-            results = self.contacts_collection.get(
-                where={"relationship_status": "pending"}
-            )
-            return results['ids'] if results['ids'] else []
+            return self.store.contact_ids_by_status('pending')
         except Exception as e:
             app_logger.error(f"Failed to get pending contacts: {e}")
             return []
@@ -372,27 +634,25 @@ class CoffeeChatMemory:
             contact_id: Contact identifier
             status: New status ('pending', 'accepted', 'declined', 'connected')
         """
+        if self.update_contact_statuses([contact_id], status):
+            app_logger.info(f"Updated contact {contact_id} status to {status}")
+    
+    def update_contact_statuses(self, contact_ids: List[str], status: str) -> int:
+        """
+        Update the relationship status of many contacts in one transaction
+        
+        Args:
+            contact_ids: Contact identifiers
+            status: New status
+            
+        Returns:
+            Number of contacts updated
+        """
         try:
-            # ChromaDB doesn't support direct updates, so we need to get and re-add
-            result = self.contacts_collection.get(ids=[contact_id])
-            
-            if result['ids']:
-                metadata = result['metadatas'][0]
-                metadata['relationship_status'] = status
-                metadata['status_updated_at'] = datetime.utcnow().isoformat()
-                
-                # Update by deleting and re-adding
-                self.contacts_collection.delete(ids=[contact_id])
-                self.contacts_collection.add(
-                    ids=[contact_id],
-                    embeddings=[self._get_embedding(result['documents'][0])],
-                    documents=result['documents'],
-                    metadatas=[metadata]
-                )
-                
-                app_logger.info(f"Updated contact {contact_id} status to {status}")
+            return self.store.update_status(contact_ids, status)
         except Exception as e:
             app_logger.error(f"Failed to update contact status: {e}")
+            return 0
     
     def get_all_contacts(self) -> List[Dict]:
         """
@@ -402,18 +662,7 @@ class CoffeeChatMemory:
             List of contact dictionaries
         """
         try:
-            results = self.contacts_collection.get()
-            
-            contacts = []
-            for i, contact_id in enumerate(results['ids']):
-                contact = {
-                    'id': contact_id,
-                    'profile': results['documents'][i] if results['documents'] else '',
-                    **results['metadatas'][i]
-                }
-                contacts.append(contact)
-            
-            return contacts
+            return self.store.list_contacts()
         except Exception as e:
             app_logger.error(f"Failed to get all contacts: {e}")
             return []
@@ -429,20 +678,7 @@ class CoffeeChatMemory:
             List of contacts with that status
         """
         try:
-            results = self.contacts_collection.get(
-                where={"relationship_status": status}
-            )
-            
-            contacts = []
-            for i, contact_id in enumerate(results['ids']):
-                contact = {
-                    'id': contact_id,
-                    'profile': results['documents'][i] if results['documents'] else '',
-                    **results['metadatas'][i]
-                }
-                contacts.append(contact)
-            
-            return contacts
+            return self.store.list_contacts(status)
         except Exception as e:
             app_logger.error(f"Failed to get contacts by status: {e}")
             return []
@@ -457,22 +693,7 @@ class CoffeeChatMemory:
             results_count: Number of results found
         """
         try:
-            search_id = f"search_{company}_{school}_{datetime.utcnow().timestamp()}"
-            search_text = f"Searched {company} for alumni from {school}"
-            
-            self.interactions_collection.add(
-                ids=[search_id],
-                embeddings=[self._get_embedding(search_text)],
-                documents=[search_text],
-                metadatas=[{
-                    'type': 'search',
-                    'company': company,
-                    'school': school,
-                    'results_count': results_count,
-                    'timestamp': datetime.utcnow().isoformat()
-                }]
-            )
-            
+            self.store.record_search(company, school, results_count)
             app_logger.info(f"Saved search history: {company} + {school}")
         except Exception as e:
             app_logger.error(f"Failed to save search history: {e}")
@@ -489,20 +710,11 @@ class CoffeeChatMemory:
             True if already searched
         """
         try:
-            where_clause = {"company": company}
-            if school:
-                where_clause["school"] = school
-            
-            results = self.interactions_collection.get(
-                where=where_clause
-            )
-            
-            return len(results['ids']) > 0
+            return self.store.has_searched(company, school)
         except Exception as e:
             app_logger.error(f"Failed to check search history: {e}")
             return False
 
-
 # Demo/Test
 if __name__ == "__main__":
     print("🧠 Memory Layer Demo\n")
@@ -1,7 +1,7 @@
 """
 Coffee Chat Database Models
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, JSON, Float, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, JSON, Float, Text, Index
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
@@ -148,3 +148,57 @@ class CoffeeChatInteraction(Base):
     ai_confidence = Column(Float)
     
     timestamp = Column(DateTime, default=datetime.now)
+
+
+# ============================================================
+# Memory layer metadata (CoffeeChatMemory / ContactStore)
+# Chroma keeps the vectors; status, search history and counters live here
+# so lookups are indexed instead of full collection scans.
+# ============================================================
+
+class MemoryContact(Base):
+    """
+    Contact known to the memory layer (keyed by the Chroma contact id,
+    usually the LinkedIn profile URL)
+    """
+    __tablename__ = 'memory_contacts'
+    
+    contact_id = Column(String, primary_key=True)
+    name = Column(String, default='')
+    title = Column(String)
+    company = Column(String, index=True)
+    relationship_status = Column(String, default='pending', nullable=False, index=True)
+    # 'pending', 'accepted', 'declined', 'connected', ...
+    profile_text = Column(Text)  # Text embedded in Chroma
+    attributes = Column(JSON, default=dict)  # Everything save_contact was given (stringified)
+    
+    first_contact_date = Column(DateTime, default=datetime.utcnow)
+    status_updated_at = Column(DateTime)
+    added_at = Column(DateTime, default=datetime.utcnow, index=True)  # Write time (ContactedIndex watermark)
+    
+    def __repr__(self):
+        return f"<MemoryContact(id='{self.contact_id}', status='{self.relationship_status}')>"
+
+
+class MemorySearch(Base):
+    """
+    Company/school searches already run (dedupe for alumni searches)
+    """
+    __tablename__ = 'memory_search_history'
+    __table_args__ = (Index('ix_memory_search_company_school', 'company', 'school'),)
+    
+    id = Column(Integer, primary_key=True)
+    company = Column(String, nullable=False)
+    school = Column(String)
+    results_count = Column(Integer, default=0)
+    searched_at = Column(DateTime, default=datetime.utcnow)
+
+
+class MemoryCounter(Base):
+    """
+    Running totals for memory stats (messages, accepted messages, interactions)
+    """
+    __tablename__ = 'memory_counters'
+    
+    name = Column(String, primary_key=True)
+    value = Column(Integer, default=0, nullable=False)
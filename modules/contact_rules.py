@@ -0,0 +1,237 @@
+"""
+Contact Rules
+确定性规则预筛：能确定的直接接受/拒绝，只把不确定的联系人交给 LLM
+
+ScamDetectionAgent.analyze_profile 和 DataValidator.validate_with_ai 先跑
+这里的规则；只有结果落在“LLM 的回答能改变结论”的区间时才调用 LLM。
+关键词表在导入时编译一次（KeywordMatcher / 正则 / frozenset）。
+"""
+import re
+import threading
+from typing import Dict, List, Tuple
+
+from modules.logger_config import app_logger
+from modules.text_matcher import KeywordMatcher
+
+ACCEPT = 'accept'
+REJECT = 'reject'
+UNCERTAIN = 'uncertain'
+
+# ============================================================
+# 关键词表（编译一次）
+# ============================================================
+
+# 公司名称常见后缀（大小写敏感，和旧版 looks_like_company_name 一致）
+COMPANY_INDICATORS = frozenset([
+    'Inc', 'Inc.', 'LLC', 'Ltd', 'Ltd.', 'Corp', 'Corp.', 'Corporation',
+    'Company', 'Co.', 'Co', 'Technologies', 'Tech', 'Solutions', 'Services',
+    'Group', 'Holdings', 'Partners', 'Consulting', 'Global', 'International',
+    'Labs', 'Studio', 'Studios', 'Media', 'Digital', 'Software', 'Systems',
+    'Industries', 'Ventures', 'Capital', 'Financial', 'Bank', 'Insurance'
+])
+COMPANY_INDICATOR_MATCHER = KeywordMatcher(COMPANY_INDICATORS, case_sensitive=True)
+
+# 常见人名模式："John Smith" / "John A. Smith" / "Mary Smith-Jones"
+PERSON_NAME_REGEX = re.compile(
+    r'^[A-Z][a-z]+ (?:[A-Z][a-z]+|[A-Z]\. [A-Z][a-z]+|[A-Z][a-z]+-[A-Z][a-z]+)$'
+)
+
+# 笼统头衔（低人脉时可疑）
+GENERIC_TITLES = frozenset(['entrepreneur', 'founder', 'ceo', 'business owner', 'consultant'])
+GENERIC_TITLE_MATCHER = KeywordMatcher(GENERIC_TITLES)
+
+# 自雇/可能是骗子的头衔（只警告，大小写敏感，和旧版一致）
+SUSPICIOUS_TITLES = frozenset(['CEO', 'Founder', 'Owner', 'Entrepreneur'])
+SUSPICIOUS_TITLE_MATCHER = KeywordMatcher(SUSPICIOUS_TITLES, case_sensitive=True)
+
+# 风险分阈值（和 ScamDetectionAgent 的建议档位一致）
+SCAM_SKIP_SCORE = 7
+SCAM_CAUTION_SCORE = 4
+# LLM 最多再加的风险分（_ai_check 返回 0-5）
+AI_MAX_RISK = 5
+
+
+# ============================================================
+# 名称判断
+# ============================================================
+
+def looks_like_company_name(name: str) -> bool:
+    """名称是否看起来像公司名（后缀 / 全大写 / 含 & 或 @）"""
+    if not name:
+        return False
+    name = name.strip()
+    size = len(name)
+    for match in COMPANY_INDICATOR_MATCHER.finditer(name):
+        # 以后缀结尾，或者前面是空格（和旧版的 endswith / f' {x}' in name 相同）
+        if match.end == size or (match.start > 0 and name[match.start - 1] == ' '):
+            return True
+    if name.isupper() and size > 3:
+        return True
+    return '&' in name or '@' in name
+
+
+def looks_like_person_name(name: str) -> bool:
+    """名称是否看起来像人名"""
+    if not name:
+        return False
+    name = name.strip()
+    if PERSON_NAME_REGEX.match(name):
+        return True
+    # 只有2-3个单词，每个以大写开头
+    words = name.split()
+    return 2 <= len(words) <= 3 and all(
+        word[0].isupper() and word[1:].islower() for word in words if len(word) > 1
+    )
+
+
+# ============================================================
+# 规则
+# ============================================================
+
+def validation_rules(contact: Dict) -> Tuple[str, Dict]:
+    """
+    联系人数据验证规则
+
+    Returns:
+        (决定, 验证结果) —— 结果格式同 DataValidator.validate_contact_data：
+        - REJECT: 名字为空，或名字像公司 / 公司像人名（可交换时带 corrections）
+        - ACCEPT: 名字像人名、公司不像人名、头衔不可疑
+        - UNCERTAIN: 其他（交给 LLM）
+    """
+    name = contact.get('name', '') or ''
+    company = contact.get('company', '') or ''
+    title = contact.get('title', '') or ''
+
+    result = {'valid': True, 'error': None, 'corrections': {}, 'warnings': []}
+
+    name_is_company = looks_like_company_name(name)
+    company_is_person = looks_like_person_name(company)
+
+    # 检查1: 人名是否看起来像公司名
+    if name_is_company:
+        result['valid'] = False
+        result['error'] = 'name_looks_like_company'
+        result['warnings'].append(f"Name '{name}' looks like a company name")
+
+    # 检查2: 公司名是否看起来像人名
+    if company_is_person:
+        result['valid'] = False
+        result['error'] = 'company_looks_like_person'
+        result['warnings'].append(f"Company '{company}' looks like a person name")
+
+    # 检查3: 名字和公司是否搞反了
+    if name_is_company and company_is_person:
+        result['corrections'] = {
+            'swap_name_company': True,
+            'suggested_name': company,
+            'suggested_company': name
+        }
+
+    # 检查4: Title是否合理
+    suspicious_title = SUSPICIOUS_TITLE_MATCHER.contains_any(title)
+    if suspicious_title:
+        result['warnings'].append(f"Title '{title}' may indicate self-employed/scam")
+
+    # 检查5: 空值检查
+    if not name or len(name) < 2:
+        result['valid'] = False
+        result['error'] = 'empty_name'
+        return REJECT, result
+
+    if not result['valid']:
+        return REJECT, result
+    if looks_like_person_name(name) and not suspicious_title:
+        return ACCEPT, result
+    return UNCERTAIN, result
+
+
+def scam_rules(contact: Dict) -> Tuple[str, int, List[str]]:
+    """
+    诈骗风险规则（和旧版 analyze_profile 的基础检查相同；快照只交给 LLM 评分）
+
+    LLM 最多再加 AI_MAX_RISK 分，所以：
+    - 规则分 >= SCAM_SKIP_SCORE: REJECT（LLM 改变不了结论）
+    - 规则分 + AI_MAX_RISK < SCAM_SKIP_SCORE: ACCEPT（LLM 最坏也到不了 skip）
+    - 之间: UNCERTAIN
+
+    Returns:
+        (决定, 风险分, flags)
+    """
+    risk_score = 0
+    flags = []
+
+    # 1. Connection count
+    connections = contact.get('connections_count', 0) or 0
+    if connections < 50:
+        risk_score += 3
+        flags.append("Low connections (<50)")
+    elif connections > 5000:
+        risk_score += 1
+        flags.append("Very high connections (>5000)")
+
+    # 2. Profile photo
+    if not contact.get('has_photo', True):
+        risk_score += 2
+        flags.append("No profile photo")
+
+    # 3. Work history
+    if len(contact.get('work_history', []) or []) < 2:
+        risk_score += 2
+        flags.append("Limited work history (<2 positions)")
+
+    # 4. Generic title
+    if connections < 100 and GENERIC_TITLE_MATCHER.contains_any(contact.get('title', '') or ''):
+        risk_score += 2
+        flags.append("Generic title with low connections")
+
+    if risk_score >= SCAM_SKIP_SCORE:
+        return REJECT, risk_score, flags
+    if risk_score + AI_MAX_RISK < SCAM_SKIP_SCORE:
+        return ACCEPT, risk_score, flags
+    return UNCERTAIN, risk_score, flags
+
+
+# ============================================================
+# 统计
+# ============================================================
+
+class StageStats:
+    """
+    每个检查由哪一步得出结论的计数（rules_accept / rules_reject / llm / no_llm）
+
+    no_llm: 不确定但没有可用的 LLM（或没有快照），按规则结果处理
+    """
+    STAGES = ('rules_accept', 'rules_reject', 'llm', 'no_llm')
+
+    def __init__(self, name: str):
+        self.name = name
+        self._counts = dict.fromkeys(self.STAGES, 0)
+        self._lock = threading.Lock()
+
+    def record(self, stage: str):
+        with self._lock:
+            self._counts[stage] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self):
+        with self._lock:
+            self._counts = dict.fromkeys(self.STAGES, 0)
+
+    def log_since(self, before: Dict[str, int], label: str = 'batch'):
+        """记录从 before（snapshot()）到现在每一步解决了多大比例"""
+        now = self.snapshot()
+        delta = {stage: now[stage] - before.get(stage, 0) for stage in self.STAGES}
+        total = sum(delta.values())
+        if not total:
+            return delta
+        parts = ', '.join(f"{stage} {delta[stage]} ({delta[stage] / total:.0%})" for stage in self.STAGES)
+        app_logger.info(f"{self.name} {label}: {total} checked - {parts}")
+        return delta
+
+
+# 全局计数（ScamDetectionAgent / DataValidator 共用）
+scam_stage_stats = StageStats('Scam check')
+validation_stage_stats = StageStats('Validation')
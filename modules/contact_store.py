@@ -0,0 +1,320 @@
+# Job Autopilot - Contact Store
+# Indexed relational store for memory-layer contact status, search history and counters
+
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+from modules.coffee_chat_models import MemoryContact, MemorySearch, MemoryCounter
+
+# Ids per IN (...) query
+ID_CHUNK_SIZE = 500
+
+MEMORY_TABLES = [MemoryContact.__table__, MemorySearch.__table__, MemoryCounter.__table__]
+
+# Counter names
+MESSAGES = "messages"
+MESSAGES_ACCEPTED = "messages_accepted"
+INTERACTIONS = "interactions"
+MIGRATED = "migrated_from_chroma"
+
+
+class ContactStore:
+    """
+    Contact status, search history and counters for CoffeeChatMemory
+
+    Every query here is a primary-key or index lookup (or an indexed
+    GROUP BY), replacing Chroma `get(where=...)` scans. Tables are created
+    on first use in the main database (modules.database) unless another
+    session factory is given.
+    """
+
+    def __init__(self, session_factory: Optional[Callable] = None):
+        """
+        Args:
+            session_factory: SQLAlchemy sessionmaker (default: modules.database.SessionLocal)
+        """
+        if session_factory is None:
+            from modules.database import SessionLocal
+            session_factory = SessionLocal
+        self._session_factory = session_factory
+        session = self._session_factory()
+        try:
+            bind = session.get_bind()
+            for table in MEMORY_TABLES:
+                table.create(bind=bind, checkfirst=True)
+        finally:
+            session.close()
+
+    def _session(self):
+        return self._session_factory()
+
+    # ============================================================
+    # Contacts
+    # ============================================================
+
+    def existing_ids(self, contact_ids: Iterable[str]) -> set:
+        """Subset of contact_ids already stored (chunked primary-key IN lookups)"""
+        contact_ids = list(dict.fromkeys(contact_ids))
+        found = set()
+        session = self._session()
+        try:
+            for start in range(0, len(contact_ids), ID_CHUNK_SIZE):
+                chunk = contact_ids[start:start + ID_CHUNK_SIZE]
+                found.update(
+                    row[0] for row in session.query(MemoryContact.contact_id).filter(MemoryContact.contact_id.in_(chunk))
+                )
+        finally:
+            session.close()
+        return found
+
+    def has_contact(self, contact_id: str) -> bool:
+        return bool(self.existing_ids([contact_id]))
+
+    def add_contacts(self, records: Dict[str, Dict], upsert: bool = False) -> List[str]:
+        """
+        Store contacts
+
+        Args:
+            records: contact_id -> {'profile_text': str, 'metadata': dict}
+            upsert: Overwrite existing contacts (otherwise they are skipped)
+
+        Returns:
+            Ids that were inserted or overwritten
+        """
+        existing = self.existing_ids(records)
+        written = [contact_id for contact_id in records if upsert or contact_id not in existing]
+        if not written:
+            return []
+
+        session = self._session()
+        try:
+            for contact_id in written:
+                row = self._row(contact_id, records[contact_id])
+                if contact_id in existing:
+                    session.merge(row)
+                else:
+                    session.add(row)
+            session.commit()
+        except IntegrityError:
+            # Another writer inserted some of these ids meanwhile; keep theirs
+            session.rollback()
+            written = [contact_id for contact_id in written if self._insert_one(contact_id, records[contact_id], upsert)]
+        finally:
+            session.close()
+        return written
+
+    def _insert_one(self, contact_id: str, record: Dict, upsert: bool) -> bool:
+        session = self._session()
+        try:
+            if upsert:
+                session.merge(self._row(contact_id, record))
+            else:
+                session.add(self._row(contact_id, record))
+            session.commit()
+            return True
+        except IntegrityError:
+            session.rollback()
+            return False
+        finally:
+            session.close()
+
+    @staticmethod
+    def _row(contact_id: str, record: Dict) -> MemoryContact:
+        metadata = record.get('metadata') or {}
+        return MemoryContact(
+            contact_id=contact_id,
+            name=metadata.get('name', ''),
+            title=metadata.get('title'),
+            company=metadata.get('company'),
+            relationship_status=metadata.get('relationship_status') or 'pending',
+            profile_text=record.get('profile_text', ''),
+            attributes=metadata,
+            first_contact_date=_parse_datetime(metadata.get('first_contact_date')) or datetime.utcnow(),
+            status_updated_at=_parse_datetime(metadata.get('status_updated_at'))
+        )
+
+    def ids_added_since(self, since: Optional[datetime] = None) -> Tuple[List[str], Optional[datetime]]:
+        """
+        Contact ids written at or after `since` (all ids when None), via the
+        added_at index
+
+        Returns:
+            (ids, newest added_at seen) - pass the latter back as `since` next
+            time; rows sharing that timestamp are returned again, which is
+            harmless for set-like consumers
+        """
+        session = self._session()
+        try:
+            query = session.query(MemoryContact.contact_id, MemoryContact.added_at)
+            if since is not None:
+                query = query.filter(MemoryContact.added_at >= since)
+            ids, newest = [], since
+            for contact_id, added_at in query:
+                ids.append(contact_id)
+                if added_at is not None and (newest is None or added_at > newest):
+                    newest = added_at
+            return ids, newest
+        finally:
+            session.close()
+
+    def get_contacts(self, contact_ids: Iterable[str]) -> Dict[str, Dict]:
+        """contact_id -> contact dict, for the ids that exist"""
+        contact_ids = list(dict.fromkeys(contact_ids))
+        contacts = {}
+        session = self._session()
+        try:
+            for start in range(0, len(contact_ids), ID_CHUNK_SIZE):
+                chunk = contact_ids[start:start + ID_CHUNK_SIZE]
+                for row in session.query(MemoryContact).filter(MemoryContact.contact_id.in_(chunk)):
+                    contacts[row.contact_id] = self._to_dict(row)
+        finally:
+            session.close()
+        return contacts
+
+    def list_contacts(self, status: Optional[str] = None) -> List[Dict]:
+        """All contacts, or those with one relationship_status (indexed)"""
+        session = self._session()
+        try:
+            query = session.query(MemoryContact)
+            if status is not None:
+                query = query.filter(MemoryContact.relationship_status == status)
+            return [self._to_dict(row) for row in query.order_by(MemoryContact.first_contact_date)]
+        finally:
+            session.close()
+
+    def contact_ids_by_status(self, status: str) -> List[str]:
+        """Ids with one relationship_status, without loading the rows"""
+        session = self._session()
+        try:
+            return [
+                row[0] for row in session.query(MemoryContact.contact_id)
+                .filter(MemoryContact.relationship_status == status)
+                .order_by(MemoryContact.first_contact_date)
+            ]
+        finally:
+            session.close()
+
+    def update_status(self, contact_ids: Iterable[str], status: str) -> int:
+        """
+        Set relationship_status for many contacts
+
+        Returns:
+            Number of contacts updated
+        """
+        contact_ids = list(dict.fromkeys(contact_ids))
+        now = datetime.utcnow()
+        updated = 0
+        session = self._session()
+        try:
+            for start in range(0, len(contact_ids), ID_CHUNK_SIZE):
+                chunk = contact_ids[start:start + ID_CHUNK_SIZE]
+                for row in session.query(MemoryContact).filter(MemoryContact.contact_id.in_(chunk)):
+                    row.relationship_status = status
+                    row.status_updated_at = now
+                    # Keep the attribute snapshot in step for get_all_contacts callers
+                    row.attributes = {**(row.attributes or {}), 'relationship_status': status, 'status_updated_at': now.isoformat()}
+                    updated += 1
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+        return updated
+
+    def status_counts(self) -> Dict[str, int]:
+        """relationship_status -> number of contacts (one GROUP BY)"""
+        session = self._session()
+        try:
+            rows = session.query(MemoryContact.relationship_status, func.count()).group_by(MemoryContact.relationship_status)
+            return {status: count for status, count in rows}
+        finally:
+            session.close()
+
+    @staticmethod
+    def _to_dict(row: MemoryContact) -> Dict:
+        return {
+            'id': row.contact_id,
+            'profile': row.profile_text or '',
+            **(row.attributes or {}),
+            'relationship_status': row.relationship_status
+        }
+
+    # ============================================================
+    # Search history
+    # ============================================================
+
+    def record_search(self, company: str, school: str, results_count: int):
+        session = self._session()
+        try:
+            session.add(MemorySearch(company=company, school=school, results_count=results_count))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def has_searched(self, company: str, school: Optional[str] = None) -> bool:
+        """Indexed (company, school) existence check"""
+        session = self._session()
+        try:
+            query = session.query(MemorySearch.id).filter(MemorySearch.company == company)
+            if school:
+                query = query.filter(MemorySearch.school == school)
+            return query.first() is not None
+        finally:
+            session.close()
+
+    # ============================================================
+    # Counters
+    # ============================================================
+
+    def increment(self, counts: Dict[str, int]):
+        """Add to named counters (created at 0 on first use)"""
+        counts = {name: value for name, value in counts.items() if value}
+        if not counts:
+            return
+        session = self._session()
+        try:
+            for name, value in counts.items():
+                updated = session.query(MemoryCounter).filter(MemoryCounter.name == name).update(
+                    {MemoryCounter.value: MemoryCounter.value + value}, synchronize_session=False
+                )
+                if not updated:
+                    session.add(MemoryCounter(name=name, value=value))
+            session.commit()
+        except IntegrityError:
+            # Counter row created concurrently; retry as a plain update
+            session.rollback()
+            self.increment(counts)
+        finally:
+            session.close()
+
+    def counters(self) -> Dict[str, int]:
+        session = self._session()
+        try:
+            return {row.name: row.value for row in session.query(MemoryCounter)}
+        finally:
+            session.close()
+
+    def contact_count(self) -> int:
+        session = self._session()
+        try:
+            return session.query(func.count(MemoryContact.contact_id)).scalar() or 0
+        finally:
+            session.close()
+
+
+def _parse_datetime(value) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
@@ -0,0 +1,295 @@
+# Job Autopilot - Contacted Index
+# In-memory "already contacted?" index (exact set or Bloom filter), persisted and refreshed incrementally
+
+import os
+import math
+import json
+import atexit
+import hashlib
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from modules.logger_config import app_logger
+
+DEFAULT_INDEX_PATH = "data/contacted_index.bin"
+DEFAULT_MODE = os.getenv("CONTACTED_INDEX_MODE", "set")  # 'set' or 'bloom'
+
+# How long membership answers may lag writes made by other processes
+REFRESH_SECONDS = 5.0
+
+# Persist after this many new ids (and at exit)
+SAVE_EVERY = 100
+
+# Re-read this far behind the watermark: added_at is stamped before commit,
+# so a slow writer's row can land with a time older than rows already seen
+WATERMARK_OVERLAP = timedelta(seconds=60)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter (blake2b double hashing)
+
+    Never returns False for an added key; returns True for a key that was
+    not added with probability ~false_positive_rate while at or under
+    capacity.
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float = 0.001, bits: Optional[bytearray] = None, count: int = 0):
+        self.capacity = max(1, capacity)
+        self.false_positive_rate = false_positive_rate
+        self.num_bits = max(8, int(-self.capacity * math.log(false_positive_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = bits if bits is not None else bytearray((self.num_bits + 7) // 8)
+        self.count = count
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def approximate_size(self) -> int:
+        """
+        Distinct keys estimated from the fill ratio (unlike `count`, not
+        thrown off by new keys skipped as apparent duplicates)
+        """
+        set_bits = int.from_bytes(self.bits, "little").bit_count()
+        if set_bits >= self.num_bits:
+            return self.capacity * 10
+        return round(-self.num_bits / self.num_hashes * math.log(1 - set_bits / self.num_bits))
+
+
+class ContactedIndex:
+    """
+    Which contact ids the memory layer already has, answered from memory
+
+    Loaded once from a snapshot file, then brought up to date from the
+    ContactStore with an indexed `added_at >= watermark` query (at most
+    every REFRESH_SECONDS), and updated directly by CoffeeChatMemory writes.
+
+    Modes:
+        set    exact set of ids (default; ~100 bytes per contact)
+        bloom  Bloom filter (~2 bytes per contact at 0.1% FP); positives
+               are confirmed against the store in one bulk query, so answers
+               stay exact
+    """
+
+    def __init__(
+        self,
+        store,
+        path: Optional[str] = DEFAULT_INDEX_PATH,
+        mode: str = DEFAULT_MODE,
+        capacity: int = 100_000,
+        false_positive_rate: float = 0.001,
+        refresh_seconds: float = REFRESH_SECONDS
+    ):
+        """
+        Args:
+            store: ContactStore (source of truth)
+            path: Snapshot file (None to keep the index in memory only)
+            mode: 'set' or 'bloom'
+            capacity: Bloom filter sizing (grown automatically when exceeded)
+            false_positive_rate: Bloom filter target FP rate
+            refresh_seconds: Max staleness vs. writes from other processes
+        """
+        if mode not in ("set", "bloom"):
+            raise ValueError(f"Unknown contacted index mode '{mode}' (expected 'set' or 'bloom')")
+        self.store = store
+        self.path = Path(path) if path else None
+        self.mode = mode
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.RLock()
+        self._watermark: Optional[datetime] = None
+        self._refreshed_at = 0.0
+        self._unsaved = 0
+        self.stats = {"lookups": 0, "store_checks": 0, "false_positives": 0}
+
+        if not self._load():
+            self._reset()
+        self.refresh(force=True)
+        if self.path is not None:
+            atexit.register(self.save)
+
+    # ============================================================
+    # Membership
+    # ============================================================
+
+    def __contains__(self, contact_id: str) -> bool:
+        return bool(self.contacted([contact_id]))
+
+    def contacted(self, contact_ids: Iterable[str]) -> Set[str]:
+        """
+        Which of these ids are already contacted
+
+        One refresh query (if due) and, in bloom mode, one confirmation
+        query for the positives - regardless of how many ids are passed.
+
+        Args:
+            contact_ids: Candidate ids
+
+        Returns:
+            Set of the ids that are already in memory
+        """
+        contact_ids = [contact_id for contact_id in dict.fromkeys(contact_ids) if contact_id]
+        self.refresh()
+        with self._lock:
+            self.stats["lookups"] += len(contact_ids)
+            candidates = {contact_id for contact_id in contact_ids if contact_id in self._members}
+        if self.mode == "set" or not candidates:
+            return candidates
+
+        confirmed = self.store.existing_ids(candidates)
+        with self._lock:
+            self.stats["store_checks"] += len(candidates)
+            self.stats["false_positives"] += len(candidates) - len(confirmed)
+        return confirmed
+
+    def filter_new(self, contacts: List[Dict], key=None) -> List[Dict]:
+        """
+        Drop contacts that are already contacted, keeping order
+
+        Args:
+            contacts: Contact dicts
+            key: contact -> id (default: linkedin_url, else name)
+        """
+        key = key or contact_key
+        done = self.contacted(key(contact) for contact in contacts)
+        return [contact for contact in contacts if key(contact) not in done]
+
+    # ============================================================
+    # Maintenance
+    # ============================================================
+
+    def add(self, contact_ids: Iterable[str]):
+        """Record ids written by this process (keeps answers consistent immediately)"""
+        with self._lock:
+            added = 0
+            for contact_id in contact_ids:
+                if contact_id and contact_id not in self._members:
+                    self._members.add(contact_id)
+                    added += 1
+            self._after_add(added)
+
+    def refresh(self, force: bool = False):
+        """Pull ids written since the watermark (by any process)"""
+        with self._lock:
+            if not force and time.monotonic() - self._refreshed_at < self.refresh_seconds:
+                return
+            try:
+                since = self._watermark - WATERMARK_OVERLAP if self._watermark else None
+                ids, watermark = self.store.ids_added_since(since)
+            except Exception as e:
+                app_logger.warning(f"Contacted index refresh failed: {e}")
+                return
+            self._refreshed_at = time.monotonic()
+            self._watermark = max(filter(None, (watermark, self._watermark)), default=None)
+            self.add(ids)
+
+    def rebuild(self):
+        """Drop the index and reload every id from the store"""
+        with self._lock:
+            self._reset()
+            self.refresh(force=True)
+            self.save()
+
+    def _reset(self):
+        if self.mode == "bloom":
+            self._members = BloomFilter(self.capacity, self.false_positive_rate)
+        else:
+            self._members = set()
+        self._watermark = None
+
+    def _after_add(self, added: int):
+        if not added:
+            return
+        self._unsaved += added
+        if self.mode == "bloom" and self._members.approximate_size() > self._members.capacity:
+            # Over capacity the FP rate climbs; resize from the store
+            self.capacity = max(self.store.contact_count(), self._members.approximate_size()) * 2
+            app_logger.info(f"Contacted index: growing Bloom filter to {self.capacity} entries")
+            self._reset()
+            ids, self._watermark = self.store.ids_added_since(None)
+            for contact_id in ids:
+                self._members.add(contact_id)
+        if self._unsaved >= SAVE_EVERY:
+            self.save()
+
+    # ============================================================
+    # Persistence: one JSON header line, then the payload
+    # ============================================================
+
+    def save(self):
+        """Write the snapshot atomically (no-op when nothing changed)"""
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._unsaved and self.path.exists():
+                return
+            header = {
+                "mode": self.mode,
+                "watermark": self._watermark.isoformat() if self._watermark else None,
+                "count": len(self._members),
+            }
+            if self.mode == "bloom":
+                header.update(capacity=self._members.capacity, false_positive_rate=self._members.false_positive_rate)
+                payload = bytes(self._members.bits)
+            else:
+                payload = "\n".join(sorted(self._members)).encode("utf-8")
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+                with open(tmp_path, "wb") as f:
+                    f.write(json.dumps(header).encode("utf-8") + b"\n")
+                    f.write(payload)
+                os.replace(tmp_path, self.path)
+                self._unsaved = 0
+            except Exception as e:
+                app_logger.warning(f"Failed to save contacted index: {e}")
+
+    def _load(self) -> bool:
+        if self.path is None or not self.path.exists():
+            return False
+        try:
+            with open(self.path, "rb") as f:
+                header = json.loads(f.readline())
+                payload = f.read()
+            if header.get("mode") != self.mode:
+                return False
+            if self.mode == "bloom":
+                self.capacity = header["capacity"]
+                self._members = BloomFilter(
+                    header["capacity"], header["false_positive_rate"], bits=bytearray(payload), count=header["count"]
+                )
+            else:
+                self._members = set(payload.decode("utf-8").split("\n")) if payload else set()
+            self._watermark = datetime.fromisoformat(header["watermark"]) if header.get("watermark") else None
+            return True
+        except Exception as e:
+            app_logger.warning(f"Contacted index snapshot unreadable, rebuilding: {e}")
+            return False
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {**self.stats, "mode": self.mode, "size": len(self._members)}
+
+
+def contact_key(contact: Dict) -> str:
+    """Id a contact is stored under in memory (LinkedIn URL, else name)"""
+    return contact.get('linkedin_url', contact.get('name', ''))
@@ -3,7 +3,7 @@ Data Validator for LinkedIn Automation
 验证AI提取的数据是否正确，防止人名/公司名搞混
 """
 import os
-import re
+import asyncio
 from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 
@@ -14,82 +14,13 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from modules.logger_config import app_logger
+from modules.llm_gateway import llm_gateway
 
-# 公司名称常见后缀
-COMPANY_INDICATORS = [
-    'Inc', 'Inc.', 'LLC', 'Ltd', 'Ltd.', 'Corp', 'Corp.', 'Corporation',
-    'Company', 'Co.', 'Co', 'Technologies', 'Tech', 'Solutions', 'Services',
-    'Group', 'Holdings', 'Partners', 'Consulting', 'Global', 'International',
-    'Labs', 'Studio', 'Studios', 'Media', 'Digital', 'Software', 'Systems',
-    'Industries', 'Ventures', 'Capital', 'Financial', 'Bank', 'Insurance'
-]
-
-# 常见人名模式（用于检测）
-PERSON_NAME_PATTERNS = [
-    r'^[A-Z][a-z]+ [A-Z][a-z]+$',  # "John Smith"
-    r'^[A-Z][a-z]+ [A-Z]\. [A-Z][a-z]+$',  # "John A. Smith"
-    r'^[A-Z][a-z]+ [A-Z][a-z]+-[A-Z][a-z]+$',  # "Mary Smith-Jones"
-]
-
-
-def looks_like_company_name(name: str) -> bool:
-    """
-    检查名称是否看起来像公司名
-    
-    Args:
-        name: 要检查的名称
-        
-    Returns:
-        True if looks like a company name
-    """
-    if not name:
-        return False
-    
-    name_upper = name.strip()
-    
-    # 检查公司后缀
-    for indicator in COMPANY_INDICATORS:
-        if name_upper.endswith(indicator) or f' {indicator}' in name_upper:
-            return True
-    
-    # 全大写或包含大量大写字母可能是公司名
-    if name_upper.isupper() and len(name_upper) > 3:
-        return True
-    
-    # 包含特殊字符如 & 或 @ 可能是公司名
-    if '&' in name_upper or '@' in name_upper:
-        return True
-    
-    return False
-
-
-def looks_like_person_name(name: str) -> bool:
-    """
-    检查名称是否看起来像人名
-    
-    Args:
-        name: 要检查的名称
-        
-    Returns:
-        True if looks like a person name
-    """
-    if not name:
-        return False
-    
-    name = name.strip()
-    
-    # 检查常见人名模式
-    for pattern in PERSON_NAME_PATTERNS:
-        if re.match(pattern, name):
-            return True
-    
-    # 只有2-3个单词，每个以大写开头
-    words = name.split()
-    if 2 <= len(words) <= 3:
-        if all(word[0].isupper() and word[1:].islower() for word in words if len(word) > 1):
-            return True
-    
-    return False
+# 规则和名称判断在 contact_rules 里（关键词表只编译一次）；这里重新导出旧名字
+from modules.contact_rules import (
+    ACCEPT, UNCERTAIN, COMPANY_INDICATORS, validation_rules, validation_stage_stats,
+    looks_like_company_name, looks_like_person_name
+)
 
 
 class DataValidator:
@@ -97,20 +28,6 @@ class DataValidator:
     验证AI提取的数据是否正确
     """
     
-    def __init__(self):
-        self.client = None
-        self._init_openai()
-    
-    def _init_openai(self):
-        """初始化OpenAI客户端"""
-        try:
-            from openai import OpenAI
-            api_key = os.getenv('OPENAI_API_KEY')
-            if api_key:
-                self.client = OpenAI(api_key=api_key)
-        except Exception as e:
-            app_logger.warning(f"OpenAI not available for validation: {e}")
-    
     def validate_contact_data(self, contact: Dict) -> Dict:
         """
         验证联系人数据是否正确
@@ -121,52 +38,23 @@ class DataValidator:
         Returns:
             Dict with 'valid', 'error', 'corrections'
         """
-        name = contact.get('name', '')
-        company = contact.get('company', '')
-        title = contact.get('title', '')
-        
-        result = {
-            'valid': True,
-            'error': None,
-            'corrections': {},
-            'warnings': []
-        }
-        
-        # 检查1: 人名是否看起来像公司名
-        if looks_like_company_name(name):
-            result['valid'] = False
-            result['error'] = 'name_looks_like_company'
-            result['warnings'].append(f"Name '{name}' looks like a company name")
-            app_logger.warning(f"Validation: Name looks like company: {name}")
-        
-        # 检查2: 公司名是否看起来像人名
-        if looks_like_person_name(company):
-            result['valid'] = False
-            result['error'] = 'company_looks_like_person'
-            result['warnings'].append(f"Company '{company}' looks like a person name")
-            app_logger.warning(f"Validation: Company looks like person: {company}")
-        
-        # 检查3: 名字和公司是否搞反了
-        if not result['valid'] and looks_like_person_name(company) and looks_like_company_name(name):
-            # 可能搞反了，建议交换
-            result['corrections'] = {
-                'swap_name_company': True,
-                'suggested_name': company,
-                'suggested_company': name
-            }
-        
-        # 检查4: Title是否合理
-        suspicious_titles = ['CEO', 'Founder', 'Owner', 'Entrepreneur']
-        if any(t in title for t in suspicious_titles):
-            result['warnings'].append(f"Title '{title}' may indicate self-employed/scam")
-        
-        # 检查5: 空值检查
-        if not name or len(name) < 2:
-            result['valid'] = False
-            result['error'] = 'empty_name'
-        
+        decision, result = validation_rules(contact)
+        if not result['valid']:
+            app_logger.warning(f"Validation: {result['error']} for {contact.get('name', '')!r}")
         return result
     
+    def triage(self, contact: Dict) -> Tuple[str, Dict]:
+        """
+        规则预筛
+        
+        Args:
+            contact: 联系人信息
+            
+        Returns:
+            (ACCEPT / REJECT / UNCERTAIN, 验证结果)
+        """
+        return validation_rules(contact)
+    
     async def validate_with_ai(self, contact: Dict) -> Dict:
         """
         使用AI进行更深入的验证
@@ -177,9 +65,17 @@ class DataValidator:
         Returns:
             Dict with validation results
         """
-        if not self.client:
-            return {'valid': True, 'error': None, 'ai_checked': False}
+        # 规则能确定的不调用 LLM
+        decision, rule_result = self.triage(contact)
+        if decision != UNCERTAIN:
+            validation_stage_stats.record('rules_accept' if decision == ACCEPT else 'rules_reject')
+            return {**rule_result, 'ai_checked': False, 'decided_by': 'rules'}
+        
+        if not llm_gateway.is_available('validation'):
+            validation_stage_stats.record('no_llm')
+            return {**rule_result, 'ai_checked': False, 'decided_by': 'rules'}
         
+        validation_stage_stats.record('llm')
         try:
             prompt = f"""
 Verify this LinkedIn contact data for accuracy:
@@ -198,7 +94,8 @@ Return JSON only:
 {{"valid": true/false, "error": "error_type or null", "corrections": {{"field": "corrected_value"}}}}
 """
             
-            response = self.client.chat.completions.create(
+            response = await llm_gateway.acomplete(
+                "validation",
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "You are a data validation expert. Return only valid JSON."},
@@ -209,14 +106,52 @@ Return JSON only:
             )
             
             import json
-            result = json.loads(response.choices[0].message.content.strip())
+            result = json.loads(response.text.strip())
             result['ai_checked'] = True
+            result['decided_by'] = 'llm'
             
             return result
             
         except Exception as e:
             app_logger.error(f"AI validation failed: {e}")
-            return {'valid': True, 'error': None, 'ai_checked': False}
+            return {**rule_result, 'ai_checked': False, 'decided_by': 'rules'}
+    
+    async def validate_batch_with_ai(self, contacts: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        批量验证，只有规则判断不了的联系人才调用 LLM
+        
+        LLM 请求并发发出（并发和限速由 llm_gateway 的 'validation' 路由控制），
+        结束时记录每一步解决了多少比例的联系人。
+        
+        Args:
+            contacts: 联系人列表
+            
+        Returns:
+            Tuple of (valid_contacts, invalid_contacts)，格式同 validate_batch
+        """
+        before = validation_stage_stats.snapshot()
+        results = await asyncio.gather(*(self.validate_with_ai(contact) for contact in contacts))
+        
+        valid = []
+        invalid = []
+        for contact, result in zip(contacts, results):
+            if result.get('valid', True):
+                valid.append(contact)
+                continue
+            corrected = self.auto_correct(contact, result)
+            if corrected != contact and self.validate_contact_data(corrected)['valid']:
+                valid.append(corrected)
+            else:
+                invalid.append({
+                    'contact': contact,
+                    'error': result.get('error'),
+                    'warnings': result.get('warnings', [])
+                })
+        
+        validation_stage_stats.log_since(before, label=f"batch of {len(contacts)}")
+        app_logger.info(f"Batch validation (AI): {len(valid)} valid, {len(invalid)} invalid")
+        
+        return valid, invalid
     
     def auto_correct(self, contact: Dict, validation_result: Dict) -> Dict:
         """
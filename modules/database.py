@@ -8,6 +8,7 @@ from datetime import datetime
 from typing import Dict
 import os
 from dotenv import load_dotenv
+from modules.lazy_loader import lazy_singleton
 from modules.logger_config import app_logger
 
 # Load environment variables
@@ -39,33 +40,45 @@ else:
     else:
         DB_TYPE = "unknown"
 
-# Create engine
-try:
-    # Ensure data directory exists for SQLite
-    if DB_TYPE == "sqlite" and "data/" in DATABASE_URL:
-        os.makedirs("data", exist_ok=True)
-    
-    engine = create_engine(
-        DATABASE_URL,
-        echo=False,  # Set to True for SQL debugging
-        pool_pre_ping=True  # Check connection health before using
-    )
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    Base = declarative_base()
+Base = declarative_base()
+
+
+def _create_engine():
+    """Create the SQLAlchemy engine (falls back to in-memory SQLite on failure)"""
+    global DEMO_MODE, DB_TYPE
     
-    # Don't print full DATABASE_URL (may contain password)
-    safe_url = DATABASE_URL.split("@")[0] if "@" in DATABASE_URL else DATABASE_URL
-    app_logger.info(f"✅ Database connected: {DB_TYPE.upper()} ({safe_url})")
+    try:
+        # Ensure data directory exists for SQLite
+        if DB_TYPE == "sqlite" and "data/" in DATABASE_URL:
+            os.makedirs("data", exist_ok=True)
+        
+        db_engine = create_engine(
+            DATABASE_URL,
+            echo=False,  # Set to True for SQL debugging
+            pool_pre_ping=True  # Check connection health before using
+        )
+        
+        # Don't print full DATABASE_URL (may contain password)
+        safe_url = DATABASE_URL.split("@")[0] if "@" in DATABASE_URL else DATABASE_URL
+        app_logger.info(f"✅ Database connected: {DB_TYPE.upper()} ({safe_url})")
+        return db_engine
     
-except Exception as e:
-    app_logger.error(f"Failed to create database engine: {e}")
-    # Fallback to SQLite
-    app_logger.warning("⚠️  Falling back to SQLite in-memory database")
-    engine = create_engine("sqlite:///:memory:", echo=False)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    Base = declarative_base()
-    DEMO_MODE = True
-    DB_TYPE = "sqlite"
+    except Exception as e:
+        app_logger.error(f"Failed to create database engine: {e}")
+        # Fallback to SQLite
+        app_logger.warning("⚠️  Falling back to SQLite in-memory database")
+        DEMO_MODE = True
+        DB_TYPE = "sqlite"
+        return create_engine("sqlite:///:memory:", echo=False)
+
+
+# Engine and session factory are created on first use, so importing the
+# models (e.g. for a Streamlit page that never queries) costs no connection setup
+engine = lazy_singleton("db_engine", _create_engine)
+SessionLocal = lazy_singleton(
+    "db_session_factory",
+    lambda: sessionmaker(autocommit=False, autoflush=False, bind=engine.get())
+)
 
 def get_database_info() -> Dict:
     """
@@ -280,7 +293,7 @@ class CacheEntry(Base):
 def init_db():
     """Create all tables"""
     try:
-        Base.metadata.create_all(bind=engine)
+        Base.metadata.create_all(bind=engine.get())
         if DEMO_MODE:
             app_logger.info("Database tables created (DEMO mode - in-memory)")
         else:
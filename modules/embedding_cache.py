@@ -0,0 +1,199 @@
+# Job Autopilot - Persistent Embedding Cache
+# SQLite-backed float32 vectors keyed on (model, sha256(text)), so unchanged text is never re-embedded
+
+import os
+import sqlite3
+import hashlib
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from modules.embedding_provider import EmbeddingProvider
+from modules.logger_config import app_logger
+
+DEFAULT_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "data/embedding_cache.db")
+
+# Keys per SELECT ... IN (...) (stays under SQLite's bound-parameter limit)
+LOOKUP_CHUNK_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model TEXT NOT NULL,
+    text_hash BLOB NOT NULL,
+    dims INTEGER NOT NULL,
+    vector BLOB NOT NULL,
+    PRIMARY KEY (model, text_hash)
+) WITHOUT ROWID
+"""
+
+
+def text_digest(text: str) -> bytes:
+    """Raw sha256 of the text (32 bytes; the cache key within a model)"""
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+class EmbeddingCache:
+    """
+    Disk-backed embedding store
+
+    Vectors are stored as packed float32 BLOBs (4 bytes per dimension,
+    half the size of the float64 the API returns) and decoded with a single
+    buffer copy. One SQLite file in WAL mode is shared by every process;
+    writes are INSERT OR REPLACE, so concurrent writers of the same text
+    just store the same vector twice.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        """
+        Args:
+            path: SQLite file (':memory:' for a throwaway cache)
+        """
+        self.path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Start a fresh hit/miss window (e.g. at the beginning of an import run)"""
+        self.stats = {"hits": 0, "misses": 0, "writes": 0}
+
+    def get_many(self, model: str, texts: Sequence[str]) -> Dict[str, List[float]]:
+        """
+        Look up cached vectors
+
+        Args:
+            model: Embedding model / backend name
+            texts: Texts to look up
+
+        Returns:
+            dict: text -> vector, for the texts that were cached
+        """
+        digests = {text_digest(text): text for text in texts}
+        found: Dict[str, List[float]] = {}
+        keys = list(digests)
+        with self._lock:
+            for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+                chunk = keys[start:start + LOOKUP_CHUNK_SIZE]
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({','.join('?' * len(chunk))})",
+                    [model, *chunk]
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[digests[text_hash]] = _unpack(blob)
+            self.stats["hits"] += len(found)
+            self.stats["misses"] += len(digests) - len(found)
+        return found
+
+    def put_many(self, model: str, vectors: Dict[str, Sequence[float]]):
+        """
+        Store vectors
+
+        Args:
+            model: Embedding model / backend name
+            vectors: text -> vector
+        """
+        rows = [(model, text_digest(text), len(vector), _pack(vector)) for text, vector in vectors.items()]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (model, text_hash, dims, vector) VALUES (?, ?, ?, ?)",
+                    rows
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self.stats["writes"] += len(rows)
+
+    def count(self, model: Optional[str] = None) -> int:
+        """Stored vectors (for one model, or all)"""
+        with self._lock:
+            if model is None:
+                return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings WHERE model = ?", (model,)).fetchone()[0]
+
+    def get_stats(self) -> Dict:
+        """Hits, misses and hit rate since the last reset_stats()"""
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _pack(vector: Sequence[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _unpack(blob: bytes) -> List[float]:
+    vector = array("f")
+    vector.frombytes(blob)
+    return vector.tolist()
+
+
+class CachedEmbeddingProvider(EmbeddingProvider):
+    """
+    Wrap a provider with an EmbeddingCache: only texts not already cached
+    for this model reach the wrapped provider
+    """
+
+    def __init__(self, provider: EmbeddingProvider, cache: Optional[EmbeddingCache] = None):
+        """
+        Args:
+            provider: Provider doing the actual embedding
+            cache: Persistent cache (default: EMBEDDING_CACHE_PATH)
+        """
+        self.provider = provider
+        self.cache = cache or EmbeddingCache()
+        self.model = provider.model
+        self.dimensions = provider.dimensions
+        self.provider_calls = 0
+        self._requests_baseline = getattr(provider, "requests_made", 0)
+
+    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        texts = list(texts)
+        try:
+            vectors = self.cache.get_many(self.model, texts)
+        except Exception as e:
+            app_logger.warning(f"Embedding cache lookup failed: {e}")
+            vectors = {}
+        missing = [text for text in dict.fromkeys(texts) if text not in vectors]
+        if missing:
+            fresh = dict(zip(missing, self.provider.embed(missing)))
+            self.provider_calls += 1
+            try:
+                self.cache.put_many(self.model, fresh)
+            except Exception as e:
+                app_logger.warning(f"Embedding cache write failed: {e}")
+            vectors.update(fresh)
+        return [vectors[text] for text in texts]
+
+    def reset_stats(self):
+        self.cache.reset_stats()
+        self.provider_calls = 0
+        self._requests_baseline = getattr(self.provider, "requests_made", 0)
+
+    def get_stats(self) -> Dict:
+        """
+        Cache stats for the current window; 'embeddings_avoided' is the
+        number of texts served from disk instead of the provider
+        """
+        stats = self.cache.get_stats()
+        stats["embeddings_avoided"] = stats["hits"]
+        stats["provider_calls"] = self.provider_calls
+        if hasattr(self.provider, "requests_made"):
+            stats["provider_requests"] = self.provider.requests_made - self._requests_baseline
+        return stats
@@ -0,0 +1,239 @@
+# Job Autopilot - Embedding Providers
+# Batched text embeddings for the memory layer: OpenAI, or a local hashed TF-IDF backend that runs offline
+
+import os
+import re
+import math
+import time
+import zlib
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence
+
+from modules.logger_config import app_logger
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIMENSIONS = 1536
+
+# Texts per embeddings.create request (the API accepts up to 2048)
+EMBED_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", 256))
+
+RATE_LIMIT_MAX_RETRIES = 5
+RATE_LIMIT_BASE_DELAY = 1.0
+
+# Local backend defaults
+LOCAL_EMBEDDING_DIMENSIONS = int(os.getenv("LOCAL_EMBEDDING_DIMENSIONS", 512))
+LOCAL_BATCH_SIZE = 256
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+# Common words carry no similarity signal (static stand-in for low IDF)
+_STOPWORDS = frozenset("""
+a an and are as at be by for from has have i in is it of on or our that the this to we with you your
+hi hello thanks thank would love like just about am was were will can
+""".split())
+
+
+class EmbeddingError(RuntimeError):
+    """An embedding backend could not produce vectors"""
+
+
+class EmbeddingProvider:
+    """
+    Interface for anything that turns texts into vectors
+
+    Implementations return one vector per input text, in input order, all of
+    length `dimensions`, and raise on failure (callers decide the fallback).
+    """
+
+    model: str = ""
+    dimensions: int = 0
+
+    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        raise NotImplementedError
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """
+    OpenAI embeddings with request batching, bounded concurrency and a
+    requests-per-minute limit
+
+    A list of N texts becomes ceil(N / batch_size) requests, at most
+    max_concurrency of them in flight and no more than requests_per_minute
+    started per minute. 429 responses are retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        model: str = EMBEDDING_MODEL,
+        dimensions: int = EMBEDDING_DIMENSIONS,
+        batch_size: int = EMBED_BATCH_SIZE,
+        max_concurrency: Optional[int] = None,
+        requests_per_minute: Optional[int] = None
+    ):
+        """
+        Args:
+            client: OpenAI client (default: built from OPENAI_API_KEY)
+            model: Embedding model name
+            dimensions: Vector length the model returns
+            batch_size: Texts per request
+            max_concurrency: Parallel requests (default: EMBEDDING_MAX_CONCURRENCY env, 4)
+            requests_per_minute: Request start rate cap (default: EMBEDDING_RPM env, 500)
+        """
+        if client is None:
+            from openai import OpenAI
+            client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        self.client = client
+        self.model = model
+        self.dimensions = dimensions
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max_concurrency or int(os.getenv("EMBEDDING_MAX_CONCURRENCY", 4))
+        rpm = requests_per_minute or int(os.getenv("EMBEDDING_RPM", 500))
+        self._min_interval = 60.0 / rpm if rpm > 0 else 0.0
+        self._next_slot = 0.0
+        self._pace_lock = threading.Lock()
+        self.requests_made = 0
+
+    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embed texts in batched requests, preserving input order"""
+        texts = list(texts)
+        if not texts:
+            return []
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if len(batches) == 1:
+            return self._embed_batch(batches[0])
+
+        vectors: List[List[float]] = []
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as pool:
+            # pool.map preserves batch order
+            for batch_vectors in pool.map(self._embed_batch, batches):
+                vectors.extend(batch_vectors)
+        return vectors
+
+    def _embed_batch(self, batch: List[str]) -> List[List[float]]:
+        from openai import RateLimitError
+
+        for attempt in range(RATE_LIMIT_MAX_RETRIES + 1):
+            self._wait_for_slot()
+            try:
+                response = self.client.embeddings.create(model=self.model, input=batch)
+                with self._pace_lock:
+                    self.requests_made += 1
+                # The API returns items with an index; don't rely on ordering
+                return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+            except RateLimitError:
+                if attempt == RATE_LIMIT_MAX_RETRIES:
+                    raise
+                delay = RATE_LIMIT_BASE_DELAY * (2 ** attempt)
+                delay += random.uniform(0, delay * 0.25)
+                app_logger.warning(f"Embeddings rate limited, retrying in {delay:.1f}s (attempt {attempt + 1}/{RATE_LIMIT_MAX_RETRIES})")
+                time.sleep(delay)
+
+    def _wait_for_slot(self):
+        """Space request starts at least _min_interval apart"""
+        if not self._min_interval:
+            return
+        with self._pace_lock:
+            now = time.monotonic()
+            start = max(now, self._next_slot)
+            self._next_slot = start + self._min_interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """
+    Offline embeddings: hashed TF-IDF over words, word bigrams and
+    character trigrams, L2-normalized
+
+    Features are hashed (crc32, so vectors are stable across processes and
+    runs) into `dimensions` signed buckets. Term frequency is sublinear
+    (1 + log tf) and the IDF part is static: stopwords get zero weight and
+    longer n-grams more, so vectors never change as data is added and the
+    Chroma index stays valid. Cosine similarity then behaves like TF-IDF
+    keyword overlap with some tolerance for inflections and typos.
+    """
+
+    # Feature weights by kind (static inverse-frequency proxy)
+    WORD_WEIGHT = 1.0
+    BIGRAM_WEIGHT = 1.5
+    TRIGRAM_WEIGHT = 0.35
+
+    def __init__(
+        self,
+        dimensions: int = LOCAL_EMBEDDING_DIMENSIONS,
+        batch_size: int = LOCAL_BATCH_SIZE,
+        max_workers: Optional[int] = None
+    ):
+        """
+        Args:
+            dimensions: Vector length (hash buckets)
+            batch_size: Texts per worker task
+            max_workers: Worker threads (default: LOCAL_EMBEDDING_WORKERS env, 1)
+        """
+        self.dimensions = dimensions
+        self.model = f"local-hash-tfidf-{dimensions}"
+        self.batch_size = max(1, batch_size)
+        self.max_workers = max_workers or int(os.getenv("LOCAL_EMBEDDING_WORKERS", 1))
+
+    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embed texts in batches on worker threads, preserving input order"""
+        texts = list(texts)
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if self.max_workers <= 1 or len(batches) <= 1:
+            return [self._embed_one(text) for text in texts]
+
+        vectors: List[List[float]] = []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as pool:
+            for batch_vectors in pool.map(lambda batch: [self._embed_one(text) for text in batch], batches):
+                vectors.extend(batch_vectors)
+        return vectors
+
+    def _features(self, text: str):
+        """Yield (feature, weight) pairs for one text"""
+        words = [word for word in _TOKEN_RE.findall(text.lower()) if word not in _STOPWORDS]
+        for word in words:
+            yield "w:" + word, self.WORD_WEIGHT
+            padded = f"<{word}>"
+            for i in range(len(padded) - 2):
+                yield "c:" + padded[i:i + 3], self.TRIGRAM_WEIGHT
+        for first, second in zip(words, words[1:]):
+            yield f"b:{first} {second}", self.BIGRAM_WEIGHT
+
+    def _embed_one(self, text: str) -> List[float]:
+        counts = {}
+        for feature, weight in self._features(text):
+            entry = counts.get(feature)
+            counts[feature] = (entry[0] + 1, weight) if entry else (1, weight)
+
+        vector = [0.0] * self.dimensions
+        for feature, (tf, weight) in counts.items():
+            h = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if h & 0x80000000 else -1.0
+            vector[h % self.dimensions] += sign * weight * (1.0 + math.log(tf))
+
+        norm = math.sqrt(sum(value * value for value in vector))
+        if norm:
+            vector = [value / norm for value in vector]
+        return vector
+
+
+def get_embedding_provider(backend: Optional[str] = None) -> EmbeddingProvider:
+    """
+    Build the configured embedding backend
+
+    Args:
+        backend: 'openai' or 'local' (default: EMBEDDING_BACKEND env; 'openai'
+            when OPENAI_API_KEY is set, otherwise 'local')
+
+    Returns:
+        EmbeddingProvider
+    """
+    backend = (backend or os.getenv("EMBEDDING_BACKEND") or ("openai" if os.getenv("OPENAI_API_KEY") else "local")).lower()
+    if backend == "openai":
+        return OpenAIEmbeddingProvider()
+    if backend == "local":
+        return HashingEmbeddingProvider()
+    raise ValueError(f"Unknown embedding backend '{backend}' (expected 'openai' or 'local')")
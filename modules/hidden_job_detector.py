@@ -14,6 +14,8 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from modules.logger_config import app_logger
+from modules.llm_gateway import llm_gateway
+from modules.text_matcher import KeywordMatcher
 
 
 # 招聘信号关键词
@@ -33,6 +35,9 @@ HIRING_SIGNALS = {
     ]
 }
 
+# 三个强度的关键词编译成一个匹配器，一次扫描帖子
+HIRING_SIGNAL_MATCHER = KeywordMatcher.from_groups(HIRING_SIGNALS)
+
 # 增长信号（可能意味着招聘）
 GROWTH_SIGNALS = [
     'growth', 'expansion', 'acquired', 'funding', 'investment',
@@ -45,20 +50,6 @@ class HiddenJobDetector:
     检测公司招聘信号，识别隐藏的工作机会
     """
     
-    def __init__(self):
-        self.client = None
-        self._init_openai()
-    
-    def _init_openai(self):
-        """初始化OpenAI客户端"""
-        try:
-            from openai import OpenAI
-            api_key = os.getenv('OPENAI_API_KEY')
-            if api_key:
-                self.client = OpenAI(api_key=api_key)
-        except Exception as e:
-            app_logger.warning(f"OpenAI not available: {e}")
-    
     def check_company_signals(self, company_name: str, company_posts: List[str] = None) -> Dict:
         """
         检测公司的招聘信号
@@ -115,32 +106,19 @@ class HiddenJobDetector:
         Returns:
             List of signal dicts
         """
-        signals = []
-        post_lower = post_text.lower()
-        
-        for strength, keywords in HIRING_SIGNALS.items():
-            for keyword in keywords:
-                if keyword in post_lower:
-                    signals.append({
-                        'keyword': keyword,
-                        'strength': strength,
-                        'context': self._extract_context(post_text, keyword)
-                    })
-        
-        return signals
+        # 每个关键词取第一次出现的位置（顺序同 HIRING_SIGNALS）
+        return [
+            {
+                'keyword': keyword,
+                'strength': match.label,
+                'context': self._extract_context(post_text, match.start, match.end)
+            }
+            for keyword, match in HIRING_SIGNAL_MATCHER.first_hits(post_text).items()
+        ]
     
-    def _extract_context(self, text: str, keyword: str, window: int = 50) -> str:
-        """提取关键词周围的上下文"""
-        text_lower = text.lower()
-        idx = text_lower.find(keyword.lower())
-        
-        if idx == -1:
-            return ""
-        
-        start = max(0, idx - window)
-        end = min(len(text), idx + len(keyword) + window)
-        
-        return "..." + text[start:end] + "..."
+    def _extract_context(self, text: str, start: int, end: int, window: int = 50) -> str:
+        """提取关键词（text[start:end]）周围的上下文"""
+        return "..." + text[max(0, start - window):min(len(text), end + window)] + "..."
     
     async def analyze_with_ai(self, company_name: str, company_info: str) -> Dict:
         """
@@ -153,7 +131,7 @@ class HiddenJobDetector:
         Returns:
             AI分析结果
         """
-        if not self.client:
+        if not llm_gateway.is_available('hiring_signals'):
             return {'ai_analyzed': False}
         
         try:
@@ -180,7 +158,8 @@ Return JSON:
 }}
 """
             
-            response = self.client.chat.completions.create(
+            response = llm_gateway.complete(
+                "hiring_signals",
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "You are an expert at identifying hidden job opportunities. Return only valid JSON."},
@@ -191,7 +170,7 @@ Return JSON:
             )
             
             import json
-            result = json.loads(response.choices[0].message.content.strip())
+            result = json.loads(response.text.strip())
             result['ai_analyzed'] = True
             
             return result
@@ -3,17 +3,76 @@
 
 import os
 import json
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from itertools import islice
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 from urllib.parse import urlparse
 from dotenv import load_dotenv
 from apify_client import ApifyClient
 from modules.database import Job, Application, SessionLocal
 from modules.cache_manager import cache_manager
 from modules.logger_config import scraper_logger
+from modules.text_matcher import KeywordMatcher
 
 load_dotenv()
 
+# Items per Apify list_items request when streaming a dataset
+DATASET_PAGE_SIZE = 250
+
+# Rows per IN (...) lookup / INSERT statement in the bulk save path
+# (kept well under SQLite's 999 bound-parameter limit for the IN query)
+BULK_CHUNK_SIZE = 500
+
+# Dialects with INSERT ... ON CONFLICT DO NOTHING RETURNING
+UPSERT_DIALECTS = ("postgresql", "sqlite")
+
+JOB_COLUMNS = frozenset(column.key for column in Job.__table__.columns)
+
+# Job categories in priority order: the first category with a keyword hit wins
+JOB_CATEGORY_KEYWORDS = {
+    "edtech": ["edtech", "education technology", "instructional", "learning management", "lms"],
+    "ai_pm": ["ai product", "ai pm", "ai manager", "machine learning product"],
+    "automation": ["automation", "workflow", "rpa", "process automation", "n8n", "zapier"],
+    "l&d": ["learning development", "l&d", "training", "professional development"],
+}
+JOB_CATEGORY_MATCHER = KeywordMatcher.from_groups(JOB_CATEGORY_KEYWORDS)
+
+# Sub-prefixes stripped from company domains (checked in this order)
+DOMAIN_PREFIXES = ('careers.', 'jobs.', 'job.', 'hiring.', 'apply.', 'www.')
+
+# ATS/HR systems and job aggregators (useless for Apollo search); matched anywhere in the domain
+ATS_AND_AGGREGATOR_DOMAINS = KeywordMatcher([
+    # Job aggregators
+    'indeed.com', 'ca.indeed.com', 'linkedin.com', 'glassdoor.com', 'ziprecruiter.com',
+    # ATS systems
+    'rippling.com', 'ats.rippling.com', 'greenhouse.io', 'lever.co', 'workday.com',
+    'icims.com', 'smartrecruiters.com', 'bamboohr.com', 'jobvite.com',
+    'ultipro.com', 'taleo.net', 'successfactors.com', 'myworkdayjobs.com'
+])
+
+class JsonFileDataset:
+    """
+    Local stand-in for an Apify dataset client
+    
+    Serves list_items(offset=, limit=) pages from a dataset export: a JSON
+    array, or JSON Lines (read lazily, so large exports stay out of memory).
+    Used as a test fixture and for re-ingesting a saved run offline.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+    
+    def list_items(self, offset: int = 0, limit: Optional[int] = None) -> SimpleNamespace:
+        stop = offset + limit if limit is not None else None
+        with open(self.path, encoding="utf-8") as f:
+            if self.path.endswith(".jsonl"):
+                items = [json.loads(line) for line in islice(f, offset, stop)]
+            else:
+                items = json.load(f)[offset:stop]
+        return SimpleNamespace(items=items, offset=offset, limit=limit, count=len(items))
+
+
 class JobScraper:
     """Scrape jobs from Indeed using Apify"""
     
@@ -27,6 +86,10 @@ class JobScraper:
         
         self.client = ApifyClient(self.api_token)
         # scraper_logger.info("Apify client initialized")
+        
+        # Resume point of the most recent streaming ingest
+        self.last_dataset_id = None
+        self.last_offset = 0
     
     def scrape_jobs(
         self,
@@ -51,14 +114,34 @@ class JobScraper:
         Returns:
             list: Job data dictionaries
         """
-        # Use default keywords from environment if not provided
+        run_input = self.build_run_input(keywords, location, max_jobs, job_type, remote, days_ago)
+        scraper_logger.info(f"Starting job scrape: {run_input['query']} in {location} (Last {days_ago} days)")
+        
+        try:
+            dataset = self.run_actor(run_input)
+            jobs = []
+            for chunk in self.stream_jobs(dataset, days_ago=days_ago):
+                jobs.extend(chunk)
+            return jobs
+        
+        except Exception as e:
+            scraper_logger.error(f"Apify scraping failed: {e}", exc_info=True)
+            return []
+    
+    def build_run_input(
+        self,
+        keywords: str = None,
+        location: str = "Ontario, Canada",
+        max_jobs: int = 20,
+        job_type: str = "fulltime",
+        remote: str = "hybrid",
+        days_ago: int = 7
+    ) -> Dict:
+        """Apify actor input for an Indeed search (see scrape_jobs for args)"""
         if not keywords:
             keywords = os.getenv("DEFAULT_KEYWORDS", "Instructional Design, L&D, EdTech")
         
-        scraper_logger.info(f"Starting job scrape: {keywords} in {location} (Last {days_ago} days)")
-        
-        # Apify actor input
-        run_input = {
+        return {
             "country": "ca",
             "query": keywords,
             "location": location,
@@ -70,77 +153,223 @@ class JobScraper:
             "fromAge": days_ago,  # Indeed URL parameter name
             "publishedWithinDays": days_ago  # Another common variant
         }
+    
+    def run_actor(self, run_input: Dict):
+        """
+        Run the Apify actor and return a client for its default dataset
+        
+        The dataset id is kept in self.last_dataset_id so an interrupted
+        ingest can be resumed with dataset(last_dataset_id) + last_offset
+        instead of re-running (and paying for) the actor.
+        """
+        scraper_logger.info(f"Running Apify actor: {self.actor_id}")
+        run = self.client.actor(self.actor_id).call(run_input=run_input)
+        self.last_dataset_id = run["defaultDatasetId"]
+        return self.dataset(self.last_dataset_id)
+    
+    def dataset(self, dataset_id: str):
+        """Apify dataset client (anything with list_items(offset=, limit=) can stand in)"""
+        return self.client.dataset(dataset_id)
+    
+    def iter_dataset_items(
+        self,
+        dataset,
+        start_offset: int = 0,
+        page_size: int = DATASET_PAGE_SIZE
+    ) -> Iterator[Tuple[int, Dict]]:
+        """
+        Page through a dataset, yielding (offset, raw item)
+        
+        Pages are requested only as the consumer asks for more items, so at
+        most one page is held in memory and a slow consumer (e.g. the DB
+        write) naturally throttles fetching.
         
+        Args:
+            dataset: Dataset client exposing list_items(offset=, limit=)
+            start_offset: First dataset offset to read (for resuming)
+            page_size: Items per list_items request
+        """
+        offset = start_offset
+        while True:
+            page = dataset.list_items(offset=offset, limit=page_size)
+            for item in page.items:
+                yield offset, item
+                offset += 1
+            if len(page.items) < page_size:
+                return
+    
+    def stream_jobs(
+        self,
+        dataset,
+        days_ago: int = 7,
+        chunk_size: int = 100,
+        start_offset: int = 0
+    ) -> Iterator[List[Dict]]:
+        """
+        Stream processed jobs in bounded chunks
+        
+        Pipeline: fetch → _process_job_data per item, then cache lookup/store
+        and date filter per chunk. A chunk is yielded once chunk_size items have been
+        read from the dataset (so every chunk advances the offset by
+        chunk_size); after each chunk self.last_offset is the dataset offset
+        to resume from.
+        
+        Args:
+            dataset: Dataset client exposing list_items(offset=, limit=)
+            days_ago: Drop jobs posted more than N days ago
+            chunk_size: Dataset items per yielded chunk
+            start_offset: Dataset offset to start (or resume) from
+        
+        Yields:
+            list: Job data dictionaries that passed the date filter
+        """
+        cutoff_date = datetime.utcnow() - timedelta(days=days_ago)
+        stats = {"scraped": 0, "processed": 0, "kept": 0, "unknown_date": 0}
+        chunk = []
+        read_in_chunk = 0
+        self.last_offset = start_offset
+        
+        if start_offset:
+            scraper_logger.info(f"Resuming dataset ingest at offset {start_offset}")
+        
+        for offset, item in self.iter_dataset_items(dataset, start_offset=start_offset):
+            stats["scraped"] += 1
+            read_in_chunk += 1
+            
+            job_data = self._ingest_item(item, offset)
+            if job_data is not None:
+                chunk.append(job_data)
+            
+            if read_in_chunk >= chunk_size:
+                self.last_offset = offset + 1
+                chunk = self._finish_chunk(chunk, cutoff_date, stats)
+                yield chunk
+                chunk = []
+                read_in_chunk = 0
+        
+        if read_in_chunk:
+            self.last_offset += read_in_chunk
+            yield self._finish_chunk(chunk, cutoff_date, stats)
+        
+        scraper_logger.info(f"Scraped {stats['scraped']} jobs from Indeed")
+        scraper_logger.info(f"Successfully processed {stats['processed']} jobs")
+        scraper_logger.info(f"Date filter: {stats['processed']} → {stats['kept']} (last {days_ago} days, {stats['unknown_date']} unknown date)")
+    
+    def scrape_and_save(
+        self,
+        dataset=None,
+        days_ago: int = 7,
+        chunk_size: int = 100,
+        start_offset: int = 0,
+        process_chunk: Optional[Callable[[List[Dict]], None]] = None,
+        **search
+    ) -> Dict:
+        """
+        Streaming scrape: write each chunk to the database as it arrives
+        
+        Memory stays bounded by chunk_size regardless of max_jobs, and jobs
+        reach the DB while the rest of the dataset is still being read.
+        
+        Args:
+            dataset: Existing dataset client to ingest (e.g. to resume, or a
+                local fixture); if None the actor is run with **search
+            days_ago: Drop jobs posted more than N days ago
+            chunk_size: Items per fetch/save batch
+            start_offset: Dataset offset to resume from
+            process_chunk: Called with each chunk before it is saved (e.g. to
+                add match_score/match_reasoning in place)
+            **search: build_run_input() arguments (keywords, location, ...)
+        
+        Returns:
+            dict: scraped/saved counts, dataset_id and next_offset (resume point)
+        """
+        if dataset is None:
+            dataset = self.run_actor(self.build_run_input(days_ago=days_ago, **search))
+        
+        result = {"jobs": 0, "saved": 0, "dataset_id": self.last_dataset_id, "next_offset": start_offset}
         try:
-            # Run the Apify actor
-            scraper_logger.info(f"Running Apify actor: {self.actor_id}")
-            run = self.client.actor(self.actor_id).call(run_input=run_input)
-            
-            # Fetch results
-            items = []
-            for item in self.client.dataset(run["defaultDatasetId"]).iterate_items():
-                items.append(item)
-            
-            scraper_logger.info(f"Scraped {len(items)} jobs from Indeed")
-            
-            # Process and cache jobs
-            processed_jobs = []
-            for i, item in enumerate(items):
-                try:
-                    job_data = self._process_job_data(item)
-                    
-                    # Skip if processing failed (returns empty dict)
-                    if not job_data or not job_data.get("job_url"):
-                        scraper_logger.warning(f"Skipping job {i+1}: Missing job_url after processing")
-                        continue
-                    
-                    # Check cache first
-                    cached = cache_manager.get_cached_job(job_data["job_url"])
-                    if cached:
-                        scraper_logger.debug(f"Using cached job: {job_data['title']}")
-                        processed_jobs.append(cached)
-                    else:
-                        # Cache new job
-                        cache_manager.cache_job(job_data["job_url"], job_data, ttl_days=7)
-                        processed_jobs.append(job_data)
-                
-                except Exception as e:
-                    scraper_logger.error(f"Failed to process job {i+1}: {e}", exc_info=True)
-                    continue
-            
-            scraper_logger.info(f"Successfully processed {len(processed_jobs)} jobs")
-            
-            # POST-PROCESSING: Date filter (Apify Actor may not respect maxAge param)
-            cutoff_date = datetime.utcnow() - timedelta(days=days_ago)
-            filtered_jobs = []
-            unknown_date_count = 0
-            
-            for job in processed_jobs:
-                posted = job.get('posted_date')
-                if posted:
-                    # Handle both datetime and string formats
-                    if isinstance(posted, str):
-                        try:
-                            posted = datetime.fromisoformat(posted.replace('Z', '+00:00'))
-                        except:
-                            posted = None
-                    
-                    if posted and posted >= cutoff_date:
-                        filtered_jobs.append(job)
-                    else:
-                        scraper_logger.debug(f"Filtered out old job: {job['title']} (posted {posted})")
-                else:
-                    # No date available - keep but flag
-                    job['_date_unknown'] = True
-                    filtered_jobs.append(job)
-                    unknown_date_count += 1
+            for chunk in self.stream_jobs(dataset, days_ago=days_ago, chunk_size=chunk_size, start_offset=start_offset):
+                if chunk:
+                    if process_chunk is not None:
+                        process_chunk(chunk)
+                    result["saved"] += self.save_jobs_to_db(chunk)
+                    result["jobs"] += len(chunk)
+                result["next_offset"] = self.last_offset
+        except Exception as e:
+            scraper_logger.error(
+                f"Streaming ingest stopped at offset {result['next_offset']} "
+                f"(dataset {result['dataset_id']}): {e}", exc_info=True
+            )
+            result["error"] = str(e)
+        
+        return result
+    
+    def _ingest_item(self, item: Dict, offset: int) -> Optional[Dict]:
+        """Process one raw dataset item (None if it has to be skipped)"""
+        try:
+            job_data = self._process_job_data(item)
             
-            scraper_logger.info(f"Date filter: {len(processed_jobs)} → {len(filtered_jobs)} (last {days_ago} days, {unknown_date_count} unknown date)")
-            return filtered_jobs
+            # Skip if processing failed (returns empty dict)
+            if not job_data or not job_data.get("job_url"):
+                scraper_logger.warning(f"Skipping job {offset + 1}: Missing job_url after processing")
+                return None
+            return job_data
         
         except Exception as e:
-            scraper_logger.error(f"Apify scraping failed: {e}", exc_info=True)
-            return []
+            scraper_logger.error(f"Failed to process job {offset + 1}: {e}", exc_info=True)
+            return None
+    
+    def _finish_chunk(self, jobs: List[Dict], cutoff_date: datetime, stats: Dict) -> List[Dict]:
+        """
+        Apply the job cache (one MGET + one pipelined SETEX for the whole
+        chunk) and the date filter
+        """
+        stats["processed"] += len(jobs)
+        
+        cached = cache_manager.get_cached_jobs([job["job_url"] for job in jobs])
+        new_jobs = {job["job_url"]: job for job in jobs if job["job_url"] not in cached}
+        cache_manager.cache_jobs(new_jobs, ttl_days=7)
+        if cached:
+            scraper_logger.debug(f"Using {len(cached)} cached jobs")
+        
+        kept = []
+        for job in jobs:
+            job = cached.get(job["job_url"], job)
+            if self._passes_date_filter(job, cutoff_date, stats):
+                kept.append(job)
+        stats["kept"] += len(kept)
+        return kept
+    
+    @staticmethod
+    def _passes_date_filter(job: Dict, cutoff_date: datetime, stats: Dict) -> bool:
+        """
+        Date filter (Apify Actor may not respect maxAge param)
+        
+        Normalizes posted_date to a naive UTC datetime in place, since it
+        arrives tz-aware from Apify (and as a string from cache entries
+        written before the typed cache codec).
+        """
+        posted = job.get('posted_date')
+        if posted:
+            # Handle both datetime and string formats
+            if isinstance(posted, str):
+                try:
+                    posted = datetime.fromisoformat(posted.replace('Z', '+00:00'))
+                except ValueError:
+                    posted = None
+            if posted and posted.tzinfo is not None:
+                posted = posted.astimezone(timezone.utc).replace(tzinfo=None)
+            
+            if posted and posted >= cutoff_date:
+                job['posted_date'] = posted
+                return True
+            scraper_logger.debug(f"Filtered out old job: {job['title']} (posted {posted})")
+            return False
+        
+        # No date available - keep but flag
+        job['_date_unknown'] = True
+        stats["unknown_date"] += 1
+        return True
     
     def _process_job_data(self, raw_job: Dict) -> Dict:
         """
@@ -221,6 +450,11 @@ class JobScraper:
                 elif isinstance(salary_data, str):
                     salary = salary_data
             
+            # Job type arrives as a list (e.g. ["Full-time", "Contract"]) from some actors
+            job_type = raw_job.get("jobType", "")
+            if isinstance(job_type, list):
+                job_type = ", ".join(str(t) for t in job_type)
+            
             # Determine job category based on title/description
             category = self._categorize_job(
                 raw_job.get("title", ""),
@@ -253,7 +487,7 @@ class JobScraper:
                 "header_image_url": raw_job.get("headerImageUrl"),
                 
                 # Job details
-                "job_type": raw_job.get("jobType", ""),  # fulltime, parttime
+                "job_type": job_type,  # fulltime, parttime
                 "occupation": raw_job.get("occupation", ""),
                 "benefits": raw_job.get("benefits", ""),
                 "rating": str(raw_job.get("rating", "")) if raw_job.get("rating") else None,
@@ -295,8 +529,7 @@ class JobScraper:
             domain = parsed.netloc.lower()
             
             # Remove common prefixes
-            prefixes_to_remove = ['careers.', 'jobs.', 'job.', 'hiring.', 'apply.', 'www.']
-            for prefix in prefixes_to_remove:
+            for prefix in DOMAIN_PREFIXES:
                 if domain.startswith(prefix):
                     domain = domain[len(prefix):]
             
@@ -309,20 +542,9 @@ class JobScraper:
                 return None
             
             # Filter out ATS/HR systems and job aggregators (useless for Apollo search)
-            ats_and_aggregator_domains = [
-                # Job aggregators
-                'indeed.com', 'ca.indeed.com', 'linkedin.com', 'glassdoor.com', 'ziprecruiter.com',
-                # ATS systems
-                'rippling.com', 'ats.rippling.com', 'greenhouse.io', 'lever.co', 'workday.com',
-                'icims.com', 'smartrecruiters.com', 'bamboohr.com', 'jobvite.com',
-                'ultipro.com', 'taleo.net', 'successfactors.com', 'myworkdayjobs.com'
-            ]
-            
-            # Check if domain contains any of the blocked patterns
-            for blocked in ats_and_aggregator_domains:
-                if blocked in domain:
-                    scraper_logger.debug(f"Skipping ATS/aggregator domain: {domain}")
-                    return None
+            if ATS_AND_AGGREGATOR_DOMAINS.contains_any(domain):
+                scraper_logger.debug(f"Skipping ATS/aggregator domain: {domain}")
+                return None
             
             scraper_logger.debug(f"Extracted domain: {domain} from {url}")
             return domain
@@ -355,36 +577,24 @@ class JobScraper:
         Returns:
             str: Job category ('edtech', 'ai_pm', 'automation', 'l&d', 'other')
         """
-        text = f"{title} {description}".lower()
-        
-        # EdTech keywords
-        if any(kw in text for kw in ["edtech", "education technology", "instructional", "learning management", "lms"]):
-            return "edtech"
-        
-        # AI PM keywords
-        if any(kw in text for kw in ["ai product", "ai pm", "ai manager", "machine learning product"]):
-            return "ai_pm"
-        
-        # Automation keywords
-        if any(kw in text for kw in ["automation", "workflow", "rpa", "process automation", "n8n", "zapier"]):
-            return "automation"
-        
-        # L&D keywords
-        if any(kw in text for kw in ["learning development", "l&d", "training", "professional development"]):
-            return "l&d"
-        
-        return "other"
+        # Tables in priority order; stops at the first keyword found
+        return JOB_CATEGORY_MATCHER.first_label(f"{title} {description}") or "other"
     
-    def save_jobs_to_db(self, jobs: List[Dict]) -> int:
+    def save_jobs_to_db(self, jobs: List[Dict], bulk: bool = True) -> int:
         """
         Save scraped jobs to database
         
         Args:
-            jobs: List of job dictionaries
+            jobs: List of job dictionaries (each saved dict gets its new 'id')
+            bulk: Use chunked prefetch + multi-row INSERT (a handful of round
+                trips per 500 jobs) instead of one SELECT/INSERT pair per job
         
         Returns:
             int: Number of jobs saved
         """
+        if bulk:
+            return self._save_jobs_bulk(jobs)
+        
         try:
             db = SessionLocal()
         except Exception as e:
@@ -407,7 +617,7 @@ class JobScraper:
                         continue
                     
                     # Create new job
-                    new_job = Job(**job_data)
+                    new_job = Job(**self._job_columns(job_data))
                     db.add(new_job)
                     db.flush()  # Generate ID
                     job_data['id'] = new_job.id  # Update original dict with ID
@@ -422,22 +632,162 @@ class JobScraper:
                     continue
             
             db.commit()
+            self._log_save_summary(saved_count, skipped_count, failed_count)
             
-            # Summary logging
-            scraper_logger.info(f"Database save summary: {saved_count} saved, {skipped_count} skipped (duplicate), {failed_count} failed")
-            
-            if saved_count == 0 and skipped_count > 0:
-                scraper_logger.warning(f"All {skipped_count} jobs already exist in database!")
+        except Exception as e:
+            db.rollback()
+            scraper_logger.error(f"Database commit failed: {e}", exc_info=True)
+        
+        finally:
+            db.close()
+        
+        return saved_count
+    
+    def _save_jobs_bulk(self, jobs: List[Dict]) -> int:
+        """
+        Bulk ingest: dedupe in memory, prefetch existing URLs with chunked
+        IN queries, then insert new rows a chunk at a time
+        
+        PostgreSQL and SQLite use INSERT ... ON CONFLICT (job_url) DO NOTHING
+        RETURNING id, so rows inserted concurrently by another process are
+        counted as skipped rather than failing the chunk. Other dialects use
+        bulk_insert_mappings. A chunk that errors is retried row by row so
+        one bad job only fails itself.
+        
+        Args:
+            jobs: List of job dictionaries
+        
+        Returns:
+            int: Number of jobs saved
+        """
+        try:
+            db = SessionLocal()
+        except Exception as e:
+            scraper_logger.warning(f"Database not available (DEMO mode): {e}")
+            return 0
+        
+        saved_count = 0
+        skipped_count = 0
+        failed_count = 0
+        
+        try:
+            # 1. Validate and drop duplicates within the batch
+            new_jobs = {}  # job_url -> job dict (insertion-ordered)
+            for i, job_data in enumerate(jobs, 1):
+                job_url = job_data.get("job_url")
+                if not job_url or not job_data.get("title") or not job_data.get("company"):
+                    failed_count += 1
+                    scraper_logger.error(f"Failed to add job {i}/{len(jobs)}: missing job_url/title/company")
+                    scraper_logger.error(f"Problematic job data keys: {list(job_data.keys())}")
+                elif job_url in new_jobs:
+                    skipped_count += 1
+                    scraper_logger.debug(f"Job {i}/{len(jobs)} duplicated in batch: {job_data['title']}")
+                else:
+                    new_jobs[job_url] = job_data
+            
+            # 2. One IN (...) query per chunk for URLs already stored
+            urls = list(new_jobs)
+            for start in range(0, len(urls), BULK_CHUNK_SIZE):
+                chunk = urls[start:start + BULK_CHUNK_SIZE]
+                for (existing_url,) in db.query(Job.job_url).filter(Job.job_url.in_(chunk)):
+                    job_data = new_jobs.pop(existing_url)
+                    skipped_count += 1
+                    scraper_logger.debug(f"Job already exists: {job_data['title']}")
+            
+            # 3. Insert the remainder
+            dialect = db.get_bind().dialect.name
+            pending = list(new_jobs.values())
+            for start in range(0, len(pending), BULK_CHUNK_SIZE):
+                chunk = pending[start:start + BULK_CHUNK_SIZE]
+                try:
+                    with db.begin_nested():
+                        inserted = self._insert_job_chunk(db, chunk, dialect)
+                except Exception as chunk_error:
+                    scraper_logger.warning(f"Bulk insert of {len(chunk)} jobs failed ({chunk_error}), retrying row by row")
+                    inserted = {}
+                    for job_data in chunk:
+                        try:
+                            with db.begin_nested():
+                                inserted.update(self._insert_job_chunk(db, [job_data], dialect))
+                        except Exception as job_error:
+                            failed_count += 1
+                            scraper_logger.error(f"Failed to add job {job_data.get('title')}: {job_error}")
+                            scraper_logger.error(f"Problematic job data keys: {list(job_data.keys())}")
+                            job_data['_failed'] = True
+                
+                for job_data in chunk:
+                    if job_data.pop('_failed', False):
+                        continue
+                    if job_data["job_url"] in inserted:
+                        job_data['id'] = inserted[job_data["job_url"]]
+                        saved_count += 1
+                    else:
+                        # Lost an ON CONFLICT race with a concurrent writer
+                        skipped_count += 1
+                
+                scraper_logger.info(f"Bulk inserted jobs {start + 1}-{start + len(chunk)}/{len(pending)}")
             
+            db.commit()
+            self._log_save_summary(saved_count, skipped_count, failed_count)
+        
         except Exception as e:
             db.rollback()
             scraper_logger.error(f"Database commit failed: {e}", exc_info=True)
+            saved_count = 0
         
         finally:
             db.close()
         
         return saved_count
     
+    def _insert_job_chunk(self, db, chunk: List[Dict], dialect: str) -> Dict[str, int]:
+        """
+        Insert one chunk of new jobs
+        
+        Returns:
+            dict: job_url -> new id for rows actually inserted
+        """
+        inserted = {}
+        
+        # executemany needs one key set per statement; scraped jobs normally share one
+        groups: Dict[tuple, List[Dict]] = {}
+        for job_data in chunk:
+            row = self._job_columns(job_data)
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+        
+        for rows in groups.values():
+            if dialect in UPSERT_DIALECTS:
+                if dialect == "postgresql":
+                    from sqlalchemy.dialects.postgresql import insert
+                else:
+                    from sqlalchemy.dialects.sqlite import insert
+                stmt = (
+                    insert(Job)
+                    .on_conflict_do_nothing(index_elements=["job_url"])
+                    .returning(Job.id, Job.job_url)
+                )
+                for job_id, job_url in db.execute(stmt, rows):
+                    inserted[job_url] = job_id
+            else:
+                db.bulk_insert_mappings(Job, rows, return_defaults=True)
+                for row in rows:
+                    inserted[row["job_url"]] = row["id"]
+        
+        return inserted
+    
+    @staticmethod
+    def _job_columns(job_data: Dict) -> Dict:
+        """Keep only keys that are Job columns (drops flags like '_date_unknown')"""
+        return {key: value for key, value in job_data.items() if key in JOB_COLUMNS and key != "id"}
+    
+    @staticmethod
+    def _log_save_summary(saved_count: int, skipped_count: int, failed_count: int):
+        """Summary logging shared by the per-row and bulk save paths"""
+        scraper_logger.info(f"Database save summary: {saved_count} saved, {skipped_count} skipped (duplicate), {failed_count} failed")
+        
+        if saved_count == 0 and skipped_count > 0:
+            scraper_logger.warning(f"All {skipped_count} jobs already exist in database!")
+    
     def get_recent_jobs(self, days: int = 3) -> List[Job]:
         """
         Get jobs posted within last N days
@@ -0,0 +1,104 @@
+# Job Autopilot - Lazy Singleton Registry
+# Defers construction of heavy module-level objects (spaCy, Redis, SQL engine, ChromaDB) to first use
+
+import time
+import threading
+from typing import Any, Callable, Dict
+
+from modules.logger_config import app_logger
+
+# name -> LazySingleton, for introspection (what has been built, and how long it took)
+_REGISTRY: Dict[str, "LazySingleton"] = {}
+
+
+class LazySingleton:
+    """
+    Module-level stand-in for a heavy singleton
+
+    Behaves like the wrapped object: attribute access, attribute
+    assignment and calls are forwarded to the instance, which is built by
+    `factory` on first use (thread-safe, exactly once). Existing code such
+    as `from modules.ats_scorer import ats_scorer; ats_scorer.score_resume(...)`
+    keeps working unchanged, but importing the module no longer pays for it.
+    """
+
+    __slots__ = ("_name", "_factory", "_instance", "_lock", "_load_seconds")
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+        object.__setattr__(self, "_load_seconds", None)
+
+    def get(self) -> Any:
+        """Return the instance, creating it on first call"""
+        instance = self._instance
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            if self._instance is None:
+                start = time.perf_counter()
+                instance = self._factory()
+                elapsed = time.perf_counter() - start
+                object.__setattr__(self, "_instance", instance)
+                object.__setattr__(self, "_load_seconds", elapsed)
+                app_logger.debug(f"Lazy-loaded {self._name} in {elapsed * 1000:.0f}ms")
+            return self._instance
+
+    @property
+    def loaded(self) -> bool:
+        """True once the instance has been created"""
+        return self._instance is not None
+
+    def reset(self):
+        """Drop the instance so the next access rebuilds it (tests, config reloads)"""
+        with self._lock:
+            object.__setattr__(self, "_instance", None)
+            object.__setattr__(self, "_load_seconds", None)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.get(), attr)
+
+    def __setattr__(self, attr: str, value: Any):
+        setattr(self.get(), attr, value)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.get()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<LazySingleton {self._name} ({state})>"
+
+
+def lazy_singleton(name: str, factory: Callable[[], Any]) -> LazySingleton:
+    """
+    Register a lazily-created singleton
+
+    Args:
+        name: Registry name (usually the module-level variable name)
+        factory: Zero-argument callable that builds the instance
+
+    Returns:
+        LazySingleton proxy to assign to the module-level name
+    """
+    proxy = LazySingleton(name, factory)
+    _REGISTRY[name] = proxy
+    return proxy
+
+
+def get_registry_status() -> Dict[str, Dict]:
+    """
+    Which singletons have been built so far and how long each took
+
+    Returns:
+        dict: name -> {"loaded": bool, "load_ms": float or None}
+    """
+    return {
+        name: {
+            "loaded": proxy.loaded,
+            "load_ms": round(proxy._load_seconds * 1000, 1) if proxy._load_seconds is not None else None
+        }
+        for name, proxy in _REGISTRY.items()
+    }
@@ -3,110 +3,123 @@ LLM Configuration for Job Autopilot
 配置各种LLM用于不同用途
 """
 import os
-from typing import Optional
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# LLM配置
+# LLM配置（各用途的默认模型；调用方显式传 model 时以调用方为准）
 LLM_CONFIG = {
     'resume': 'gpt-4o',               # 简历优化 - 长篇创意写作
     'message_generation': 'gemini-2.5-flash',  # 消息生成 - 快、便宜、短文本
     'profile_analysis': 'gpt-4o-mini',  # Profile分析 - 便宜
     'ranking': 'gpt-4o-mini',           # 打分 - 便宜
     'scam_detection': 'gpt-4o-mini',    # 诈骗检测 - 便宜
+    'review': 'gpt-4o-mini',            # 消息审核
+    'validation': 'gpt-4o-mini',        # 联系人数据校验
+    'hiring_signals': 'gpt-4o-mini',    # 招聘信号分析
+    'email': 'gpt-4o-mini',             # Cold email
 }
 
+# 各用途的调用策略（modules.llm_gateway 使用）
+#   concurrency   同时在途的请求数
+#   rpm           每分钟请求数（令牌桶）
+#   timeout       单次请求超时（秒）
+#   hedge_after   超过这么多秒还没返回就再发一个相同请求，取先返回的（None = 不对冲）
+LLM_ROUTES = {
+    'resume':             {'concurrency': 2, 'rpm': 60, 'timeout': 120, 'hedge_after': None},
+    'message_generation': {'concurrency': 4, 'rpm': 300, 'timeout': 30, 'hedge_after': 10},
+    'profile_analysis':   {'concurrency': 4, 'rpm': 300, 'timeout': 30, 'hedge_after': 10},
+    'ranking':            {'concurrency': int(os.getenv('OPENAI_MAX_CONCURRENCY', 8)), 'rpm': 500, 'timeout': 60, 'hedge_after': 20},
+    'scam_detection':     {'concurrency': 4, 'rpm': 300, 'timeout': 30, 'hedge_after': 10},
+    'review':             {'concurrency': 4, 'rpm': 300, 'timeout': 30, 'hedge_after': 10},
+    'validation':         {'concurrency': 4, 'rpm': 300, 'timeout': 30, 'hedge_after': 10},
+    'hiring_signals':     {'concurrency': 2, 'rpm': 120, 'timeout': 60, 'hedge_after': None},
+    'email':              {'concurrency': 2, 'rpm': 120, 'timeout': 60, 'hedge_after': None},
+}
+
+# 主模型失败时换到另一家的模型
+FALLBACK_MODELS = {
+    'openai': 'gemini-2.5-flash',
+    'gemini': 'gpt-4o-mini',
+}
+
+# 价格（美元 / 百万 token：输入, 输出），用于成本统计
+MODEL_PRICES = {
+    'gpt-4o': (2.50, 10.00),
+    'gpt-4o-mini': (0.15, 0.60),
+    'gemini-2.5-flash': (0.30, 2.50),
+}
+
+
+def provider_for(model: str) -> str:
+    """模型属于哪家：'gemini' 或 'openai'"""
+    return 'gemini' if model.startswith('gemini') else 'openai'
+
 
 # ============================================
-# Gemini Setup
+# Gemini / OpenAI（经 modules.llm_gateway：复用客户端、限流、回退）
+# 出错时抛 LLMError，不再把错误当作文本返回
 # ============================================
-def get_gemini_model():
+def get_gemini_model(model: str = 'gemini-2.5-flash'):
     """
-    获取Gemini模型实例
+    获取（共享的）Gemini模型实例
     
     需要在.env中配置 GOOGLE_API_KEY
     """
-    api_key = os.getenv('GOOGLE_API_KEY')
-    
-    if not api_key:
-        raise ValueError(
-            "GOOGLE_API_KEY not found in .env file. "
-            "Please add your Gemini API key from https://makersuite.google.com/app/apikey"
-        )
-    
-    try:
-        import google.generativeai as genai
-        genai.configure(api_key=api_key)
-        return genai.GenerativeModel('gemini-2.5-flash')
-    except ImportError:
-        raise ImportError(
-            "google-generativeai package not installed. "
-            "Please run: pip install google-generativeai"
-        )
+    from modules.llm_gateway import llm_gateway
+    return llm_gateway.gemini_model(model)
+
+
+def get_openai_client():
+    """
+    获取（共享的）OpenAI客户端
+    """
+    from modules.llm_gateway import llm_gateway
+    return llm_gateway.openai_client()
+
 
+def _messages(prompt: str):
+    return [{"role": "user", "content": prompt}]
 
-async def call_gemini(prompt: str) -> str:
+
+async def call_gemini(prompt: str, purpose: str = 'message_generation') -> str:
     """
-    调用Gemini模型生成内容
+    调用Gemini模型生成内容（Gemini不可用时回退到OpenAI）
     
     Args:
         prompt: 提示词
+        purpose: 用途（决定限流策略）
         
     Returns:
         生成的文本
+    
+    Raises:
+        LLMError: 所有模型都失败
     """
-    try:
-        model = get_gemini_model()
-        response = await model.generate_content_async(prompt)
-        return response.text
-    except Exception as e:
-        from modules.logger_config import app_logger
-        app_logger.error(f"Gemini API error: {e}")
-        # 返回fallback消息
-        return f"[Gemini Error] {str(e)}"
+    from modules.llm_gateway import llm_gateway
+    response = await llm_gateway.acomplete(purpose, _messages(prompt), model='gemini-2.5-flash')
+    return response.text
 
 
-def call_gemini_sync(prompt: str) -> str:
+def call_gemini_sync(prompt: str, purpose: str = 'message_generation') -> str:
     """
-    同步调用Gemini模型
+    同步调用Gemini模型（Gemini不可用时回退到OpenAI）
     
     Args:
         prompt: 提示词
+        purpose: 用途（决定限流策略）
         
     Returns:
         生成的文本
-    """
-    try:
-        model = get_gemini_model()
-        response = model.generate_content(prompt)
-        return response.text
-    except Exception as e:
-        from modules.logger_config import app_logger
-        app_logger.error(f"Gemini API error: {e}")
-        return f"[Gemini Error] {str(e)}"
-
-
-# ============================================
-# OpenAI Setup
-# ============================================
-def get_openai_client():
-    """
-    获取OpenAI客户端
-    """
-    api_key = os.getenv('OPENAI_API_KEY')
-    
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY not found in .env file")
     
-    try:
-        from openai import OpenAI
-        return OpenAI(api_key=api_key)
-    except ImportError:
-        raise ImportError("openai package not installed. Please run: pip install openai")
+    Raises:
+        LLMError: 所有模型都失败
+    """
+    from modules.llm_gateway import llm_gateway
+    return llm_gateway.complete(purpose, _messages(prompt), model='gemini-2.5-flash').text
 
 
-async def call_gpt(prompt: str, model: str = None, json_mode: bool = False) -> str:
+async def call_gpt(prompt: str, model: str = None, json_mode: bool = False, purpose: str = 'ranking') -> str:
     """
     调用OpenAI GPT模型
     
@@ -114,41 +127,26 @@ async def call_gpt(prompt: str, model: str = None, json_mode: bool = False) -> s
         prompt: 提示词
         model: 模型名称（默认使用配置的模型）
         json_mode: 是否返回JSON格式
+        purpose: 用途（决定限流策略）
         
     Returns:
         生成的文本
-    """
-    import asyncio
-    
-    if model is None:
-        model = os.getenv('OPENAI_MODEL', 'gpt-4o-mini')
-    
-    try:
-        client = get_openai_client()
-        
-        # 同步调用，在线程池中运行
-        def _call():
-            kwargs = {
-                "model": model,
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": 0.7,
-            }
-            
-            if json_mode:
-                kwargs["response_format"] = {"type": "json_object"}
-            
-            response = client.chat.completions.create(**kwargs)
-            return response.choices[0].message.content
-        
-        return await asyncio.get_event_loop().run_in_executor(None, _call)
     
-    except Exception as e:
-        from modules.logger_config import app_logger
-        app_logger.error(f"OpenAI API error: {e}")
-        return f"[OpenAI Error] {str(e)}"
-
-
-def call_gpt_sync(prompt: str, model: str = None, json_mode: bool = False) -> str:
+    Raises:
+        LLMError: 所有模型都失败
+    """
+    from modules.llm_gateway import llm_gateway
+    response = await llm_gateway.acomplete(
+        purpose,
+        _messages(prompt),
+        model=model or os.getenv('OPENAI_MODEL', 'gpt-4o-mini'),
+        temperature=0.7,
+        response_format={"type": "json_object"} if json_mode else None
+    )
+    return response.text
+
+
+def call_gpt_sync(prompt: str, model: str = None, json_mode: bool = False, purpose: str = 'ranking') -> str:
     """
     同步调用OpenAI GPT模型
     
@@ -156,32 +154,22 @@ def call_gpt_sync(prompt: str, model: str = None, json_mode: bool = False) -> st
         prompt: 提示词
         model: 模型名称
         json_mode: 是否返回JSON格式
+        purpose: 用途（决定限流策略）
         
     Returns:
         生成的文本
-    """
-    if model is None:
-        model = os.getenv('OPENAI_MODEL', 'gpt-4o-mini')
     
-    try:
-        client = get_openai_client()
-        
-        kwargs = {
-            "model": model,
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": 0.7,
-        }
-        
-        if json_mode:
-            kwargs["response_format"] = {"type": "json_object"}
-        
-        response = client.chat.completions.create(**kwargs)
-        return response.choices[0].message.content
-    
-    except Exception as e:
-        from modules.logger_config import app_logger
-        app_logger.error(f"OpenAI API error: {e}")
-        return f"[OpenAI Error] {str(e)}"
+    Raises:
+        LLMError: 所有模型都失败
+    """
+    from modules.llm_gateway import llm_gateway
+    return llm_gateway.complete(
+        purpose,
+        _messages(prompt),
+        model=model or os.getenv('OPENAI_MODEL', 'gpt-4o-mini'),
+        temperature=0.7,
+        response_format={"type": "json_object"} if json_mode else None
+    ).text
 
 
 # ============================================
@@ -0,0 +1,490 @@
+# Job Autopilot - LLM Gateway
+# One entry point for chat completions: pooled clients, per-purpose limits, hedging, provider fallback and cost accounting
+
+import os
+import time
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Optional
+
+from modules.lazy_loader import lazy_singleton
+from modules.logger_config import app_logger
+from modules.llm_config import LLM_CONFIG, LLM_ROUTES, FALLBACK_MODELS, MODEL_PRICES, provider_for
+
+# Retry policy for 429 responses (per provider attempt)
+RATE_LIMIT_MAX_RETRIES = 4
+RATE_LIMIT_BASE_DELAY = 1.0  # seconds, doubled on each retry
+
+# Route used for purposes missing from LLM_ROUTES
+DEFAULT_ROUTE = {'concurrency': 4, 'rpm': 300, 'timeout': 60, 'hedge_after': None}
+
+# Latency samples kept per (purpose, model) for percentiles
+LATENCY_WINDOW = 500
+
+
+class LLMError(RuntimeError):
+    """Every provider for a purpose failed (or none is configured)"""
+
+
+class RateLimited(Exception):
+    """Provider-neutral 429, carrying the server's Retry-After when given"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMResponse:
+    """Text of a completion plus what it cost"""
+
+    __slots__ = ("text", "provider", "model", "latency", "prompt_tokens", "completion_tokens", "cost", "hedged", "fallback")
+
+    def __init__(self, text: str, provider: str, model: str, latency: float = 0.0,
+                 prompt_tokens: int = 0, completion_tokens: int = 0):
+        self.text = text
+        self.provider = provider
+        self.model = model
+        self.latency = latency
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.cost = estimate_cost(model, prompt_tokens, completion_tokens)
+        self.hedged = False    # Answer came from the hedge request
+        self.fallback = False  # Answer came from a fallback model
+
+    def __repr__(self):
+        return f"<LLMResponse {self.provider}/{self.model} {self.latency * 1000:.0f}ms ${self.cost:.5f}>"
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """USD for one call (0 for models without a price entry)"""
+    for name in sorted(MODEL_PRICES, key=len, reverse=True):
+        if model.startswith(name):
+            input_price, output_price = MODEL_PRICES[name]
+            return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+    return 0.0
+
+
+class TokenBucket:
+    """
+    Requests-per-minute limiter
+
+    Refills at rpm/60 tokens per second up to `burst`; acquire() blocks
+    until a token is available, try_acquire() does not.
+    """
+
+    def __init__(self, rpm: int, burst: Optional[int] = None):
+        self.rate = rpm / 60.0 if rpm > 0 else 0.0
+        self.capacity = float(burst or max(1, rpm // 10))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        """Take a token if available; else return seconds until one is"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        if not self.rate:
+            return
+        while True:
+            delay = self._take()
+            if not delay:
+                return
+            time.sleep(delay)
+
+    def try_acquire(self) -> bool:
+        return not self.rate or not self._take()
+
+
+class _Route:
+    """Limits shared by every call for one purpose"""
+
+    def __init__(self, purpose: str, settings: Dict):
+        self.purpose = purpose
+        self.timeout = settings.get('timeout')
+        self.hedge_after = settings.get('hedge_after')
+        self.slots = threading.BoundedSemaphore(max(1, settings.get('concurrency', 1)))
+        self.bucket = TokenBucket(settings.get('rpm', 0))
+
+
+class LLMGateway:
+    """
+    Routes chat completions by purpose
+
+    - Clients are created once per provider/credentials and reused
+    - Each purpose (LLM_ROUTES) has its own concurrency cap and token bucket
+    - Requests time out after the route's timeout; with hedge_after set, a
+      request still running after that many seconds gets a duplicate and
+      the first answer wins (only if the route has budget for it)
+    - 429s are retried with backoff; any other failure moves on to the
+      fallback model on the other provider (FALLBACK_MODELS)
+    - Every call's latency, tokens and cost are aggregated per
+      (purpose, model); see get_stats()
+
+    Errors are raised as LLMError; callers keep their own defaults.
+    """
+
+    def __init__(self, routes: Optional[Dict[str, Dict]] = None):
+        """
+        Args:
+            routes: purpose -> route settings (default: LLM_ROUTES)
+        """
+        self._route_settings = routes or LLM_ROUTES
+        self._routes: Dict[str, _Route] = {}
+        self._clients: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+        # Every request on the pool holds one of its route's slots, so one
+        # worker per hedged-route slot means nothing ever waits in its queue
+        # (where the hedge_after and timeout clocks would already be running)
+        hedged_slots = sum(
+            max(1, settings.get('concurrency', 1))
+            for settings in self._route_settings.values() if settings.get('hedge_after')
+        )
+        self._hedge_pool = ThreadPoolExecutor(max_workers=max(1, hedged_slots), thread_name_prefix="llm-hedge")
+        self._stats: Dict[tuple, Dict] = {}
+
+    # ============================================================
+    # Clients
+    # ============================================================
+
+    def openai_client(self):
+        """Shared OpenAI client for the current OPENAI_API_KEY / OPENAI_BASE_URL"""
+        api_key = os.getenv('OPENAI_API_KEY')
+        if not api_key:
+            raise LLMError("OPENAI_API_KEY not set")
+        key = ('openai', api_key, os.getenv('OPENAI_BASE_URL'))
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    from openai import OpenAI
+                    # Retries happen here (429 backoff, provider fallback), not in the SDK
+                    client = OpenAI(api_key=api_key, base_url=key[2], max_retries=0)
+                    self._clients[key] = client
+        return client
+
+    def gemini_model(self, model: str):
+        """Shared Gemini GenerativeModel for `model`"""
+        api_key = os.getenv('GOOGLE_API_KEY')
+        if not api_key:
+            raise LLMError("GOOGLE_API_KEY not set")
+        base_url = os.getenv('GEMINI_BASE_URL')
+        key = ('gemini', api_key, base_url, model)
+        instance = self._clients.get(key)
+        if instance is None:
+            with self._lock:
+                instance = self._clients.get(key)
+                if instance is None:
+                    try:
+                        import google.generativeai as genai
+                    except ImportError as e:
+                        raise LLMError("google-generativeai package not installed") from e
+                    if base_url:
+                        # e.g. the local stub server used by the benchmarks
+                        genai.configure(api_key=api_key, transport='rest', client_options={'api_endpoint': base_url})
+                    else:
+                        genai.configure(api_key=api_key)
+                    instance = genai.GenerativeModel(model)
+                    self._clients[key] = instance
+        return instance
+
+    @staticmethod
+    def provider_available(provider: str) -> bool:
+        """Credentials set (and, for Gemini, the SDK installed)"""
+        if provider == 'gemini':
+            return bool(os.getenv('GOOGLE_API_KEY')) and _gemini_sdk_installed()
+        return bool(os.getenv('OPENAI_API_KEY'))
+
+    def is_available(self, purpose: Optional[str] = None, model: Optional[str] = None) -> bool:
+        """True if at least one provider can serve this purpose"""
+        return bool(self._candidates(purpose or 'ranking', model))
+
+    # ============================================================
+    # Completions
+    # ============================================================
+
+    def complete(
+        self,
+        purpose: str,
+        messages: List[Dict],
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        response_format: Optional[Dict] = None,
+        timeout: Optional[float] = None
+    ) -> LLMResponse:
+        """
+        Run one chat completion for `purpose`
+
+        Args:
+            purpose: Key of LLM_ROUTES (limits, timeout, hedging)
+            messages: OpenAI-style messages
+            model: Primary model (default: LLM_CONFIG[purpose])
+            temperature: Sampling temperature
+            max_tokens: Completion token cap
+            response_format: e.g. {"type": "json_object"}
+            timeout: Per-request timeout (default: the route's)
+
+        Returns:
+            LLMResponse
+
+        Raises:
+            LLMError: No provider configured, or all of them failed
+        """
+        route = self._route(purpose)
+        candidates = self._candidates(purpose, model)
+        if not candidates:
+            raise LLMError(f"No LLM provider configured for '{purpose}'")
+
+        request = {
+            'messages': messages,
+            'temperature': temperature,
+            'max_tokens': max_tokens,
+            'response_format': response_format,
+            'timeout': timeout or route.timeout,
+        }
+        errors = []
+        for i, candidate in enumerate(candidates):
+            route.bucket.acquire()
+            route.slots.acquire()
+            try:
+                response = self._hedged(route, candidate, request)
+            except Exception as e:
+                self._record(purpose, candidate, error=True)
+                errors.append(f"{candidate}: {e}")
+                if i + 1 < len(candidates):
+                    app_logger.warning(f"LLM {purpose} via {candidate} failed ({e}); falling back to {candidates[i + 1]}")
+                continue
+            response.fallback = i > 0
+            self._record(purpose, candidate, response=response)
+            return response
+        raise LLMError(f"All providers failed for '{purpose}': {'; '.join(errors)}")
+
+    async def acomplete(self, purpose: str, messages: List[Dict], **kwargs) -> LLMResponse:
+        """complete() on a worker thread, for async callers"""
+        import asyncio
+        return await asyncio.to_thread(self.complete, purpose, messages, **kwargs)
+
+    def _hedged(self, route: _Route, model: str, request: Dict) -> LLMResponse:
+        """
+        Send, and duplicate the request if it runs past route.hedge_after
+
+        Takes over the route slot the caller acquired. Each slot is released
+        when the request holding it finishes, so a losing request keeps its
+        slot (and its pool worker) until it is really done.
+        """
+        if not route.hedge_after:
+            try:
+                return self._send_with_retry(model, request)
+            finally:
+                route.slots.release()
+
+        first = self._submit(route, model, request)
+        done, _ = wait([first], timeout=route.hedge_after)
+        if done or not route.bucket.try_acquire():
+            return first.result()
+        if not route.slots.acquire(blocking=False):
+            return first.result()
+
+        app_logger.debug(f"Hedging slow {route.purpose} request to {model} after {route.hedge_after}s")
+        second = self._submit(route, model, request)
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    response = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                response.hedged = future is second
+                self._record(route.purpose, model, hedge=True, hedge_won=response.hedged)
+                return response
+        raise error
+
+    def _submit(self, route: _Route, model: str, request: Dict):
+        """Run one attempt on the hedge pool; its route slot is released when it finishes"""
+        try:
+            future = self._hedge_pool.submit(self._send_with_retry, model, request)
+        except Exception:
+            route.slots.release()
+            raise
+        future.add_done_callback(lambda _: route.slots.release())
+        return future
+
+    def _send_with_retry(self, model: str, request: Dict) -> LLMResponse:
+        """One provider attempt, retrying 429s with exponential backoff"""
+        for attempt in range(RATE_LIMIT_MAX_RETRIES + 1):
+            try:
+                return self._send(model, request)
+            except RateLimited as e:
+                if attempt == RATE_LIMIT_MAX_RETRIES:
+                    raise
+                delay = e.retry_after or RATE_LIMIT_BASE_DELAY * (2 ** attempt)
+                delay += random.uniform(0, delay * 0.25)  # Jitter so workers don't retry in lockstep
+                app_logger.warning(f"{model} rate limited, retrying in {delay:.1f}s (attempt {attempt + 1}/{RATE_LIMIT_MAX_RETRIES})")
+                time.sleep(delay)
+
+    def _send(self, model: str, request: Dict) -> LLMResponse:
+        start = time.perf_counter()
+        if provider_for(model) == 'gemini':
+            response = self._send_gemini(model, request)
+        else:
+            response = self._send_openai(model, request)
+        response.latency = time.perf_counter() - start
+        return response
+
+    def _send_openai(self, model: str, request: Dict) -> LLMResponse:
+        from openai import RateLimitError
+
+        kwargs = {'model': model, 'messages': request['messages']}
+        for name in ('temperature', 'max_tokens', 'response_format', 'timeout'):
+            if request.get(name) is not None:
+                kwargs[name] = request[name]
+        try:
+            completion = self.openai_client().chat.completions.create(**kwargs)
+        except RateLimitError as e:
+            raise RateLimited(str(e), _retry_after(e)) from e
+        usage = getattr(completion, 'usage', None)
+        return LLMResponse(
+            completion.choices[0].message.content or '',
+            'openai',
+            model,
+            prompt_tokens=getattr(usage, 'prompt_tokens', 0) or 0,
+            completion_tokens=getattr(usage, 'completion_tokens', 0) or 0
+        )
+
+    def _send_gemini(self, model: str, request: Dict) -> LLMResponse:
+        # Gemini takes one prompt; system and user turns are joined in order
+        prompt = "\n\n".join(message['content'] for message in request['messages'])
+        config = {}
+        if request.get('temperature') is not None:
+            config['temperature'] = request['temperature']
+        if request.get('max_tokens') is not None:
+            config['max_output_tokens'] = request['max_tokens']
+        if (request.get('response_format') or {}).get('type') == 'json_object':
+            config['response_mime_type'] = 'application/json'
+        options = {'timeout': request['timeout']} if request.get('timeout') else None
+        try:
+            result = self.gemini_model(model).generate_content(prompt, generation_config=config or None, request_options=options)
+        except Exception as e:
+            if '429' in str(e) or 'ResourceExhausted' in type(e).__name__:
+                raise RateLimited(str(e)) from e
+            raise
+        usage = getattr(result, 'usage_metadata', None)
+        return LLMResponse(
+            result.text,
+            'gemini',
+            model,
+            prompt_tokens=getattr(usage, 'prompt_token_count', 0) or 0,
+            completion_tokens=getattr(usage, 'candidates_token_count', 0) or 0
+        )
+
+    def _route(self, purpose: str) -> _Route:
+        route = self._routes.get(purpose)
+        if route is None:
+            with self._lock:
+                route = self._routes.get(purpose)
+                if route is None:
+                    route = _Route(purpose, self._route_settings.get(purpose, DEFAULT_ROUTE))
+                    self._routes[purpose] = route
+        return route
+
+    def _candidates(self, purpose: str, model: Optional[str]) -> List[str]:
+        """Primary model, then the other provider's fallback, keeping only configured providers"""
+        primary = model or LLM_CONFIG.get(purpose) or os.getenv('OPENAI_MODEL', 'gpt-4o-mini')
+        models = [primary, FALLBACK_MODELS.get(provider_for(primary))]
+        return [m for m in dict.fromkeys(models) if m and self.provider_available(provider_for(m))]
+
+    # ============================================================
+    # Accounting
+    # ============================================================
+
+    def _record(self, purpose: str, model: str, response: Optional[LLMResponse] = None,
+                error: bool = False, hedge: bool = False, hedge_won: bool = False):
+        with self._lock:
+            entry = self._stats.get((purpose, model))
+            if entry is None:
+                entry = self._stats[(purpose, model)] = {
+                    'calls': 0, 'errors': 0, 'fallbacks': 0, 'hedges': 0, 'hedge_wins': 0,
+                    'prompt_tokens': 0, 'completion_tokens': 0, 'cost': 0.0,
+                    'latencies': deque(maxlen=LATENCY_WINDOW)
+                }
+            if hedge:
+                entry['hedges'] += 1
+                entry['hedge_wins'] += hedge_won
+                return
+            if error:
+                entry['errors'] += 1
+                return
+            entry['calls'] += 1
+            entry['fallbacks'] += response.fallback
+            entry['prompt_tokens'] += response.prompt_tokens
+            entry['completion_tokens'] += response.completion_tokens
+            entry['cost'] += response.cost
+            entry['latencies'].append(response.latency)
+        app_logger.debug(
+            f"LLM {purpose} {response.provider}/{model}: {response.latency * 1000:.0f}ms, "
+            f"{response.prompt_tokens}+{response.completion_tokens} tokens, ${response.cost:.5f}"
+        )
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """
+        Per "purpose/model": calls, errors, fallbacks, hedges, tokens,
+        cost (USD) and latency p50/p95 (seconds, recent calls)
+        """
+        with self._lock:
+            snapshot = {key: dict(entry, latencies=sorted(entry['latencies'])) for key, entry in self._stats.items()}
+        stats = {}
+        for (purpose, model), entry in snapshot.items():
+            latencies = entry.pop('latencies')
+            entry['latency_p50'] = latencies[len(latencies) // 2] if latencies else 0.0
+            entry['latency_p95'] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else 0.0
+            stats[f"{purpose}/{model}"] = entry
+        return stats
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+
+    def reset_limits(self):
+        """Start every route with a full token bucket (between benchmark runs)"""
+        with self._lock:
+            self._routes.clear()
+
+
+_GEMINI_SDK: Optional[bool] = None
+
+
+def _gemini_sdk_installed() -> bool:
+    global _GEMINI_SDK
+    if _GEMINI_SDK is None:
+        try:
+            import google.generativeai  # noqa: F401
+            _GEMINI_SDK = True
+        except ImportError:
+            _GEMINI_SDK = False
+    return _GEMINI_SDK
+
+
+def _retry_after(error) -> Optional[float]:
+    """Read the Retry-After header from a 429 response, if present"""
+    try:
+        return float(error.response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+# Global gateway (clients and limits are shared by every caller in the process)
+llm_gateway = lazy_singleton("llm_gateway", LLMGateway)
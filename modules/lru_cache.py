@@ -0,0 +1,131 @@
+# Job Autopilot - In-Process LRU Cache
+# Thread-safe, size-bounded LRU used in front of Redis / SQL cache tiers
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache
+
+    Bounded by entry count and, optionally, by total payload bytes (as
+    measured by a sizeof callable). Entries can also carry a TTL; expired
+    entries are dropped lazily on access. Streamlit runs each session in
+    its own thread, so every operation takes a lock; all operations are
+    O(1) amortized.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None
+    ):
+        """
+        Args:
+            max_entries: Maximum number of entries before the least
+                recently used one is evicted
+            ttl_seconds: Entry lifetime (None = no expiry)
+            max_bytes: Optional cap on the summed sizeof() of all values
+            sizeof: Function returning a value's size in bytes; required
+                for byte accounting
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        # key -> (value, expires_at or None, size in bytes)
+        self._data: "OrderedDict[Hashable, Tuple[Any, Optional[float], int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value (and mark it recently used) or default"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at, size = entry
+                if expires_at is not None and expires_at <= time.monotonic():
+                    del self._data[key]
+                    self.bytes -= size
+                    self.expirations += 1
+                else:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        """
+        Insert or replace a value, evicting least recently used entries
+        until both the entry and byte limits hold
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl_seconds: Per-entry TTL override
+        """
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        size = self.sizeof(value) if self.sizeof else 0
+
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.bytes -= old[2]
+            self._data[key] = (value, expires_at, size)
+            self.bytes += size
+
+            while len(self._data) > self.max_entries or (
+                self.max_bytes is not None and self.bytes > self.max_bytes and len(self._data) > 1
+            ):
+                _, (_, _, evicted_size) = self._data.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove a key; returns True if it was present"""
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is None:
+                return False
+            self.bytes -= entry[2]
+            return True
+
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and (entry[1] is None or entry[1] > time.monotonic())
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_stats(self) -> Dict:
+        """Hit/miss/eviction counters and current size"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
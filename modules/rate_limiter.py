@@ -1,103 +1,312 @@
 """
 Rate Limiter for LinkedIn Automation
 每日限流控制，持久化存储
+
+状态存在 SQLite 里（data/rate_limit_state.db），每次读改写都在
+BEGIN IMMEDIATE 事务里完成，所以同时运行的 linkedin_auto_connect.py 和
+Streamlit 页面共享同一份计数，不会互相覆盖，也不会因为写到一半崩溃而损坏。
+
+并发发送用 reserve/commit：先 reserve() 占一个名额（已用 + 未过期的预留
+不超过上限才成功），发送成功后 commit() 计入已用，失败则 release() 归还。
+进程崩溃留下的预留在 RESERVATION_TTL 秒后自动失效。
 """
 import json
+import uuid
+import time
+import sqlite3
 from datetime import datetime, date
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 
+from modules.lazy_loader import lazy_singleton
 from modules.logger_config import app_logger
 
+CONNECTION = 'connection'
+NOTE = 'note'
+
+# 预留多久没有 commit/release 就视为作废（秒）
+RESERVATION_TTL = 600
+
+# 等待其他进程释放写锁的时间（秒）
+LOCK_TIMEOUT = 30
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_usage (
+    day TEXT PRIMARY KEY,
+    connections_sent INTEGER NOT NULL DEFAULT 0,
+    notes_sent INTEGER NOT NULL DEFAULT 0,
+    last_contact_id TEXT,
+    reset_time TEXT
+);
+CREATE TABLE IF NOT EXISTS reservations (
+    token TEXT PRIMARY KEY,
+    day TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    contact_id TEXT,
+    expires_at REAL NOT NULL
+);
+"""
+
+_USED_COLUMN = {CONNECTION: 'connections_sent', NOTE: 'notes_sent'}
+
+
+class Reservation:
+    """
+    一个已占用的名额
+
+    可以当 context manager 用：离开 with 时如果还没 commit 就自动 release。
+    """
+    def __init__(self, limiter: 'RateLimiter', token: str, kind: str, contact_id: Optional[str] = None):
+        self.limiter = limiter
+        self.token = token
+        self.kind = kind
+        self.contact_id = contact_id
+        self.done = False
+
+    def commit(self, contact_id: Optional[str] = None):
+        """发送成功：计入当天已用"""
+        if not self.done:
+            self.limiter.commit(self, contact_id)
+
+    def release(self):
+        """没有发送：归还名额"""
+        if not self.done:
+            self.limiter.release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
 
 class RateLimiter:
     """
-    每日限流控制，持久化存储
+    每日限流控制，持久化存储（多进程安全）
     """
-    def __init__(self, state_file: str = 'data/rate_limit_state.json'):
+    def __init__(self, state_file: str = 'data/rate_limit_state.db'):
+        """
+        Args:
+            state_file: SQLite 文件（同目录同名的旧版 .json 状态会在首次使用时导入）
+        """
         self.state_file = Path(state_file)
         self.daily_limit = 20  # LinkedIn每日连接限制
         self.note_limit = 5    # 每天带note的连接限制
-        self._load_state()
-    
-    def _load_state(self):
-        """加载限流状态"""
-        if self.state_file.exists():
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+        self._import_legacy_state()
+
+    def _connect(self) -> sqlite3.Connection:
+        # 每次操作一个短连接：不跨线程/进程共享连接
+        return sqlite3.connect(str(self.state_file), timeout=LOCK_TIMEOUT, isolation_level=None)
+
+    def _transaction(self, fn):
+        """
+        在 BEGIN IMMEDIATE 事务里执行 fn(conn)
+
+        IMMEDIATE 一开始就拿写锁，所以“读计数 - 判断 - 写入”不会和
+        其他进程交错。
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
             try:
-                with open(self.state_file, 'r', encoding='utf-8') as f:
-                    self.state = json.load(f)
-                # 检查是否是新的一天
-                if self.state.get('date') != str(date.today()):
-                    app_logger.info("New day detected, resetting rate limits")
-                    self._reset_daily()
-            except Exception as e:
-                app_logger.error(f"Failed to load rate limit state: {e}")
-                self._reset_daily()
-        else:
-            self._reset_daily()
-    
-    def _reset_daily(self):
-        """重置每日计数"""
-        self.state = {
-            'date': str(date.today()),
-            'connections_sent': 0,
-            'notes_sent': 0,
-            'last_contact_id': None,
-            'reset_time': datetime.now().isoformat()
-        }
-        self._save_state()
-        app_logger.info(f"Rate limits reset for {date.today()}")
-    
-    def _save_state(self):
-        """保存状态到文件"""
+                result = fn(conn)
+                conn.execute("COMMIT")
+                return result
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _ensure_today(conn: sqlite3.Connection) -> str:
+        """确保今天有一行计数（新的一天自动从 0 开始），返回日期"""
+        today = str(date.today())
+        inserted = conn.execute(
+            "INSERT OR IGNORE INTO daily_usage (day, reset_time) VALUES (?, ?)",
+            (today, datetime.now().isoformat())
+        ).rowcount
+        if inserted:
+            conn.execute("DELETE FROM reservations WHERE day != ?", (today,))
+            app_logger.info(f"Rate limits reset for {today}")
+        return today
+
+    def _import_legacy_state(self):
+        """导入旧版 JSON 状态（只导入今天的计数）"""
+        legacy_file = self.state_file.with_suffix('.json')
+        if not legacy_file.exists():
+            return
         try:
-            self.state_file.parent.mkdir(exist_ok=True)
-            with open(self.state_file, 'w', encoding='utf-8') as f:
-                json.dump(self.state, f, indent=2)
+            with open(legacy_file, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+            if legacy.get('date') == str(date.today()):
+                def merge(conn):
+                    today = self._ensure_today(conn)
+                    conn.execute(
+                        "UPDATE daily_usage SET connections_sent = MAX(connections_sent, ?), "
+                        "notes_sent = MAX(notes_sent, ?) WHERE day = ?",
+                        (legacy.get('connections_sent', 0), legacy.get('notes_sent', 0), today)
+                    )
+                self._transaction(merge)
+            legacy_file.rename(legacy_file.with_suffix('.json.imported'))
+            app_logger.info(f"Imported legacy rate limit state from {legacy_file}")
         except Exception as e:
-            app_logger.error(f"Failed to save rate limit state: {e}")
-    
+            app_logger.error(f"Failed to import legacy rate limit state: {e}")
+
+    def _limit(self, kind: str) -> int:
+        return self.daily_limit if kind == CONNECTION else self.note_limit
+
+    # ============================================================
+    # Reserve / commit
+    # ============================================================
+
+    def reserve(self, kind: str = CONNECTION, contact_id: Optional[str] = None,
+                ttl_seconds: float = RESERVATION_TTL) -> Optional[Reservation]:
+        """
+        占一个名额
+
+        Args:
+            kind: 'connection' 或 'note'
+            contact_id: 联系人（记录用）
+            ttl_seconds: 多久不 commit/release 自动作废
+
+        Returns:
+            Reservation；今天名额已满（含其他进程的预留）则返回 None
+        """
+        if kind not in _USED_COLUMN:
+            raise ValueError(f"Unknown rate limit kind '{kind}'")
+        token = uuid.uuid4().hex
+
+        def take(conn):
+            today = self._ensure_today(conn)
+            now = time.time()
+            conn.execute("DELETE FROM reservations WHERE expires_at < ?", (now,))
+            used = conn.execute(f"SELECT {_USED_COLUMN[kind]} FROM daily_usage WHERE day = ?", (today,)).fetchone()[0]
+            held = conn.execute(
+                "SELECT COUNT(*) FROM reservations WHERE day = ? AND kind = ?", (today, kind)
+            ).fetchone()[0]
+            if used + held >= self._limit(kind):
+                return False
+            conn.execute(
+                "INSERT INTO reservations (token, day, kind, contact_id, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (token, today, kind, contact_id, now + ttl_seconds)
+            )
+            return True
+
+        if not self._transaction(take):
+            return None
+        return Reservation(self, token, kind, contact_id)
+
+    def commit(self, reservation: Reservation, contact_id: Optional[str] = None):
+        """
+        把预留计入当天已用
+
+        预留即使已经过期也照样计入：消息已经发出去了。
+        """
+        contact_id = contact_id or reservation.contact_id
+        column = _USED_COLUMN[reservation.kind]
+
+        def consume(conn):
+            today = self._ensure_today(conn)
+            conn.execute("DELETE FROM reservations WHERE token = ?", (reservation.token,))
+            if reservation.kind == CONNECTION:
+                conn.execute(
+                    f"UPDATE daily_usage SET {column} = {column} + 1, last_contact_id = ? WHERE day = ?",
+                    (contact_id, today)
+                )
+            else:
+                conn.execute(f"UPDATE daily_usage SET {column} = {column} + 1 WHERE day = ?", (today,))
+            return conn.execute(f"SELECT {column} FROM daily_usage WHERE day = ?", (today,)).fetchone()[0]
+
+        used = self._transaction(consume)
+        reservation.done = True
+        app_logger.info(f"{reservation.kind.capitalize()} recorded: {used}/{self._limit(reservation.kind)}")
+
+    def release(self, reservation: Reservation):
+        """归还未使用的预留"""
+        self._transaction(lambda conn: conn.execute("DELETE FROM reservations WHERE token = ?", (reservation.token,)))
+        reservation.done = True
+
+    # ============================================================
+    # 兼容旧接口
+    # ============================================================
+
+    def _usage(self) -> Dict:
+        """今天的计数和有效预留数"""
+        def read(conn):
+            today = self._ensure_today(conn)
+            conn.execute("DELETE FROM reservations WHERE expires_at < ?", (time.time(),))
+            row = conn.execute(
+                "SELECT day, connections_sent, notes_sent, last_contact_id, reset_time FROM daily_usage WHERE day = ?",
+                (today,)
+            ).fetchone()
+            held = dict(conn.execute(
+                "SELECT kind, COUNT(*) FROM reservations WHERE day = ? GROUP BY kind", (today,)
+            ).fetchall())
+            return row, held
+
+        (day, connections, notes, last_contact_id, reset_time), held = self._transaction(read)
+        return {
+            'date': day,
+            'connections_sent': connections,
+            'notes_sent': notes,
+            'last_contact_id': last_contact_id,
+            'reset_time': reset_time,
+            'connections_reserved': held.get(CONNECTION, 0),
+            'notes_reserved': held.get(NOTE, 0)
+        }
+
+    @property
+    def state(self) -> Dict:
+        """当前状态快照（只读）"""
+        return self._usage()
+
     def can_send_connection(self) -> bool:
-        """检查是否可以发送连接请求"""
-        return self.state['connections_sent'] < self.daily_limit
-    
+        """检查是否可以发送连接请求（只是查看；并发发送请用 reserve）"""
+        return self.get_remaining()['connections'] > 0
+
     def can_send_note(self) -> bool:
-        """检查是否可以发送带note的连接"""
-        return self.state['notes_sent'] < self.note_limit
-    
+        """检查是否可以发送带note的连接（只是查看；并发发送请用 reserve）"""
+        return self.get_remaining()['notes'] > 0
+
     def record_connection(self, contact_id: str = None):
-        """记录一次连接请求"""
-        self.state['connections_sent'] += 1
-        self.state['last_contact_id'] = contact_id
-        self._save_state()
-        app_logger.info(f"Connection recorded: {self.state['connections_sent']}/{self.daily_limit}")
-    
+        """记录一次连接请求（已发送，不占预留）"""
+        self.commit(Reservation(self, '', CONNECTION, contact_id))
+
     def record_note(self):
-        """记录一次带note的连接"""
-        self.state['notes_sent'] += 1
-        self._save_state()
-        app_logger.info(f"Note recorded: {self.state['notes_sent']}/{self.note_limit}")
-    
+        """记录一次带note的连接（已发送，不占预留）"""
+        self.commit(Reservation(self, '', NOTE))
+
     def get_remaining(self) -> Dict[str, int]:
-        """获取剩余配额"""
+        """获取剩余配额（扣除其他进程的预留）"""
+        usage = self._usage()
         return {
-            'connections': self.daily_limit - self.state['connections_sent'],
-            'notes': self.note_limit - self.state['notes_sent']
+            'connections': max(0, self.daily_limit - usage['connections_sent'] - usage['connections_reserved']),
+            'notes': max(0, self.note_limit - usage['notes_sent'] - usage['notes_reserved'])
         }
-    
+
     def get_status(self) -> Dict:
         """获取完整状态"""
+        usage = self._usage()
         return {
-            **self.state,
-            'remaining_connections': self.daily_limit - self.state['connections_sent'],
-            'remaining_notes': self.note_limit - self.state['notes_sent'],
+            **usage,
+            'remaining_connections': max(0, self.daily_limit - usage['connections_sent'] - usage['connections_reserved']),
+            'remaining_notes': max(0, self.note_limit - usage['notes_sent'] - usage['notes_reserved']),
             'daily_limit': self.daily_limit,
             'note_limit': self.note_limit
         }
 
 
-# 全局实例
-rate_limiter = RateLimiter()
+# 全局实例（首次使用时打开状态库）
+rate_limiter = lazy_singleton("rate_limiter", RateLimiter)
 
 
 if __name__ == "__main__":
@@ -16,6 +16,7 @@ from reportlab.lib.units import inch, mm
 from reportlab.lib.colors import HexColor, white, black, lightgrey
 from reportlab.graphics.shapes import Drawing, Line
 from modules.ai_agent import ai_agent
+from modules.llm_gateway import llm_gateway
 from modules.logger_config import app_logger
 
 load_dotenv()
@@ -345,7 +346,8 @@ class ResumeGenerator:
         
         try:
             # Call GPT-4o-mini
-            response = ai_agent.client.chat.completions.create(
+            response = llm_gateway.complete(
+                "resume",
                 model=ai_agent.model,
                 messages=[
                     {"role": "system", "content": "You are an expert ATS-optimized resume writer."},
@@ -355,7 +357,7 @@ class ResumeGenerator:
                 max_tokens=2000
             )
             
-            result = response.choices[0].message.content
+            result = response.text
             
             # Extract JSON from response
             if "```json" in result:
@@ -1067,7 +1069,8 @@ CRITICAL EXTRACTION RULES:
 
 Return ONLY valid JSON, no markdown, no extra text."""
 
-            response = ai_agent.client.chat.completions.create(
+            response = llm_gateway.complete(
+                "resume",
                 model=ai_agent.model,
                 messages=[
                     {"role": "system", "content": "You are a resume parser. Extract ALL information exactly as written. Do NOT summarize or merge content. PRESERVE structure. Return ONLY valid JSON."},
@@ -1077,7 +1080,7 @@ Return ONLY valid JSON, no markdown, no extra text."""
                 max_tokens=3000
             )
             
-            result = response.choices[0].message.content
+            result = response.text
             
             # Extract JSON from response
             if "```json" in result:
@@ -1182,7 +1185,8 @@ Return JSON:"""
             RESUME_MODEL = "gpt-4o"
             app_logger.info(f"Using {RESUME_MODEL} for resume optimization (higher quality)")
             
-            response = ai_agent.client.chat.completions.create(
+            response = llm_gateway.complete(
+                "resume",
                 model=RESUME_MODEL,
                 messages=[
                     {"role": "system", "content": "You are a specialized resume writer. Your goal is to create a DENSE, KEYWORD-RICH resume that passes ATS and fills the page. NEVER change locations, dates, or company names. Return ONLY valid JSON."},
@@ -1192,7 +1196,7 @@ Return JSON:"""
                 max_tokens=3500
             )
             
-            result = response.choices[0].message.content
+            result = response.text
             
             # Extract JSON
             if "```json" in result:
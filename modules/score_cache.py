@@ -0,0 +1,98 @@
+# Job Autopilot - Job Score Cache
+# Content-addressed cache for AI job scores: in-process LRU → Redis → SQL (cache_entries)
+
+import re
+import hashlib
+from typing import Dict
+from modules.tiered_cache import TieredCache
+from modules.logger_config import app_logger
+
+
+def _normalize(value) -> str:
+    """Lowercase and collapse whitespace so cosmetic rescrape diffs hash the same"""
+    return re.sub(r"\s+", " ", str(value or "")).strip().lower()
+
+
+class ScoreCache(TieredCache):
+    """
+    Persistent cache for AIAgent.score_job results
+
+    Keys are a sha256 over the normalized job fields that go into the
+    scoring prompt, the resume summary, the prompt version and the model,
+    so a rescraped posting reuses its score while any prompt/model/resume
+    change naturally invalidates it.
+
+    Tiers (see TieredCache): in-process LRU → Redis (cache_manager) →
+    SQL cache_entries, with SQL writes applied in the background.
+    """
+
+    NAMESPACE = "score"
+    CACHE_TYPE = "job_score"
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        ttl_days: int = 30,
+        use_redis: bool = True,
+        use_sql: bool = True
+    ):
+        """
+        Args:
+            max_entries: In-process LRU size
+            ttl_days: Expiry for Redis and SQL entries
+            use_redis: Enable the Redis tier
+            use_sql: Enable the SQL cache_entries tier
+        """
+        self._use_redis = use_redis
+        super().__init__(
+            self.NAMESPACE,
+            self.CACHE_TYPE,
+            ttl_days=ttl_days,
+            max_entries=max_entries,
+            redis=self._cache_manager_redis,
+            use_sql=use_sql
+        )
+
+    @staticmethod
+    def make_key(job_data: Dict, resume_summary: str, prompt_version: str, model: str) -> str:
+        """
+        Build a stable content hash for a (job, resume, prompt, model) tuple
+
+        Args:
+            job_data: Job details dict
+            resume_summary: Candidate profile text
+            prompt_version: Scoring prompt version tag
+            model: LLM model name
+
+        Returns:
+            str: "score:<sha256 hex>"
+        """
+        parts = [
+            _normalize(job_data.get("title")),
+            _normalize(job_data.get("company")),
+            _normalize(job_data.get("location")),
+            _normalize(job_data.get("salary")),
+            _normalize(bool(job_data.get("is_remote", False))),
+            _normalize(job_data.get("description")),
+            _normalize(resume_summary),
+            prompt_version,
+            model
+        ]
+        digest = hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+        return f"{ScoreCache.NAMESPACE}:{digest}"
+
+    # ============================================================
+    # Tier access
+    # ============================================================
+
+    def _cache_manager_redis(self):
+        """Redis client from cache_manager, or None if unavailable"""
+        if not self._use_redis:
+            return None
+        try:
+            from modules.cache_manager import cache_manager
+            return None if cache_manager.demo_mode else cache_manager.redis_client
+        except Exception as e:
+            app_logger.warning(f"Score cache: Redis tier disabled: {e}")
+            self._use_redis = False
+            return None
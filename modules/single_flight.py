@@ -0,0 +1,185 @@
+# Job Autopilot - Single-Flight Request Coalescing
+# Concurrent identical requests share one in-flight call (in-process, optionally across processes via Redis)
+
+import os
+import time
+import uuid
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from modules.logger_config import app_logger
+
+# Cross-process coalescing (Redis lock) is opt-in
+DISTRIBUTED_DEFAULT = os.getenv("SINGLE_FLIGHT_DISTRIBUTED", "false").lower() == "true"
+
+# Release the lock only if we still own it
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# name -> SingleFlight, for get_single_flight_stats()
+_REGISTRY: Dict[str, "SingleFlight"] = {}
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent calls for the same key
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is in flight wait on the same Future and get its result
+    (or exception). Nothing is cached once the call finishes - pair this
+    with a cache and look it up before calling do().
+
+    Across processes: with a Redis client and a `recheck` callable, the
+    leader also takes a short Redis lock (SET NX PX). A process that finds
+    the lock held polls `recheck` (typically the shared cache lookup) until
+    the other process has published a result, and only computes itself if
+    the lock is released or expires without one.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        redis: Any = None,
+        distributed: Optional[bool] = None,
+        lock_ttl_seconds: float = 60.0,
+        wait_timeout_seconds: float = 60.0,
+        poll_interval_seconds: float = 0.1
+    ):
+        """
+        Args:
+            name: Metrics / lock key prefix (e.g. "score_job")
+            redis: Redis client, or zero-argument callable returning one (or None)
+            distributed: Use the Redis lock (default: SINGLE_FLIGHT_DISTRIBUTED env)
+            lock_ttl_seconds: Lock expiry, in case the holder dies
+            wait_timeout_seconds: Max time to wait on another process's lock
+            poll_interval_seconds: recheck() interval while waiting
+        """
+        self.name = name
+        self._redis_source = redis
+        self.distributed = DISTRIBUTED_DEFAULT if distributed is None else distributed
+        self.lock_ttl_ms = int(lock_ttl_seconds * 1000)
+        self.wait_timeout_seconds = wait_timeout_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            "calls": 0,
+            "executed": 0,
+            "coalesced": 0,         # Waited on an in-process leader
+            "remote_coalesced": 0,  # Got the result another process computed
+            "lock_timeouts": 0,
+            "errors": 0
+        }
+        _REGISTRY[name] = self
+
+    def do(self, key: Hashable, fn: Callable[[], Any], recheck: Optional[Callable[[], Any]] = None) -> Any:
+        """
+        Run fn() once per key among concurrent callers
+
+        Args:
+            key: Request identity (e.g. a cache key)
+            fn: Zero-argument function doing the expensive work
+            recheck: Optional lookup returning the result if another
+                process already produced it (None otherwise); enables the
+                Redis lock
+
+        Returns:
+            fn()'s result (shared with concurrent callers)
+        """
+        with self._lock:
+            self.stats["calls"] += 1
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = self._run_leader(key, fn, recheck)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            with self._lock:
+                self.stats["errors"] += 1
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _run_leader(self, key: Hashable, fn: Callable[[], Any], recheck: Optional[Callable[[], Any]]) -> Any:
+        redis_client = self._redis() if self.distributed and recheck is not None else None
+        if redis_client is None:
+            return self._execute(fn)
+
+        lock_key = f"single_flight:{self.name}:{key}"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.wait_timeout_seconds
+        try:
+            while not redis_client.set(lock_key, token, nx=True, px=self.lock_ttl_ms):
+                # Another process is computing it; wait for its result to land in the cache
+                result = recheck()
+                if result is not None:
+                    with self._lock:
+                        self.stats["remote_coalesced"] += 1
+                    return result
+                if time.monotonic() >= deadline:
+                    with self._lock:
+                        self.stats["lock_timeouts"] += 1
+                    app_logger.warning(f"Single-flight {self.name}: timed out waiting on remote lock, computing locally")
+                    return self._execute(fn)
+                time.sleep(self.poll_interval_seconds)
+        except Exception as e:
+            app_logger.warning(f"Single-flight {self.name}: Redis lock unavailable ({e}), computing locally")
+            return self._execute(fn)
+
+        try:
+            # The previous holder may have finished between our miss and the lock
+            result = recheck()
+            if result is not None:
+                with self._lock:
+                    self.stats["remote_coalesced"] += 1
+                return result
+            return self._execute(fn)
+        finally:
+            try:
+                redis_client.eval(_RELEASE_SCRIPT, 1, lock_key, token)
+            except Exception as e:
+                app_logger.debug(f"Single-flight {self.name}: lock release failed: {e}")
+
+    def _execute(self, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.stats["executed"] += 1
+        return fn()
+
+    def _redis(self):
+        source = self._redis_source
+        if callable(source):
+            try:
+                return source()
+            except Exception:
+                return None
+        return source
+
+    def get_stats(self) -> Dict:
+        """Call counters; 'saved' is the number of executions avoided"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["in_flight"] = len(self._inflight)
+        stats["saved"] = stats["coalesced"] + stats["remote_coalesced"]
+        return stats
+
+
+def get_single_flight_stats() -> Dict[str, Dict]:
+    """Stats for every SingleFlight created in this process"""
+    return {name: flight.get_stats() for name, flight in _REGISTRY.items()}
@@ -0,0 +1,212 @@
+# Job Autopilot - Text Matcher
+# Multi-keyword matching compiled once per keyword table: every hit (overlapping included) with positions
+
+import re
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Union
+
+# Tables at least this large are scanned with the trie automaton; smaller ones
+# with one C-level str.find sweep per keyword (faster below ~300 keywords on
+# CPython, see benchmarks/bench_text_matcher.py)
+AUTOMATON_MIN_KEYWORDS = 300
+
+# Trie node key marking "a keyword ends here" (value: the keyword as given)
+_END = ""
+
+
+class Match(NamedTuple):
+    start: int
+    end: int
+    keyword: str
+    label: Optional[str]
+
+
+class KeywordMatcher:
+    """
+    Finds every occurrence of a set of keywords
+
+    Keywords are normalized (lowercased unless case_sensitive) and labelled
+    once, and the text is lowercased once per scan (not once per keyword or
+    per hit). Hits come back in order of position, overlapping ones
+    included, like an Aho-Corasick automaton. For a case-insensitive matcher
+    the positions index into text.lower(), which has the same length as the
+    text except for a few non-ASCII characters.
+
+    Two engines, chosen by table size:
+    - Small tables: one str.find sweep per keyword. This is CPython's C
+      substring search, and it beats the automaton up to a few hundred
+      keywords.
+    - Large tables (>= AUTOMATON_MIN_KEYWORDS): the keyword trie is compiled
+      into one regex (e.g. "learn", "learning", "lead" ->
+      "lea(?:d|rn(?:ing)?)"). A zero-width lookahead tries it at each
+      position, so the cost no longer grows with the number of keywords.
+      Walking each longest hit back through the trie yields the shorter
+      keywords that are prefixes of it.
+
+    Args:
+        keywords: Keywords, or {keyword: label} to tag hits (e.g. a category)
+        case_sensitive: Match case exactly (default: case-insensitive)
+        whole_words: Only count hits not touching a letter/digit on either side
+    """
+
+    def __init__(self, keywords: Union[Iterable[str], Dict[str, str]], case_sensitive: bool = False,
+                 whole_words: bool = False):
+        labels = dict(keywords) if isinstance(keywords, dict) else dict.fromkeys(keywords)
+        self.case_sensitive = case_sensitive
+        self.whole_words = whole_words
+        # normalized key -> (keyword as given, label); first spelling wins
+        self._keys: Dict[str, tuple] = {}
+        for keyword, label in labels.items():
+            if keyword:
+                self._keys.setdefault(keyword if case_sensitive else keyword.lower(), (keyword, label))
+
+        self._regex = None
+        if len(self._keys) >= AUTOMATON_MIN_KEYWORDS:
+            self._trie: Dict = {}
+            for key in self._keys:
+                node = self._trie
+                for char in key:
+                    node = node.setdefault(char, {})
+                node[_END] = key
+            self._regex = re.compile(f"(?=({_compile(self._trie)}))")
+
+    @classmethod
+    def from_groups(cls, groups: Dict[str, Iterable[str]], **kwargs) -> "KeywordMatcher":
+        """{label: [keywords]} -> one matcher whose hits carry the label"""
+        return cls({keyword: label for label, keywords in groups.items() for keyword in keywords}, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def finditer(self, text: str) -> Iterator[Match]:
+        """Every hit in order of start position (shorter first at the same start)"""
+        if not text or not self._keys:
+            return iter(())
+        if not self.case_sensitive:
+            text = text.lower()
+        hits = self._scan_automaton(text) if self._regex is not None else self._scan_keywords(text)
+        if self.whole_words:
+            size = len(text)
+            hits = [
+                hit for hit in hits
+                if (hit[0] == 0 or not text[hit[0] - 1].isalnum()) and (hit[1] == size or not text[hit[1]].isalnum())
+            ]
+        return (Match(start, end, *self._keys[key]) for start, end, key in hits)
+
+    def _scan_keywords(self, text: str) -> List[tuple]:
+        find = text.find
+        hits = []
+        for key in self._keys:
+            start = find(key)
+            while start != -1:
+                hits.append((start, start + len(key), key))
+                start = find(key, start + 1)
+        hits.sort()
+        return hits
+
+    def _scan_automaton(self, text: str) -> List[tuple]:
+        hits = []
+        for found in self._regex.finditer(text):
+            start = found.start()
+            node = self._trie
+            for offset, char in enumerate(found.group(1), 1):
+                node = node[char]
+                key = node.get(_END)
+                if key is not None:
+                    hits.append((start, start + offset, key))
+        return hits
+
+    def find_all(self, text: str) -> List[Match]:
+        return list(self.finditer(text))
+
+    def search(self, text: str) -> Optional[Match]:
+        """First hit by position, or None"""
+        return next(self.finditer(text), None)
+
+    def contains_any(self, text: str) -> bool:
+        if not text:
+            return False
+        if self._regex is None and not self.whole_words:
+            # Short-circuits on the first keyword found
+            if not self.case_sensitive:
+                text = text.lower()
+            return any(key in text for key in self._keys)
+        return self.search(text) is not None
+
+    def keywords_in(self, text: str) -> Set[str]:
+        """Distinct keywords that occur in text"""
+        return {match.keyword for match in self.finditer(text)}
+
+    def first_hits(self, text: str) -> Dict[str, Match]:
+        """{keyword: its first hit}, in the order the keywords were given"""
+        if not text:
+            return {}
+        if self._regex is None and not self.whole_words:
+            # One find per keyword: later occurrences are never scanned
+            if not self.case_sensitive:
+                text = text.lower()
+            first = {}
+            for key, (keyword, label) in self._keys.items():
+                start = text.find(key)
+                if start != -1:
+                    first[keyword] = Match(start, start + len(key), keyword, label)
+            return first
+        first: Dict[str, Match] = {}
+        for match in self.finditer(text):
+            first.setdefault(match.keyword, match)
+        return {keyword: first[keyword] for keyword, _ in self._keys.values() if keyword in first}
+
+    def first_label(self, text: str) -> Optional[str]:
+        """
+        First label, in the order the keywords were given, that has a hit
+
+        For from_groups() tables that are checked in priority order: stops
+        at the first keyword found, like a chain of any(kw in text ...).
+        """
+        if not text:
+            return None
+        if self._regex is None and not self.whole_words:
+            if not self.case_sensitive:
+                text = text.lower()
+            for key, (_, label) in self._keys.items():
+                if key in text:
+                    return label
+            return None
+        found = self.labels_found(text)
+        return next((label for _, label in self._keys.values() if label in found), None)
+
+    def labels_found(self, text: str) -> Set[Optional[str]]:
+        """Labels with at least one hit (skips a label's other keywords once it is found)"""
+        if not text:
+            return set()
+        if self._regex is not None or self.whole_words:
+            return {match.label for match in self.finditer(text)}
+        if not self.case_sensitive:
+            text = text.lower()
+        found = set()
+        for key, (_, label) in self._keys.items():
+            if label not in found and key in text:
+                found.add(label)
+        return found
+
+    def labels_in(self, text: str) -> Dict[str, List[str]]:
+        """{label: [distinct keywords hit, in order of first hit]} for labelled keyword tables"""
+        found: Dict[str, List[str]] = {}
+        for match in self.finditer(text):
+            hits = found.setdefault(match.label, [])
+            if match.keyword not in hits:
+                hits.append(match.keyword)
+        return found
+
+
+def _compile(node: Dict) -> str:
+    """Trie -> regex; greedy optional tails so the longest keyword wins"""
+    branches = []
+    for char in sorted(key for key in node if key != _END):
+        branches.append(re.escape(char) + _compile(node[char]))
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    if _END in node:
+        # A keyword also ends here: the rest is optional (tried first, longest wins)
+        return f"(?:{body})?"
+    return body
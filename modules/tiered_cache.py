@@ -0,0 +1,464 @@
+# Job Autopilot - Tiered Cache
+# In-process LRU (L1) → Redis (L2) → SQL cache_entries (L3), each tier optional
+
+import queue
+import atexit
+import hashlib
+import weakref
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Union
+from modules.cache_codec import CacheCodec, get_default_codec, to_json_compatible, from_json_compatible
+from modules.lru_cache import LRUCache
+from modules.logger_config import app_logger
+
+# cache_entries.cache_key is String(255); longer keys are stored hashed
+SQL_KEY_MAX_LENGTH = 255
+
+# Write-behind: entries per SQL transaction, and max queued writes before dropping
+WRITE_BEHIND_BATCH_SIZE = 200
+WRITE_BEHIND_MAX_QUEUE = 10000
+
+# Sweeper: expired cache_entries rows deleted per statement, and seconds between sweeps
+SWEEP_BATCH_SIZE = 1000
+SWEEP_INTERVAL_SECONDS = 600
+
+
+def _sql_key(key: str) -> str:
+    """Key as stored in cache_entries (hashed if it would not fit the column)"""
+    if len(key) <= SQL_KEY_MAX_LENGTH:
+        return key
+    namespace = key.split(":", 1)[0]
+    return f"{namespace}:sha256:{hashlib.sha256(key.encode('utf-8')).hexdigest()}"
+
+
+# Every live TieredCache, so CacheManager.clear_cache can reach caches it
+# does not own (e.g. each AIAgent's ScoreCache)
+_live_caches = weakref.WeakSet()
+_live_caches_lock = threading.Lock()
+
+
+def live_tiered_caches() -> List["TieredCache"]:
+    """TieredCache instances that are still referenced somewhere"""
+    with _live_caches_lock:
+        return list(_live_caches)
+
+
+class TieredCache:
+    """
+    Read-through / write-behind cache over three optional tiers
+
+    1. In-process LRU (always on; holds encoded values so callers can't
+       mutate cached data)
+    2. Redis, TTL-based expiry
+    3. SQL cache_entries table (CacheEntry), expires_at-based expiry
+
+    Reads fall through the tiers and promote hits into the faster ones.
+    Writes go to L1 and Redis synchronously and are queued for SQL, where a
+    background thread upserts them in batches. A missing or failing tier is
+    skipped, so with Redis down the cache still works from L1 + SQL.
+
+    L1 and Redis hold CacheCodec blobs (msgpack + compression by default);
+    SQL rows hold typed JSON. Either way datetimes come back as datetimes.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        cache_type: str,
+        ttl_days: float = 7,
+        max_entries: int = 4096,
+        max_bytes: Optional[int] = 64 * 1024 * 1024,
+        redis: Union[None, Any, Callable[[], Any]] = None,
+        use_sql: bool = True,
+        codec: Optional[CacheCodec] = None
+    ):
+        """
+        Args:
+            namespace: Key prefix, used in logs and stats
+            cache_type: cache_entries.cache_type for L3 rows
+            ttl_days: Default entry lifetime
+            max_entries: L1 entry limit
+            max_bytes: L1 limit on summed serialized size
+            redis: Redis client, or a zero-argument callable returning one
+                (or None) for lazy lookup; None disables the tier
+            use_sql: Enable the SQL cache_entries tier
+            codec: Value encoding (default: get_default_codec())
+        """
+        self.namespace = namespace
+        self.cache_type = cache_type
+        self.ttl_days = ttl_days
+        self.lru = LRUCache(max_entries, ttl_seconds=ttl_days * 86400, max_bytes=max_bytes, sizeof=len)
+        self._redis_source = redis
+        self._use_sql = use_sql
+        self.codec = codec or get_default_codec()
+        self._lock = threading.Lock()
+        self.stats = {
+            "lru_hits": 0,
+            "redis_hits": 0,
+            "sql_hits": 0,
+            "misses": 0,
+            "writes": 0
+        }
+        with _live_caches_lock:
+            _live_caches.add(self)
+
+    # ============================================================
+    # Tier access
+    # ============================================================
+
+    def _redis(self):
+        """Redis client, or None if the tier is disabled/unavailable"""
+        source = self._redis_source
+        if callable(source):
+            try:
+                return source()
+            except Exception as e:
+                app_logger.warning(f"{self.namespace} cache: Redis tier disabled: {e}")
+                self._redis_source = None
+                return None
+        return source
+
+    def redis_client(self):
+        """
+        Redis client of the L2 tier (None if disabled/unavailable)
+
+        Public so helpers that coordinate on the same keys (e.g. a
+        SingleFlight) can share the connection instead of opening their own.
+        """
+        return self._redis()
+
+    def _count(self, stat: str, n: int = 1):
+        with self._lock:
+            self.stats[stat] += n
+
+    def _ttl_days(self, ttl_days: Optional[float]) -> float:
+        return self.ttl_days if ttl_days is None else ttl_days
+
+    # ============================================================
+    # Read / write
+    # ============================================================
+
+    def get(self, key: str) -> Optional[Any]:
+        """Look up one key (None on miss)"""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Look up many keys with one round trip per lower tier
+
+        Returns:
+            dict: key -> value, for hits only
+        """
+        found: Dict[str, bytes] = {}
+        missing = []
+        for key in keys:
+            data = self.lru.get(key)
+            if data is not None:
+                found[key] = data
+            else:
+                missing.append(key)
+        self._count("lru_hits", len(found))
+
+        redis_client = self._redis() if missing else None
+        if redis_client is not None:
+            try:
+                values = redis_client.mget(missing)
+                still_missing = []
+                for key, data in zip(missing, values):
+                    if data:
+                        found[key] = data
+                        self.lru.set(key, data)
+                        self._count("redis_hits")
+                    else:
+                        still_missing.append(key)
+                missing = still_missing
+            except Exception as e:
+                app_logger.warning(f"{self.namespace} cache Redis read failed: {e}")
+
+        if missing:
+            for key, (data, expires_at) in self._sql_get_many(missing).items():
+                found[key] = data
+                self.lru.set(key, data)
+                if redis_client is not None:
+                    ttl = expires_at - datetime.utcnow() if expires_at else timedelta(days=self.ttl_days)
+                    self._redis_set_many(redis_client, {key: data}, ttl)
+                self._count("sql_hits")
+            self._count("misses", len(missing) - sum(1 for key in missing if key in found))
+
+        return {key: self.codec.decode(data) for key, data in found.items()}
+
+    def set(self, key: str, value: Any, ttl_days: Optional[float] = None) -> bool:
+        """Write one value (see set_many)"""
+        return self.set_many({key: value}, ttl_days) > 0
+
+    def set_many(self, items: Dict[str, Any], ttl_days: Optional[float] = None) -> int:
+        """
+        Write values to L1 and Redis now, and queue them for SQL
+
+        Returns:
+            int: Number of values written to at least one tier
+        """
+        if not items:
+            return 0
+        ttl = timedelta(days=self._ttl_days(ttl_days))
+        serialized = {key: self.codec.encode(value) for key, value in items.items()}
+
+        for key, data in serialized.items():
+            self.lru.set(key, data, ttl_seconds=ttl.total_seconds())
+
+        redis_client = self._redis()
+        if redis_client is not None:
+            self._redis_set_many(redis_client, serialized, ttl)
+
+        if self._use_sql:
+            expires_at = datetime.utcnow() + ttl
+            writer = get_write_behind()
+            for key, data in serialized.items():
+                writer.put(_sql_key(key), data, self.codec, self.cache_type, expires_at)
+
+        self._count("writes", len(serialized))
+        return len(serialized)
+
+    def delete_local(self):
+        """Drop the in-process tier (e.g. after a namespace invalidation)"""
+        self.lru.clear()
+
+    def _redis_set_many(self, redis_client, serialized: Dict[str, bytes], ttl: timedelta):
+        if ttl.total_seconds() <= 0:
+            return
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for key, data in serialized.items():
+                pipe.setex(key, ttl, data)
+            pipe.execute()
+        except Exception as e:
+            app_logger.warning(f"{self.namespace} cache Redis write failed: {e}")
+
+    def _sql_get_many(self, keys: List[str]) -> Dict[str, tuple]:
+        """key -> (encoded value, expires_at) for unexpired cache_entries rows"""
+        if not self._use_sql:
+            return {}
+        try:
+            from modules.database import SessionLocal, CacheEntry
+            by_sql_key = {_sql_key(key): key for key in keys}
+            now = datetime.utcnow()
+            db = SessionLocal()
+            try:
+                rows = db.query(CacheEntry.cache_key, CacheEntry.cache_value, CacheEntry.expires_at).filter(
+                    CacheEntry.cache_key.in_(list(by_sql_key))
+                )
+                return {
+                    by_sql_key[sql_key]: (self.codec.encode(from_json_compatible(value)), expires_at)
+                    for sql_key, value, expires_at in rows
+                    if value is not None and (expires_at is None or expires_at > now)
+                }
+            finally:
+                db.close()
+        except Exception as e:
+            app_logger.warning(f"{self.namespace} cache SQL tier disabled: {e}")
+            self._use_sql = False
+            return {}
+
+    # ============================================================
+    # Maintenance
+    # ============================================================
+
+    def purge_sql(self, batch_size: int = SWEEP_BATCH_SIZE) -> int:
+        """Delete all of this cache's cache_entries rows in batches"""
+        if not self._use_sql:
+            return 0
+        get_write_behind().flush()
+        from modules.database import CacheEntry
+        return _delete_in_batches(CacheEntry.cache_type == self.cache_type, batch_size)
+
+    def get_stats(self) -> Dict:
+        """Hit/miss counters across all tiers"""
+        with self._lock:
+            stats = dict(self.stats)
+        hits = stats["lru_hits"] + stats["redis_hits"] + stats["sql_hits"]
+        lookups = hits + stats["misses"]
+        stats["hits"] = hits
+        stats["hit_rate"] = round(hits / lookups, 3) if lookups else 0.0
+        stats["lru"] = self.lru.get_stats()
+        return stats
+
+
+# ============================================================
+# SQL write-behind
+# ============================================================
+
+class SQLWriteBehind:
+    """
+    Background writer for cache_entries
+
+    Queued entries are upserted in batches of WRITE_BEHIND_BATCH_SIZE by
+    a daemon thread, so cache writes never wait on the database. When the
+    queue is full, new writes are dropped (it is only a cache). Pending
+    writes are flushed at interpreter exit.
+    """
+
+    def __init__(self, batch_size: int = WRITE_BEHIND_BATCH_SIZE, max_queue: int = WRITE_BEHIND_MAX_QUEUE):
+        self.batch_size = batch_size
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def put(self, sql_key: str, data: bytes, codec: CacheCodec, cache_type: str, expires_at: datetime):
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((sql_key, data, codec, cache_type, expires_at))
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self):
+        """Block until every queued write has been applied"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="cache-write-behind", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+                start_cache_sweeper()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch)
+                self.written += len(batch)
+            except Exception as e:
+                self.failed += len(batch)
+                app_logger.warning(f"Cache write-behind dropped {len(batch)} entries: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    @staticmethod
+    def _write(batch: List[tuple]):
+        from modules.database import SessionLocal, CacheEntry
+
+        # Last write wins within a batch
+        latest = {sql_key: (data, codec, cache_type, expires_at) for sql_key, data, codec, cache_type, expires_at in batch}
+        db = SessionLocal()
+        try:
+            existing = {
+                entry.cache_key: entry
+                for entry in db.query(CacheEntry).filter(CacheEntry.cache_key.in_(list(latest)))
+            }
+            for sql_key, (data, codec, cache_type, expires_at) in latest.items():
+                value = to_json_compatible(codec.decode(data))
+                entry = existing.get(sql_key)
+                if entry is None:
+                    db.add(CacheEntry(cache_key=sql_key, cache_value=value, cache_type=cache_type, expires_at=expires_at))
+                else:
+                    entry.cache_value = value
+                    entry.cache_type = cache_type
+                    entry.expires_at = expires_at
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+_write_behind: Optional[SQLWriteBehind] = None
+_write_behind_lock = threading.Lock()
+
+
+def get_write_behind() -> SQLWriteBehind:
+    """Process-wide write-behind queue"""
+    global _write_behind
+    if _write_behind is None:
+        with _write_behind_lock:
+            if _write_behind is None:
+                _write_behind = SQLWriteBehind()
+    return _write_behind
+
+
+# ============================================================
+# Expired-row sweeper
+# ============================================================
+
+def _delete_in_batches(condition, batch_size: int) -> int:
+    """Delete cache_entries rows matching condition, batch_size ids per statement"""
+    from modules.database import SessionLocal, CacheEntry
+
+    deleted = 0
+    db = SessionLocal()
+    try:
+        while True:
+            ids = [row_id for (row_id,) in db.query(CacheEntry.id).filter(condition).limit(batch_size)]
+            if not ids:
+                break
+            db.query(CacheEntry).filter(CacheEntry.id.in_(ids)).delete(synchronize_session=False)
+            db.commit()
+            deleted += len(ids)
+            if len(ids) < batch_size:
+                break
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    return deleted
+
+
+def purge_expired_cache_entries(batch_size: int = SWEEP_BATCH_SIZE) -> int:
+    """
+    Delete expired cache_entries rows in batches (uses the expires_at index)
+
+    Returns:
+        int: Number of rows deleted
+    """
+    from modules.database import CacheEntry
+    return _delete_in_batches(CacheEntry.expires_at < datetime.utcnow(), batch_size)
+
+
+class CacheSweeper(threading.Thread):
+    """Daemon thread that runs purge_expired_cache_entries periodically"""
+
+    def __init__(self, interval_seconds: float = SWEEP_INTERVAL_SECONDS, batch_size: int = SWEEP_BATCH_SIZE):
+        super().__init__(name="cache-sweeper", daemon=True)
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval_seconds):
+            try:
+                deleted = purge_expired_cache_entries(self.batch_size)
+                if deleted:
+                    app_logger.info(f"Cache sweeper purged {deleted} expired SQL cache entries")
+            except Exception as e:
+                app_logger.warning(f"Cache sweeper failed: {e}")
+
+    def stop(self):
+        self._stop_event.set()
+
+
+_sweeper: Optional[CacheSweeper] = None
+
+
+def start_cache_sweeper(interval_seconds: float = SWEEP_INTERVAL_SECONDS) -> CacheSweeper:
+    """Start the process-wide sweeper once (called when the SQL tier is first written)"""
+    global _sweeper
+    with _write_behind_lock:
+        if _sweeper is None:
+            _sweeper = CacheSweeper(interval_seconds)
+            _sweeper.start()
+    return _sweeper
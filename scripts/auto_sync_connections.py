@@ -107,9 +107,10 @@ class ConnectionSyncer:
                     
                     # Detect new connections (not in Memory)
                     page_new = 0
+                    in_memory = self.memory.contacted_ids([conn.get('linkedin_url', '') for conn in unique_connections])
                     for conn in unique_connections:
                         url = conn.get('linkedin_url', '')
-                        if not self.memory.has_contacted(url):
+                        if url not in in_memory:
                             all_connections.append(conn)
                             
                             # Check if truly new (not in existing_urls)
@@ -199,13 +200,21 @@ class ConnectionSyncer:
                 # Save to memory
                 print(f"\n💾 Saving {len(all_connections)} connections to memory...")
                 
-                for conn in all_connections:
-                    contact_id = conn.get('linkedin_url', conn.get('name', ''))
-                    self.memory.save_contact(contact_id, {
+                imported_at = datetime.now().isoformat()
+                self.memory.reset_embedding_stats()
+                self.memory.save_contacts({
+                    conn.get('linkedin_url', conn.get('name', '')): {
                         **conn,
                         'status': 'connected',
-                        'imported_at': datetime.now().isoformat()
-                    })
+                        'imported_at': imported_at
+                    }
+                    for conn in all_connections
+                })
+                embedding_stats = self.memory.get_embedding_stats()
+                if embedding_stats:
+                    print(f"   🧠 Embedding cache: {embedding_stats['hits']} hits / {embedding_stats['misses']} misses "
+                          f"({embedding_stats['hit_rate']:.0%}), {embedding_stats['embeddings_avoided']} embeddings avoided, "
+                          f"{embedding_stats.get('provider_requests', 0)} API requests made")
                 
                 # Generate report
                 self._generate_report(
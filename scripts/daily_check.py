@@ -91,13 +91,14 @@ class DailyChecker:
                 # Get contacts from memory that are pending
                 pending_contacts = self.memory.get_pending_contacts()
                 
-                accepted_count = 0
-                for contact_id in pending_contacts:
-                    # If not in pending invites, it was accepted (or withdrawn)
-                    if not self._is_in_pending(contact_id, pending_invites):
-                        self.memory.update_contact_status(contact_id, 'accepted')
-                        accepted_count += 1
-                        print(f"   ✅ Connection accepted: {contact_id[:50]}...")
+                # If not in pending invites, it was accepted (or withdrawn)
+                accepted_ids = [
+                    contact_id for contact_id in pending_contacts
+                    if not self._is_in_pending(contact_id, pending_invites)
+                ]
+                accepted_count = self.memory.update_contact_statuses(accepted_ids, 'accepted')
+                for contact_id in accepted_ids:
+                    print(f"   ✅ Connection accepted: {contact_id[:50]}...")
                 
                 print(f"\n   {accepted_count} new connections accepted!")
                 
@@ -178,12 +179,13 @@ class DailyChecker:
     def _generate_stats(self) -> Dict:
         """Generate statistics from memory"""
         try:
-            all_contacts = self.memory.get_all_contacts()
+            # One indexed GROUP BY instead of loading every contact
+            counts = self.memory.get_status_counts()
             
-            total = len(all_contacts)
-            pending = sum(1 for c in all_contacts if c.get('status') == 'pending')
-            accepted = sum(1 for c in all_contacts if c.get('status') == 'accepted')
-            declined = sum(1 for c in all_contacts if c.get('status') in ['declined', 'withdrawn'])
+            total = sum(counts.values())
+            pending = counts.get('pending', 0)
+            accepted = counts.get('accepted', 0)
+            declined = counts.get('declined', 0) + counts.get('withdrawn', 0)
             
             return {
                 'total_sent': total,
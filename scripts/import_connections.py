@@ -92,10 +92,10 @@ class ConnectionImporter:
                             unique_connections.append(conn)
                     
                     # Filter out already imported
-                    new_connections = []
-                    for conn in unique_connections:
-                        if not self.memory.has_contacted(conn.get('linkedin_url', '')):
-                            new_connections.append(conn)
+                    imported = self.memory.contacted_ids([conn.get('linkedin_url', '') for conn in unique_connections])
+                    new_connections = [
+                        conn for conn in unique_connections if conn.get('linkedin_url', '') not in imported
+                    ]
                     
                     print(f"   Parsed {len(connections)} total, {len(unique_connections)} unique, {len(new_connections)} new")
                     print(f"   📊 Total seen so far: {len(seen_urls)} unique contacts")
@@ -127,13 +127,21 @@ class ConnectionImporter:
                 # Save to memory
                 print(f"\n💾 Saving {len(all_connections)} connections to memory...")
                 
-                for conn in all_connections:
-                    contact_id = conn.get('linkedin_url', conn.get('name', ''))
-                    self.memory.save_contact(contact_id, {
+                imported_at = datetime.now().isoformat()
+                self.memory.reset_embedding_stats()
+                self.memory.save_contacts({
+                    conn.get('linkedin_url', conn.get('name', '')): {
                         **conn,
                         'status': 'connected',
-                        'imported_at': datetime.now().isoformat()
-                    })
+                        'imported_at': imported_at
+                    }
+                    for conn in all_connections
+                })
+                embedding_stats = self.memory.get_embedding_stats()
+                if embedding_stats:
+                    print(f"   🧠 Embedding cache: {embedding_stats['hits']} hits / {embedding_stats['misses']} misses "
+                          f"({embedding_stats['hit_rate']:.0%}), {embedding_stats['embeddings_avoided']} embeddings avoided, "
+                          f"{embedding_stats.get('provider_requests', 0)} API requests made")
                 
                 print(f"\n✅ Imported {len(all_connections)} connections!")
                 print("=" * 60)
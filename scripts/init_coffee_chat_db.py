@@ -46,7 +46,10 @@ def init_database():
         inspector = inspect(engine)
         new_tables = inspector.get_table_names()
         
-        coffee_chat_tables = ['user_profiles', 'coffee_chat_contacts', 'coffee_chat_interactions']
+        coffee_chat_tables = [
+            'user_profiles', 'coffee_chat_contacts', 'coffee_chat_interactions',
+            'memory_contacts', 'memory_search_history', 'memory_counters'
+        ]
         
         print("\n✅ Database tables created successfully!")
         print("\nCreated tables:")
@@ -5,14 +5,18 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from modules.database import init_db, DATABASE_URL, DEMO_MODE
+from modules import database
+from modules.database import init_db, DATABASE_URL
 from modules.logger_config import app_logger
 
 print("=" * 60)
 print("Job Autopilot - Database Initialization")
 print("=" * 60)
 
-if DEMO_MODE:
+# Build the engine now so DEMO_MODE reflects any in-memory fallback
+database.engine.get()
+
+if database.DEMO_MODE:
     print("\n⚠️  WARNING: Running in DEMO mode (SQLite in-memory)")
     print("   DATABASE_URL not configured in .env file")
     print("   Data will be lost when application restarts!")
@@ -22,7 +22,9 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from modules.logger_config import app_logger
 from modules.coffee_chat_agents import ContactRankerAgent, ScamDetectionAgent, PersonalizationAgent
 from modules.coffee_chat_memory import CoffeeChatMemory
-from modules.rate_limiter import RateLimiter
+from modules.contacted_index import contact_key
+from modules.contact_rules import scam_stage_stats
+from modules.rate_limiter import RateLimiter, CONNECTION, NOTE
 from modules.checkpoint import Checkpoint
 
 # Try to import new Phase 2+ modules
@@ -502,11 +504,11 @@ class LinkedInAutoConnect:
         """
         stats = {'sent': 0, 'failed': 0, 'skipped': 0, 'filtered': 0}
         
-        # Filter already contacted
+        # Filter already contacted (one bulk ContactedIndex lookup)
+        contacted = self.memory.contacted_ids([contact_key(contact) for contact in contacts])
         new_contacts = []
         for contact in contacts:
-            contact_id = contact.get('linkedin_url', contact.get('name', ''))
-            if self.memory.has_contacted(contact_id):
+            if contact_key(contact) in contacted:
                 stats['skipped'] += 1
                 print(f"   ⏭️ Skipping {contact.get('name')} (already contacted)")
             else:
@@ -519,6 +521,7 @@ class LinkedInAutoConnect:
         
         # Scam detection
         safe_contacts = []
+        scam_before = scam_stage_stats.snapshot()
         for contact in new_contacts:
             result = self.scam_detector.analyze_profile(contact)
             if result['is_safe']:
@@ -527,6 +530,7 @@ class LinkedInAutoConnect:
                 stats['filtered'] += 1
                 print(f"   🛡️ Filtered {contact.get('name')} (risk: {result['risk_score']})")
         
+        scam_stage_stats.log_since(scam_before, label=f"batch of {len(new_contacts)}")
         print(f"   {len(safe_contacts)} passed scam check")
         
         if not safe_contacts:
@@ -554,8 +558,9 @@ class LinkedInAutoConnect:
         while stats['sent'] < limit and attempts < max_attempts:
             attempts += 1
             
-            # Check rate limit
-            if not self.rate_limiter.can_send_connection():
+            # Reserve a slot (shared with any other process sending today)
+            connection_slot = self.rate_limiter.reserve(CONNECTION)
+            if connection_slot is None:
                 print(f"   ⚠️ Daily limit reached, stopping")
                 break
             
@@ -580,6 +585,7 @@ class LinkedInAutoConnect:
                         break
             
             if not current_contact:
+                connection_slot.release()
                 print(f"   ⚠️ No more contacts found on current page with Connect buttons")
                 break
             
@@ -588,13 +594,14 @@ class LinkedInAutoConnect:
             
             print(f"   Score: {contact.get('priority_score', 0):.1f}/100")
             
+            note_slot = None
             try:
                 # Generate note if enabled and quota available
                 note = None
-                if send_note and self.rate_limiter.can_send_note():
-                    note = await self._generate_note(contact)
-                    if note:
-                        self.rate_limiter.record_note()
+                if send_note:
+                    note_slot = self.rate_limiter.reserve(NOTE)
+                    if note_slot:
+                        note = await self._generate_note(contact)
                 
                 # Send connection
                 success = await self._send_connection(contact, note)
@@ -602,7 +609,9 @@ class LinkedInAutoConnect:
                 if success:
                     print(f"   ✅ Connection sent!")
                     stats['sent'] += 1
-                    self.rate_limiter.record_connection(contact.get('linkedin_url'))
+                    connection_slot.commit(contact.get('linkedin_url'))
+                    if note_slot and note:
+                        note_slot.commit()
                     
                     # Save to memory
                     contact_id = contact.get('linkedin_url', contact.get('name', ''))
@@ -630,6 +639,11 @@ class LinkedInAutoConnect:
                 print(f"   ❌ Error: {e}")
                 stats['failed'] += 1
                 processed_contacts.add(contact.get('name', ''))  # Skip this contact
+            finally:
+                # Unsent (or failed) slots go back to the pool
+                connection_slot.release()
+                if note_slot:
+                    note_slot.release()
         
         return stats
     
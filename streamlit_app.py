@@ -14,6 +14,7 @@ except ImportError:
     pass
 # -----------------------------------------------
 
+import heapq
 import subprocess
 import threading
 import time
@@ -443,29 +444,33 @@ if page == "🔍 Job Search":
                     ]
                     st.success(f"✅ Found {len(st.session_state.jobs)} jobs (DEMO MODE)")
                 else:
-                    # Real mode: use job scraper
+                    # Real mode: stream the dataset, scoring and saving chunk by chunk
                     scraper = JobScraper()
-                    jobs = scraper.scrape_jobs(
+                    resume_summary = "EdTech and L&D professional with AI/SaaS experience"
+                    top_jobs = []  # Best-scored jobs for display (bounded, like the cached view)
+                    
+                    def score_chunk(chunk):
+                        # Score jobs concurrently (results come back in input order)
+                        scores = ai_agent.score_jobs_batch(chunk, resume_summary, concurrency=8)
+                        for job, score_data in zip(chunk, scores):
+                            job['match_score'] = score_data['score']
+                            job['match_reasoning'] = score_data['reasoning']
+                        top_jobs[:] = heapq.nlargest(100, top_jobs + chunk, key=lambda x: x.get('match_score', 0))
+                    
+                    result = scraper.scrape_and_save(
+                        process_chunk=score_chunk,
                         keywords=keywords,
                         location=location,
                         max_jobs=max_jobs,
                         job_type=job_type,
                         remote=remote
                     )
+                    streamlit_logger.info(f"Saved {result['saved']} jobs to database")
                     
-                    # Score each job
-                    resume_summary = "EdTech and L&D professional with AI/SaaS experience"
-                    for job in jobs:
-                        score_data = ai_agent.score_job(job, resume_summary)
-                        job['match_score'] = score_data['score']
-                        job['match_reasoning'] = score_data['reasoning']
-                    
-                    # Save to database
-                    saved_count = scraper.save_jobs_to_db(jobs)
-                    streamlit_logger.info(f"Saved {saved_count} jobs to database")
-                    
-                    st.session_state.jobs = sorted(jobs, key=lambda x: x.get('match_score', 0), reverse=True)
-                    st.success(f"✅ Found and scored {len(jobs)} jobs! ({saved_count} saved to database)")
+                    st.session_state.jobs = top_jobs
+                    if result.get('error'):
+                        st.warning(f"⚠️ Scrape stopped early: {result['error']}")
+                    st.success(f"✅ Found and scored {result['jobs']} jobs! ({result['saved']} saved to database)")
                 
                 streamlit_logger.info(f"Job search completed: {keywords}")
             
@@ -500,8 +505,8 @@ if page == "🔍 Job Search":
                     
                     # Re-score with AI
                     resume_summary = "EdTech and L&D professional with AI/SaaS experience"
-                    for job in jobs:
-                        score_data = ai_agent.score_job(job, resume_summary)
+                    scores = ai_agent.score_jobs_batch(jobs, resume_summary, concurrency=8)
+                    for job, score_data in zip(jobs, scores):
                         job['match_score'] = score_data['score']
                         job['match_reasoning'] = score_data['reasoning']
                     
@@ -0,0 +1,91 @@
+"""
+Agent Pipeline Tests
+process_contacts with stubbed LLM agents: bounded stage concurrency,
+error isolation and result ordering
+"""
+import os
+import sys
+import time
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.agent_manager import AgentManager
+from modules.coffee_chat_agents import ContactRankerAgent, ScamDetectionAgent
+from modules.data_validator import DataValidator
+from modules.hidden_job_detector import HiddenJobDetector
+
+
+class TrackingPersonalizer:
+    model = "stub-model"
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def generate_connection_message(self, contact):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.05)
+        with self.lock:
+            self.active -= 1
+        if contact['name'] == 'Broken':
+            raise RuntimeError("LLM down")
+        return f"Hi {contact['name']}"
+
+
+class PassThroughReviewer:
+    model = "stub-model"
+
+    def review_message(self, message, contact):
+        return message
+
+
+class NoMemory:
+    def contacted_ids(self, contact_ids):
+        return set()
+
+
+class NoteQuota:
+    def can_send_note(self):
+        return True
+
+
+def make_manager(concurrency):
+    """Real local filters, stubbed LLM agents"""
+    manager = AgentManager.__new__(AgentManager)
+    manager.validator = DataValidator()
+    manager.scam_detector = ScamDetectionAgent()
+    manager.ranker = ContactRankerAgent()
+    manager.hidden_job_detector = HiddenJobDetector()
+    manager.personalizer = TrackingPersonalizer()
+    manager.reviewer = PassThroughReviewer()
+    manager.memory = NoMemory()
+    manager.rate_limiter = NoteQuota()
+    manager.note_concurrency = manager.review_concurrency = concurrency
+    return manager
+
+
+def contact(name, alumni=True):
+    return {
+        'name': name, 'company': 'Shopify', 'title': 'Learning Designer',
+        'connection_degree': '2nd', 'is_alumni': alumni, 'domain_verified': True,
+        'mutual_connections': list(range(10)), 'connections_count': 400,
+        'work_history': ['a', 'b'], 'linkedin_url': f'https://www.linkedin.com/in/{name}'
+    }
+
+
+def test_notes_run_concurrently_within_stage_limit():
+    manager = make_manager(concurrency=3)
+    contacts = [contact(f'person{i}') for i in range(9)] + [contact('Broken'), contact('low', alumni=False)]
+
+    results = manager.process_contacts_sync(contacts)
+
+    assert manager.personalizer.peak == 3
+    names = [c['name'] for c in results]
+    # The failing note drops its contact; low scorers keep their place at the end without a note
+    assert 'Broken' not in names
+    assert names[-1] == 'low' and 'note' not in results[-1]
+    assert all(c['note'].startswith(f"Hi {c['name']}") for c in results[:-1])
@@ -0,0 +1,131 @@
+"""
+ATS Scorer Tests
+Batch TF-IDF scoring against the single-pair path, and batched keyword
+extraction/caching, with a blank spaCy pipeline standing in for
+en_core_web_sm (no model download needed)
+"""
+import os
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+spacy = pytest.importorskip("spacy")
+pytest.importorskip("sklearn")
+
+from spacy.language import Language
+
+from modules.ats_scorer import ATSScorer
+
+RESUME = (
+    "Instructional designer building elearning in Articulate Storyline and managing the LMS "
+    "for onboarding programs"
+)
+JDS = [
+    RESUME,
+    "Instructional designer to build elearning with Storyline and run LMS onboarding",
+    "Senior Python backend engineer, Kubernetes, Postgres",
+    "Learning experience designer for compliance training programs and LMS administration",
+]
+
+
+@Language.component("test_noun_tagger")
+def _noun_tagger(doc):
+    """Tags every alphabetic token as a noun (stands in for the statistical tagger)"""
+    for token in doc:
+        if token.is_alpha:
+            token.pos_ = "NOUN"
+    return doc
+
+
+@pytest.fixture
+def scorer(monkeypatch):
+    def load(name, disable=()):
+        nlp = spacy.blank("en")
+        nlp.add_pipe("test_noun_tagger")
+        return nlp
+
+    monkeypatch.setattr(spacy, "load", load)
+    return ATSScorer(spill_to_redis=False)
+
+
+def test_batch_scores_track_single_pair_scores(scorer):
+    batch = scorer.score_resume_against_jobs(RESUME, JDS)
+    single = [scorer.score_resume(RESUME, jd)["score"] for jd in JDS]
+    scores = [result["score"] for result in batch]
+
+    # IDF comes from the JD corpus in the batch path, so scores are close, not equal
+    assert scores[0] == single[0] == 100
+    assert all(abs(a - b) <= 5 for a, b in zip(scores, single))
+    assert sorted(range(len(JDS)), key=scores.__getitem__) == sorted(range(len(JDS)), key=single.__getitem__)
+
+
+def test_batch_keywords_match_single_pair_results(scorer):
+    batch = scorer.score_resume_against_jobs(RESUME, JDS, include_keywords=True)
+    for jd, result in zip(JDS, batch):
+        single = scorer.score_resume(RESUME, jd)
+        assert result["missing_keywords"] == single["missing_keywords"]
+        assert result["missing_count"] == single["missing_count"]
+        assert result["suggestions"] == single["suggestions"]
+
+
+@pytest.mark.parametrize("include_keywords", [False, True])
+def test_empty_vocabulary_keeps_result_shape(scorer, include_keywords):
+    results = scorer.score_resume_against_jobs(RESUME, ["the and of", ""], include_keywords=include_keywords)
+
+    assert [result["score"] for result in results] == [0, 0]
+    if include_keywords:
+        for result in results:
+            assert set(result) == {"score", "missing_keywords", "missing_count", "suggestions"}
+            assert result["missing_keywords"] == [] and result["missing_count"] == 0
+
+
+def test_no_job_descriptions(scorer):
+    assert scorer.score_resume_against_jobs(RESUME, []) == []
+
+
+def test_keyword_batch_matches_per_text_extraction(scorer):
+    texts = [RESUME, JDS[2], "Workday HRIS analyst, Workday reporting", RESUME]
+    batch = scorer._extract_keywords_batch(texts)
+
+    fresh = ATSScorer(spill_to_redis=False)
+    for text, keywords in zip(texts, batch):
+        assert sorted(keywords.elements()) == sorted(fresh._extract_keywords(text))
+    assert batch[2]["workday"] == 2
+
+
+def test_keyword_cache_parses_each_text_once(scorer, monkeypatch):
+    parsed = []
+    pipe = scorer.nlp.pipe
+
+    def counting_pipe(texts, **kwargs):
+        texts = list(texts)
+        parsed.extend(texts)
+        return pipe(texts, **kwargs)
+
+    monkeypatch.setattr(scorer.nlp, "pipe", counting_pipe)
+
+    first = scorer._extract_keywords_batch([JDS[1], JDS[2], JDS[1]])
+    assert len(parsed) == 2  # Duplicate in the batch parsed once
+    assert first[0] == first[2]
+
+    again = scorer._extract_keywords_batch([JDS[2], JDS[1], RESUME])
+    assert parsed[2:] == [RESUME.lower()]  # Cached JDs are not parsed again
+    assert again[:2] == [first[1], first[0]]
+
+
+def test_keyword_gap_ranks_by_jd_frequency():
+    scorer = ATSScorer.__new__(ATSScorer)  # _keyword_gap needs no spaCy/TF-IDF state
+    jd = Counter({"storyline": 1, "lms": 3, "onboarding": 1, "workday": 2, "python": 1})
+    resume = Counter({"python": 4})
+    gap = scorer._keyword_gap(jd, resume)
+
+    # Ties keep JD order; missing_count counts every missing keyword, not just the top 10
+    assert gap["missing_keywords"] == ["lms", "workday", "storyline", "onboarding"]
+    assert gap["missing_count"] == 4
+
+    many = Counter({f"skill{i}": 1 for i in range(12)})
+    gap = scorer._keyword_gap(many, Counter())
+    assert len(gap["missing_keywords"]) == 10 and gap["missing_count"] == 12
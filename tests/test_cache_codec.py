@@ -0,0 +1,56 @@
+"""
+Cache Codec Tests
+Typed round trips, compression threshold and legacy JSON compatibility
+"""
+import os
+import sys
+import json
+from datetime import date, datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from modules.cache_codec import CacheCodec, from_json_compatible, to_json_compatible
+
+JOB = {
+    "title": "Instructional Designer",
+    "posted_date": datetime(2026, 10, 10, 12, 0, tzinfo=timezone.utc),
+    "scraped_at": datetime(2026, 10, 11, 8, 30),
+    "deadline": date(2026, 11, 1),
+    "is_remote": True,
+    "rating": None,
+    "tags": ["lms", "storyline"],
+    "description": "Design eLearning with Articulate Storyline. " * 100,
+}
+
+
+@pytest.mark.parametrize("serializer", ["msgpack", "json"])
+@pytest.mark.parametrize("compression", [None, "zlib"])
+def test_round_trip_keeps_types(serializer, compression):
+    codec = CacheCodec(serializer=serializer, compression=compression)
+    assert codec.decode(codec.encode(JOB)) == JOB
+
+
+def test_compresses_only_above_threshold():
+    codec = CacheCodec(compression="zlib", compress_threshold=1024)
+    small = codec.encode({"title": "Short"})
+    large = codec.encode(JOB)
+
+    assert small[0] & 0x03 == 0
+    assert large[0] & 0x03 == 1
+    assert len(large) < len(json.dumps(JOB, default=str)) / 5
+
+
+def test_decodes_blobs_from_other_configurations_and_legacy_json():
+    blob = CacheCodec(serializer="json", compression="zlib", compress_threshold=0).encode(JOB)
+    assert CacheCodec(serializer="msgpack", compression=None).decode(blob) == JOB
+
+    legacy = json.dumps({"title": "Old", "posted_date": "2026-10-10 12:00:00"})
+    assert CacheCodec().decode(legacy) == {"title": "Old", "posted_date": "2026-10-10 12:00:00"}
+    assert CacheCodec().decode(legacy.encode("utf-8"))["title"] == "Old"
+
+
+def test_json_compatible_form_for_sql_column():
+    stored = json.loads(json.dumps(to_json_compatible(JOB)))
+    assert from_json_compatible(stored) == JOB
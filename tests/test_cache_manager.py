@@ -0,0 +1,197 @@
+"""
+Cache Manager Tests
+Batch job cache APIs against an in-process fakeredis (SQL tier off unless a
+test asks for a temporary SQLite cache_entries table)
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+fakeredis = pytest.importorskip("fakeredis")
+
+import modules.database as database
+from modules.database import Base, CacheEntry
+from modules.cache_manager import CacheManager
+
+
+@pytest.fixture(autouse=True)
+def no_sql_tier(monkeypatch):
+    monkeypatch.setenv("CACHE_SQL_TIER", "false")
+
+
+@pytest.fixture
+def sql_tier(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine, tables=[CacheEntry.__table__])
+    monkeypatch.setattr(database, "SessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setenv("CACHE_SQL_TIER", "true")
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    # One server for every CacheManager built in the test, like separate processes sharing Redis
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        "modules.cache_manager.redis.Redis",
+        lambda **kwargs: fakeredis.FakeRedis(server=server, decode_responses=kwargs["decode_responses"])
+    )
+
+
+@pytest.fixture
+def cache(fake_redis):
+    manager = CacheManager()
+    assert not manager.demo_mode
+    return manager
+
+
+def _demo_manager(monkeypatch):
+    monkeypatch.setenv("REDIS_HOST", "127.0.0.1")
+    monkeypatch.setenv("REDIS_PORT", "1")
+    manager = CacheManager()
+    assert manager.demo_mode
+    return manager
+
+
+def test_batch_job_cache_round_trip(cache):
+    jobs = {f"https://example.com/job/{i}": {"title": f"Job {i}"} for i in range(3)}
+    assert cache.cache_jobs(jobs, ttl_days=1) == 3
+
+    found = cache.get_cached_jobs(list(jobs) + ["https://example.com/missing"])
+    assert found == jobs
+    assert cache.get_cached_job("https://example.com/job/1") == {"title": "Job 1"}
+    assert 0 < cache.redis_client.ttl("job:https://example.com/job/0") <= 86400
+
+
+def test_batch_job_cache_chunks_mget(cache, monkeypatch):
+    monkeypatch.setattr("modules.cache_manager.MGET_CHUNK_SIZE", 2)
+    jobs = {f"https://example.com/job/{i}": {"title": f"Job {i}"} for i in range(5)}
+    cache.cache_jobs(jobs)
+    assert cache.get_cached_jobs(list(jobs)) == jobs
+
+
+def test_demo_mode_falls_back_to_in_process_tier(monkeypatch):
+    manager = _demo_manager(monkeypatch)
+
+    assert manager.cache_jobs({"https://example.com/job/0": {"title": "Job 0"}}) == 1
+    assert manager.get_cached_jobs(["https://example.com/job/0"]) == {"https://example.com/job/0": {"title": "Job 0"}}
+    assert manager.invalidate_namespace("job")["generation"] is None
+    assert manager.get_cached_job("https://example.com/job/0") is None
+
+
+def test_clear_cache_scans_and_unlinks_in_batches(cache, monkeypatch):
+    monkeypatch.setattr("modules.cache_manager.SCAN_BATCH_SIZE", 3)
+    cache.cache_jobs({f"https://example.com/job/{i}": {"title": f"Job {i}"} for i in range(10)})
+    cache.cache_hr_contact("EdTech Corp", {"name": "Jane"})
+
+    assert cache.clear_cache("job:*") == 10
+    assert cache.get_cached_hr_contact("EdTech Corp") == {"name": "Jane"}
+
+
+def test_invalidate_namespace_bumps_generation_and_reclaims(cache):
+    cache.cache_jobs({f"https://example.com/job/{i}": {"title": f"Job {i}"} for i in range(4)})
+    cache.cache_ats_analysis("abc", {"score": 80})
+
+    result = cache.invalidate_namespace("job")
+
+    assert result == {"namespace": "job", "generation": 1, "reclaimed": 4, "sql_reclaimed": 0}
+    assert cache.get_cached_job("https://example.com/job/0") is None
+    assert cache.get_cached_ats_analysis("abc") == {"score": 80}
+
+    cache.cache_job("https://example.com/job/0", {"title": "Fresh"})
+    assert cache.redis_client.exists("job:1:https://example.com/job/0")
+    assert cache.invalidate_namespace("job", reclaim=False)["reclaimed"] == 0
+    assert cache.reclaim_namespace("job") == 1
+
+    with pytest.raises(ValueError):
+        cache.invalidate_namespace("jobs")
+
+
+def test_clear_cache_purges_sql_tier(sql_tier, fake_redis):
+    from modules.tiered_cache import get_write_behind
+    jobs = {f"https://example.com/job/{i}": {"title": f"Job {i}"} for i in range(3)}
+    writer = CacheManager()
+    writer.cache_jobs(jobs)
+    writer.cache_hr_contact("EdTech Corp", {"name": "Jane"})
+    get_write_behind().flush()
+
+    assert writer.clear_cache("job:*") == 3
+    # A fresh process (empty L1) must not find the cleared jobs in SQL either
+    reader = CacheManager()
+    assert reader.get_cached_jobs(list(jobs)) == {}
+    assert not writer.redis_client.exists("job:https://example.com/job/0")
+    assert reader.get_cached_hr_contact("EdTech Corp") == {"name": "Jane"}
+
+
+@pytest.mark.parametrize("pattern", ["score:*", "*"])
+def test_clear_cache_reaches_score_cache(sql_tier, fake_redis, pattern):
+    from modules.score_cache import ScoreCache
+    from modules.tiered_cache import get_write_behind
+    manager = CacheManager()
+    scores = ScoreCache(use_redis=False)
+    scores.set("score:abc", {"score": 8, "reasoning": "Good match"})
+    get_write_behind().flush()
+
+    manager.clear_cache(pattern)
+    # Neither this instance's L1 nor the SQL tier (read by a fresh instance) serves it again
+    assert scores.get("score:abc") is None
+    assert ScoreCache(use_redis=False).get("score:abc") is None
+
+
+@pytest.mark.parametrize("reclaim", [True, False])
+def test_invalidate_namespace_with_sql_tier(sql_tier, fake_redis, reclaim):
+    from modules.tiered_cache import get_write_behind
+    writer = CacheManager()
+    writer.cache_job("https://example.com/job/0", {"title": "Job 0"})
+    get_write_behind().flush()
+
+    writer.invalidate_namespace("job", reclaim=reclaim)
+    assert CacheManager().get_cached_job("https://example.com/job/0") is None
+
+
+@pytest.mark.parametrize("reclaim", [True, False])
+def test_demo_mode_invalidate_purges_sql_tier(sql_tier, monkeypatch, reclaim):
+    from modules.tiered_cache import get_write_behind
+    writer = _demo_manager(monkeypatch)
+    writer.cache_job("https://example.com/job/0", {"title": "Job 0"})
+    get_write_behind().flush()
+    assert _demo_manager(monkeypatch).get_cached_job("https://example.com/job/0") == {"title": "Job 0"}
+
+    assert writer.invalidate_namespace("job", reclaim=reclaim)["sql_reclaimed"] == 1
+    assert _demo_manager(monkeypatch).get_cached_job("https://example.com/job/0") is None
+
+    writer.cache_job("https://example.com/job/1", {"title": "Job 1"})
+    get_write_behind().flush()
+    writer.clear_cache("job:*")
+    assert _demo_manager(monkeypatch).get_cached_job("https://example.com/job/1") is None
+
+
+def test_get_or_compute_coalesces_concurrent_misses(cache):
+    import time
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    release = threading.Event()
+    calls = []
+
+    def lookup():
+        calls.append(1)
+        release.wait(5)
+        return {"name": "Jane"}
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(cache.get_or_compute, "hr", "EdTech Corp ", lookup) for _ in range(4)]
+        while cache.flights["hr"].get_stats()["calls"] < 4:
+            time.sleep(0.01)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert results == [{"name": "Jane"}] * 4
+    assert calls == [1]
+    assert cache.get_cached_hr_contact("edtech corp") == {"name": "Jane"}
+    assert cache.get_or_compute("hr", "EdTech Corp", lambda: pytest.fail("cached")) == {"name": "Jane"}
+    assert cache.flights["hr"].get_stats()["saved"] == 3
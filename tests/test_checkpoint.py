@@ -0,0 +1,72 @@
+"""
+Checkpoint Tests
+Journal replay, compaction and compatibility with the old snapshot format
+"""
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import checkpoint as checkpoint_module
+from modules.checkpoint import Checkpoint
+
+
+def contacts(*ids):
+    return [{'linkedin_url': contact_id} for contact_id in ids]
+
+
+def test_marks_are_journaled_and_replayed(tmp_path):
+    path = tmp_path / 'checkpoint.json'
+    cp = Checkpoint(str(path))
+    cp.set_current_search('Shopify', 'UWO')
+    cp.set_pending_contacts(contacts('a', 'b', 'c'))
+    cp.mark_contact_processed('a')
+
+    # Nothing compacted yet: state lives in the journal only
+    assert not path.exists()
+    assert len(cp.journal_file.read_text().splitlines()) == 3
+
+    # A "crash" mid-write leaves a torn last line, which replay skips
+    with open(cp.journal_file, 'a') as f:
+        f.write('{"op": "processed", "id": "b"')
+
+    recovered = Checkpoint(str(path))
+    assert recovered.get_resume_point() == ['b', 'c']
+    assert recovered.is_contact_processed('a')
+    assert recovered.get_progress()['current_company'] == 'Shopify'
+
+    # The torn line was compacted away, so later entries append cleanly
+    recovered.mark_contact_processed('b')
+    assert Checkpoint(str(path)).get_resume_point() == ['c']
+
+
+def test_compaction_writes_snapshot_and_truncates_journal(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoint_module, 'COMPACT_EVERY', 5)
+    path = tmp_path / 'checkpoint.json'
+    cp = Checkpoint(str(path))
+    cp.set_pending_contacts(contacts(*[str(i) for i in range(10)]))
+    for i in range(6):
+        cp.mark_contact_processed(str(i))
+
+    snapshot = json.loads(path.read_text())
+    assert snapshot['processed_contacts'] == ['0', '1', '2', '3']
+    assert len(cp.journal_file.read_text().splitlines()) == 2
+
+    recovered = Checkpoint(str(path))
+    assert recovered.get_resume_point() == ['6', '7', '8', '9']
+    assert recovered.get_progress()['processed'] == 6
+
+
+def test_loads_old_snapshot_format(tmp_path):
+    path = tmp_path / 'checkpoint.json'
+    path.write_text(json.dumps({
+        'current_company': 'RBC', 'current_school': None,
+        'processed_contacts': ['x'], 'pending_contacts': ['x', 'y'],
+        'last_updated': None, 'session_start': '2025-01-01T00:00:00'
+    }, indent=2))
+
+    cp = Checkpoint(str(path))
+    assert cp.get_resume_point() == ['y']
+    cp.clear()
+    assert not Checkpoint(str(path)).has_pending_work()
@@ -0,0 +1,196 @@
+"""
+Coffee Chat Memory Tests
+Batched saves against a throwaway Chroma store and SQLite contact store,
+with a deterministic local embedder (no OpenAI calls)
+"""
+import os
+import sys
+import hashlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+pytest.importorskip("chromadb")
+
+from modules.coffee_chat_memory import CoffeeChatMemory
+from modules.contact_store import ContactStore
+from modules.embedding_provider import EmbeddingProvider, HashingEmbeddingProvider, OpenAIEmbeddingProvider
+
+
+class CountingEmbedder(EmbeddingProvider):
+    """Hash-derived vectors; records every batch it is asked to embed"""
+
+    model = "test-hash"
+    dimensions = 8
+
+    def __init__(self):
+        self.batches = []
+
+    def embed(self, texts):
+        self.batches.append(list(texts))
+        return [[b / 255 for b in hashlib.sha256(text.encode()).digest()[:self.dimensions]] for text in texts]
+
+
+def make_store(tmp_path):
+    return ContactStore(sessionmaker(bind=create_engine(f"sqlite:///{tmp_path / 'memory.db'}")))
+
+
+@pytest.fixture
+def memory(tmp_path):
+    return CoffeeChatMemory(persist_directory=str(tmp_path / "chroma"), embedder=CountingEmbedder(), store=make_store(tmp_path))
+
+
+def test_save_contacts_embeds_in_one_batch_and_skips_existing(memory):
+    memory.save_contact("c0", {"name": "Ann", "title": "Designer", "company": "Shopify"})
+    memory.embedder.batches.clear()
+
+    contacts = {f"c{i}": {"name": f"Person {i}", "title": "Designer", "company": f"Co {i % 3}"} for i in range(10)}
+    assert memory.save_contacts(contacts) == 9
+
+    # One provider call for the 9 new contacts; 3 distinct profile texts
+    assert len(memory.embedder.batches) == 1
+    assert len(memory.embedder.batches[0]) == 3
+    assert memory.contacts_collection.count() == 10
+    assert memory.get_stats()["total_contacts"] == 10
+    assert memory.store.get_contacts(["c0"])["c0"]["name"] == "Ann"
+
+    assert memory.save_contacts({"c0": {"name": "Ann B", "title": "Lead"}}, upsert=True) == 1
+    assert memory.store.get_contacts(["c0"])["c0"]["name"] == "Ann B"
+    assert memory.contacts_collection.get(ids=["c0"])["documents"] == ["Lead at . "]
+
+
+def test_save_messages_bulk(memory):
+    saved = memory.save_messages([
+        {"contact_id": "c1", "message_text": "Hi there", "message_type": "connection_request"},
+        {"contact_id": "c1", "message_text": "Following up", "message_type": "coffee_chat", "response_status": "accepted"},
+    ])
+
+    assert saved == 2
+    assert len(memory.embedder.batches) == 1
+    stored = memory.messages_collection.get(where={"response_status": "accepted"})
+    assert stored["documents"] == ["Following up"]
+    assert len(set(memory.messages_collection.get()["ids"])) == 2
+    stats = memory.get_stats()
+    assert stats["total_messages"] == 2 and stats["accepted_connections"] == 1
+
+
+class _Response:
+    def __init__(self, texts):
+        # Returned out of order on purpose; items carry their index
+        self.data = [type("Item", (), {"index": i, "embedding": [float(len(t))]})() for i, t in reversed(list(enumerate(texts)))]
+
+
+class _FakeEmbeddings:
+    def __init__(self):
+        self.calls = []
+
+    def create(self, model, input):
+        self.calls.append(list(input))
+        return _Response(input)
+
+
+def test_openai_provider_batches_requests_in_order():
+    fake = _FakeEmbeddings()
+    client = type("Client", (), {"embeddings": fake})()
+    provider = OpenAIEmbeddingProvider(client=client, batch_size=4, max_concurrency=3, requests_per_minute=60000)
+
+    texts = ["x" * n for n in range(1, 11)]
+    assert provider.embed(texts) == [[float(n)] for n in range(1, 11)]
+    assert sorted(len(call) for call in fake.calls) == [2, 4, 4]
+    assert provider.requests_made == 3
+
+
+class FailingEmbedder(CountingEmbedder):
+    def embed(self, texts):
+        raise RuntimeError("API down")
+
+
+def test_embedding_failure_skips_vectors_instead_of_storing_zero_vectors(tmp_path):
+    memory = CoffeeChatMemory(persist_directory=str(tmp_path / "chroma"), embedder=FailingEmbedder(), store=make_store(tmp_path))
+
+    memory.save_contact("c1", {"name": "Ann"})
+    memory.save_message("c1", "Hi Ann", "connection_request")
+
+    # Still recorded as contacted, but nothing was written to the vector index
+    assert memory.has_contacted("c1")
+    assert memory.contacts_collection.count() == 0
+    assert memory.messages_collection.count() == 0
+    assert memory.find_similar_contacts({"title": "Designer"}) == []
+
+
+def test_status_update_does_not_re_embed(memory):
+    memory.save_contact("c1", {"name": "Ann", "title": "Designer"})
+    memory.embedder.batches.clear()
+
+    memory.update_contact_status("c1", "accepted")
+
+    assert memory.embedder.batches == []
+    assert memory.get_contacts_by_status("accepted")[0]["id"] == "c1"
+    assert memory.get_pending_contacts() == []
+    assert memory.get_status_counts() == {"accepted": 1}
+    assert memory.find_similar_contacts({"title": "Designer"}, limit=1)[0]["metadata"]["relationship_status"] == "accepted"
+
+
+def test_each_backend_gets_its_own_collections(tmp_path):
+    path = str(tmp_path / "chroma")
+    local = CoffeeChatMemory(persist_directory=path, embedder=HashingEmbeddingProvider(dimensions=64), store=make_store(tmp_path))
+    local.save_contact("c1", {"name": "Ann", "title": "Instructional Designer", "company": "Shopify"})
+
+    other = CoffeeChatMemory(persist_directory=path, embedder=CountingEmbedder(), store=make_store(tmp_path))
+
+    assert local.contacts_collection.name == "coffee_chat_contacts__local-hash-tfidf-64"
+    assert other.contacts_collection.count() == 0
+    assert local.find_similar_contacts({"title": "instructional designer", "company": "shopify"}, limit=1)[0]["metadata"]["name"] == "Ann"
+
+
+def test_hashing_provider_is_deterministic_and_similarity_aware():
+    provider = HashingEmbeddingProvider(dimensions=256, batch_size=2, max_workers=3)
+    texts = ["Learning Designer at Shopify", "learning designers at shopify", "Backend Engineer at Amazon"]
+
+    vectors = provider.embed(texts)
+
+    assert vectors == HashingEmbeddingProvider(dimensions=256).embed(texts)
+    assert all(len(vector) == 256 for vector in vectors)
+
+    def cosine(a, b):
+        return sum(x * y for x, y in zip(a, b))
+
+    assert cosine(vectors[0], vectors[1]) > 0.3 > cosine(vectors[0], vectors[2])
+
+
+def test_search_history_and_bulk_status_updates(memory):
+    memory.save_contacts({f"c{i}": {"name": f"P{i}"} for i in range(5)})
+    memory.save_search_history("Shopify", "Western", 12)
+
+    assert memory.has_searched_company("Shopify")
+    assert memory.has_searched_company("Shopify", "Western")
+    assert not memory.has_searched_company("Shopify", "McGill")
+    assert not memory.has_searched_company("Amazon")
+
+    assert memory.update_contact_statuses(["c0", "c1", "missing"], "accepted") == 2
+    assert memory.get_status_counts() == {"accepted": 2, "pending": 3}
+    assert memory.get_pending_contacts() == ["c2", "c3", "c4"]
+
+
+def test_existing_chroma_metadata_is_migrated_once(tmp_path):
+    path = str(tmp_path / "chroma")
+    (tmp_path / "old").mkdir()
+    (tmp_path / "new").mkdir()
+    legacy = CoffeeChatMemory(persist_directory=path, embedder=CountingEmbedder(), store=make_store(tmp_path / "old"))
+    legacy.contacts_collection.add(
+        ids=["old1"], embeddings=[[0.1] * 8], documents=["Designer at Shopify. "],
+        metadatas=[{"name": "Old", "relationship_status": "accepted"}]
+    )
+    legacy.interactions_collection.add(
+        ids=["search_1"], embeddings=[[0.1] * 8], documents=["Searched Shopify"],
+        metadatas=[{"type": "search", "company": "Shopify", "school": "Western", "results_count": 3}]
+    )
+
+    memory = CoffeeChatMemory(persist_directory=path, embedder=CountingEmbedder(), store=make_store(tmp_path / "new"))
+
+    assert memory.get_contacts_by_status("accepted")[0]["name"] == "Old"
+    assert memory.has_searched_company("Shopify", "Western")
+    assert memory.get_stats()["total_interactions"] == 0
@@ -0,0 +1,127 @@
+"""
+Contact Rules Tests
+Rule prefilter decisions for ScamDetectionAgent and DataValidator, and
+that only the uncertain band reaches the LLM
+"""
+import os
+import sys
+import asyncio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from modules import contact_rules
+from modules.contact_rules import ACCEPT, REJECT, UNCERTAIN, looks_like_company_name, scam_rules, validation_rules
+from modules.coffee_chat_agents import ScamDetectionAgent
+from modules.data_validator import DataValidator
+
+
+def legacy_looks_like_company_name(name):
+    name = name.strip()
+    if any(name.endswith(i) or f' {i}' in name for i in contact_rules.COMPANY_INDICATORS):
+        return True
+    return (name.isupper() and len(name) > 3) or '&' in name or '@' in name
+
+
+@pytest.mark.parametrize("name", [
+    "Google Inc", "John Cooper", "Acme Co.", "Shopify", "IBM", "AT&T", "Tech Labs", "Alice Johnson",
+    "Jane Doe Consulting", "Coco", "Marco", "Bank of Montreal", "Ltd Brands",
+])
+def test_company_name_rule_matches_legacy_behaviour(name):
+    assert looks_like_company_name(name) == legacy_looks_like_company_name(name)
+
+
+def test_validation_bands():
+    assert validation_rules({'name': 'Alice Johnson', 'company': 'Shopify', 'title': 'PM'})[0] == ACCEPT
+    assert validation_rules({'name': 'Google Inc', 'company': 'John Smith', 'title': 'PM'})[0] == REJECT
+    assert validation_rules({'name': 'x', 'company': 'Shopify'})[0] == REJECT
+    assert validation_rules({'name': 'alice', 'company': 'Shopify', 'title': 'PM'})[0] == UNCERTAIN
+    assert validation_rules({'name': 'Alice Johnson', 'company': 'Shopify', 'title': 'Founder'})[0] == UNCERTAIN
+
+
+def test_scam_bands():
+    trusted = {'connections_count': 500, 'work_history': ['a', 'b']}
+    assert scam_rules(trusted)[0] == ACCEPT
+    assert scam_rules({**trusted, 'has_photo': False})[0] == UNCERTAIN
+    decision, score, flags = scam_rules({'connections_count': 10, 'title': 'Founder', 'work_history': []})
+    assert decision == REJECT and score == 7
+    decision, score, flags = scam_rules({**trusted, 'connections_count': 30})
+    assert decision == UNCERTAIN and score == 3
+
+
+def legacy_analyze_profile(contact, snapshot, ai_risk):
+    """ScamDetectionAgent.analyze_profile before the rule prefilter (LLM answering ai_risk)"""
+    risk_score = 0
+    connections = contact.get('connections_count', 0)
+    if connections < 50:
+        risk_score += 3
+    elif connections > 5000:
+        risk_score += 1
+    if not contact.get('has_photo', True):
+        risk_score += 2
+    if len(contact.get('work_history', [])) < 2:
+        risk_score += 2
+    title = contact.get('title', '').lower()
+    if any(g in title for g in ['entrepreneur', 'founder', 'ceo', 'business owner', 'consultant']) and connections < 100:
+        risk_score += 2
+    if snapshot:
+        risk_score += ai_risk
+    return risk_score < 7
+
+
+@pytest.mark.parametrize("ai_risk", range(6))
+@pytest.mark.parametrize("snapshot", [None, "Crypto trader. Passive income, DM me on telegram"])
+def test_scam_outcomes_match_legacy_analyze_profile(monkeypatch, ai_risk, snapshot):
+    agent = ScamDetectionAgent()
+    monkeypatch.setattr("modules.coffee_chat_agents.llm_gateway.is_available", lambda *args: True)
+    monkeypatch.setattr(agent, "_ai_check", lambda contact, snap: {'risk_score': ai_risk, 'flags': []})
+
+    for connections in (10, 60, 150, 6000):
+        for has_photo in (True, False):
+            for history in ([], ['a', 'b']):
+                for title in ('Founder', 'Instructional Designer'):
+                    contact = {'name': 'A', 'connections_count': connections, 'has_photo': has_photo,
+                               'work_history': history, 'title': title}
+                    expected = legacy_analyze_profile(contact, snapshot, ai_risk)
+                    assert agent.analyze_profile(contact, snapshot)['is_safe'] == expected, contact
+
+
+def test_scam_agent_calls_llm_only_for_uncertain(monkeypatch):
+    agent = ScamDetectionAgent()
+    calls = []
+    monkeypatch.setattr("modules.coffee_chat_agents.llm_gateway.is_available", lambda *args: True)
+    monkeypatch.setattr(agent, "_ai_check", lambda contact, snapshot: calls.append(contact) or {'risk_score': 3, 'flags': ['ai']})
+
+    trusted = {'name': 'A', 'connections_count': 500, 'work_history': ['a', 'b']}
+    assert agent.analyze_profile(trusted, "snapshot")['decided_by'] == 'rules'
+    result = agent.analyze_profile({**trusted, 'has_photo': False}, "snapshot")
+    assert result['decided_by'] == 'llm' and result['risk_score'] == 5 and len(calls) == 1
+
+
+def test_batch_validation_sends_only_uncertain_contacts_to_llm(monkeypatch):
+    prompts = []
+
+    async def acomplete(purpose, messages=None, **kwargs):
+        prompts.append(messages[-1]['content'])
+
+        class Response:
+            text = '{"valid": true, "error": null, "corrections": {}}'
+        return Response()
+
+    monkeypatch.setattr("modules.data_validator.llm_gateway.is_available", lambda *args: True)
+    monkeypatch.setattr("modules.data_validator.llm_gateway.acomplete", acomplete)
+    contacts = [
+        {'name': 'Alice Johnson', 'company': 'Shopify', 'title': 'PM'},
+        {'name': 'ACME TECHNOLOGIES', 'company': 'Jane Doe', 'title': 'PM'},
+        {'name': 'li wei', 'company': 'D2L', 'title': 'Designer'},
+        {'name': '', 'company': 'RBC'},
+    ]
+    before = contact_rules.validation_stage_stats.snapshot()
+    valid, invalid = asyncio.run(DataValidator().validate_batch_with_ai(contacts))
+
+    assert len(prompts) == 1 and 'li wei' in prompts[0]
+    assert [c['name'] for c in valid] == ['Alice Johnson', 'Jane Doe', 'li wei']
+    assert [entry['error'] for entry in invalid] == ['empty_name']
+    delta = contact_rules.validation_stage_stats.log_since(before)
+    assert delta == {'rules_accept': 1, 'rules_reject': 2, 'llm': 1, 'no_llm': 0}
@@ -0,0 +1,70 @@
+"""
+Contacted Index Tests
+Set and Bloom modes over a throwaway SQLite ContactStore
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from modules.contact_store import ContactStore
+from modules.contacted_index import BloomFilter, ContactedIndex
+
+
+def make_store(tmp_path):
+    return ContactStore(sessionmaker(bind=create_engine(f"sqlite:///{tmp_path / 'memory.db'}")))
+
+
+def records(ids):
+    return {contact_id: {'profile_text': contact_id, 'metadata': {'name': contact_id}} for contact_id in ids}
+
+
+@pytest.mark.parametrize("mode", ["set", "bloom"])
+def test_bulk_membership_and_incremental_refresh(tmp_path, mode):
+    store = make_store(tmp_path)
+    store.add_contacts(records([f"url/{i}" for i in range(50)]))
+    index = ContactedIndex(store, path=None, mode=mode, capacity=100, refresh_seconds=0)
+
+    assert index.contacted(["url/1", "url/49", "url/50", "", "url/1"]) == {"url/1", "url/49"}
+
+    # Written by "another process": picked up on the next refresh
+    store.add_contacts(records(["url/50"]))
+    assert "url/50" in index
+    # Written through this process: visible immediately
+    index.add(["url/77"])
+    assert index.contacted(["url/77"]) == ({"url/77"} if mode == "set" else set())
+
+
+def test_snapshot_round_trip(tmp_path):
+    store = make_store(tmp_path)
+    store.add_contacts(records(["a", "b"]))
+    path = tmp_path / "index.bin"
+    ContactedIndex(store, path=str(path)).save()
+
+    store.add_contacts(records(["c"]))
+    reloaded = ContactedIndex(store, path=str(path))
+    assert reloaded.contacted(["a", "b", "c", "d"]) == {"a", "b", "c"}
+
+
+def test_bloom_filter_grows_past_capacity(tmp_path):
+    store = make_store(tmp_path)
+    ids = [f"id-{i}" for i in range(300)]
+    store.add_contacts(records(ids))
+    index = ContactedIndex(store, path=None, mode="bloom", capacity=10)
+
+    assert index.capacity >= 300
+    assert index.contacted(ids + ["missing"]) == set(ids)
+
+
+def test_bloom_filter_false_positive_rate():
+    bloom = BloomFilter(2000, false_positive_rate=0.01)
+    for i in range(2000):
+        bloom.add(f"member-{i}")
+
+    assert all(f"member-{i}" in bloom for i in range(2000))
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
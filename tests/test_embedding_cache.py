@@ -0,0 +1,58 @@
+"""
+Embedding Cache Tests
+float32 round trip, per-model keys and the caching provider wrapper
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from modules.embedding_cache import EmbeddingCache, CachedEmbeddingProvider
+from modules.embedding_provider import EmbeddingProvider
+
+
+class LengthEmbedder(EmbeddingProvider):
+    model = "test-length"
+    dimensions = 3
+
+    def __init__(self):
+        self.embedded = []
+        self.requests_made = 0
+
+    def embed(self, texts):
+        self.embedded.extend(texts)
+        self.requests_made += 1
+        return [[float(len(text)), 0.5, -1.25] for text in texts]
+
+
+def test_vectors_round_trip_per_model(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "emb.db"))
+    cache.put_many("m1", {"hello": [0.1, 0.2, 0.3]})
+
+    found = cache.get_many("m1", ["hello", "missing"])
+    assert list(found) == ["hello"]
+    assert found["hello"] == pytest.approx([0.1, 0.2, 0.3], abs=1e-7)
+    assert cache.get_many("m2", ["hello"]) == {}
+    assert cache.get_stats() == {"hits": 1, "misses": 2, "writes": 1, "hit_rate": pytest.approx(1 / 3)}
+
+    # Persisted across connections
+    cache.close()
+    assert EmbeddingCache(str(tmp_path / "emb.db")).count("m1") == 1
+
+
+def test_cached_provider_only_embeds_misses(tmp_path):
+    inner = LengthEmbedder()
+    provider = CachedEmbeddingProvider(inner, EmbeddingCache(str(tmp_path / "emb.db")))
+
+    assert provider.embed(["a", "bb", "a"]) == [[1.0, 0.5, -1.25], [2.0, 0.5, -1.25], [1.0, 0.5, -1.25]]
+    assert inner.embedded == ["a", "bb"]
+
+    provider.reset_stats()
+    assert provider.embed(["bb", "ccc"])[1] == [3.0, 0.5, -1.25]
+    assert inner.embedded == ["a", "bb", "ccc"]
+
+    stats = provider.get_stats()
+    assert stats["embeddings_avoided"] == 1 and stats["misses"] == 1
+    assert stats["provider_requests"] == 1
@@ -0,0 +1,116 @@
+"""
+Import-Time Budget Tests
+Profiles a cold import of the core modules with `python -X importtime`
+and fails if start-up regresses (heavy libraries loaded eagerly, or
+total import time over budget).
+
+Run directly for the profiling report:
+    python tests/test_import_time.py
+"""
+import os
+import sys
+import subprocess
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.lazy_loader import LazySingleton
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules every Streamlit page load / script start imports
+CORE_MODULES = [
+    "modules.ats_scorer",
+    "modules.cache_manager",
+    "modules.rate_limiter",
+    "modules.checkpoint",
+    "modules.database",
+    "modules.ai_agent",
+]
+
+# Must only be imported when first used
+HEAVY_MODULES = ["spacy", "sklearn", "chromadb"]
+
+# Total cold import budget (override on slow CI machines)
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "2500"))
+
+
+def profile_imports(modules: List[str]) -> List[Tuple[str, int, int, int]]:
+    """
+    Import modules in a fresh interpreter with -X importtime
+
+    Returns:
+        list: (module, self_us, cumulative_us, depth) in import order
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120
+    )
+    assert result.returncode == 0, f"Import failed:\n{result.stderr[-2000:]}"
+
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        timings.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return timings
+
+
+def format_report(timings: List[Tuple[str, int, int, int]], top: int = 20) -> str:
+    """Top-level total plus the slowest imports by cumulative time"""
+    total_ms = sum(cumulative for _, _, cumulative, depth in timings if depth == 0) / 1000
+    lines = [f"Cold import of {len(CORE_MODULES)} core modules: {total_ms:.0f}ms (budget {IMPORT_BUDGET_MS:.0f}ms)"]
+    lines.append(f"{'cumulative':>12} {'self':>9}  module")
+    for name, self_us, cumulative_us, _ in sorted(timings, key=lambda t: -t[2])[:top]:
+        lines.append(f"{cumulative_us / 1000:>10.1f}ms {self_us / 1000:>7.1f}ms  {name}")
+    return "\n".join(lines)
+
+
+def test_heavy_libraries_not_imported_eagerly():
+    imported = {name.split(".")[0] for name, _, _, _ in profile_imports(CORE_MODULES)}
+    eager = [name for name in HEAVY_MODULES if name in imported]
+    assert not eager, f"Imported at module load: {eager}"
+
+
+def test_cold_import_within_budget():
+    timings = profile_imports(CORE_MODULES)
+    total_ms = sum(cumulative for _, _, cumulative, depth in timings if depth == 0) / 1000
+    print("\n" + format_report(timings))
+    assert total_ms <= IMPORT_BUDGET_MS, format_report(timings)
+
+
+def test_lazy_singleton_builds_once_on_first_use():
+    calls = []
+
+    class Service:
+        name = "svc"
+
+        def __call__(self):
+            return "called"
+
+    def factory():
+        calls.append(1)
+        return Service()
+
+    proxy = LazySingleton("test_service", factory)
+    assert not proxy.loaded and calls == []
+
+    assert proxy.name == "svc"
+    assert proxy() == "called"
+    proxy.name = "renamed"
+    assert proxy.get().name == "renamed"
+    assert len(calls) == 1
+
+    proxy.reset()
+    assert not proxy.loaded
+    assert proxy.name == "svc"
+    assert len(calls) == 2
+
+
+if __name__ == "__main__":
+    print(format_report(profile_imports(CORE_MODULES), top=40))
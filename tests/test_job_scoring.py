@@ -0,0 +1,121 @@
+"""
+Job Scoring Tests
+AIAgent.score_jobs_batch: cache split, packing, and per-job fallback, with
+the LLM gateway replaced by a scripted fake (no network, no Redis / SQL)
+"""
+import os
+import re
+import sys
+import json
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from modules.ai_agent import AIAgent
+from modules.score_cache import ScoreCache
+from modules.single_flight import SingleFlight
+
+RESUME = "EdTech and L&D professional"
+
+
+def make_jobs(n):
+    return [{"title": f"Job {i}", "company": f"Company {i}", "description": f"Posting {i}"} for i in range(n)]
+
+
+class FakeLLM:
+    """Scores "Job N" as N; packed answers leave out / break the jobs listed in drop / broken"""
+
+    def __init__(self, drop=(), broken=(), invalid=False):
+        self.drop = set(drop)
+        self.broken = set(broken)
+        self.invalid = invalid
+        self.packed = []   # job titles per packed request
+        self.single = []   # job title per single request
+        self._lock = threading.Lock()
+
+    def complete(self, purpose, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        if "Jobs (JSON array):" in prompt:
+            jobs = json.loads(prompt.split("Jobs (JSON array):\n", 1)[1].split("\n", 1)[0])
+            with self._lock:
+                self.packed.append([job["title"] for job in jobs])
+            if self.invalid:
+                return Response('{"results": [')
+            results = []
+            for job in jobs:
+                n = int(job["title"].split()[1])
+                if n in self.drop:
+                    continue
+                if n in self.broken:
+                    results.append({"id": job["id"], "reasoning": "no score"})
+                    continue
+                results.append({"id": job["id"], "score": n, "reasoning": "packed"})
+            results.append({"id": 99, "score": 0, "reasoning": "unknown id"})
+            return Response(json.dumps({"results": results}))
+
+        title = re.search(r"Title: (.*)", prompt).group(1)
+        with self._lock:
+            self.single.append(title)
+        return Response(json.dumps({"score": int(title.split()[1]), "reasoning": "single"}))
+
+
+class Response:
+    def __init__(self, text):
+        self.text = text
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    agent = AIAgent()
+    agent.score_cache = ScoreCache(use_redis=False, use_sql=False)
+    agent._score_flight = SingleFlight("score_job_test")
+    return agent
+
+
+def use_llm(monkeypatch, fake):
+    monkeypatch.setattr("modules.ai_agent.llm_gateway.complete", fake.complete)
+    return fake
+
+
+def test_partial_pack_falls_back_only_for_missing_jobs(agent, monkeypatch):
+    fake = use_llm(monkeypatch, FakeLLM(drop={1}, broken={3}))
+    jobs = make_jobs(5)
+
+    results = agent.score_jobs_batch(jobs, RESUME, pack_size=5)
+
+    assert [r["score"] for r in results] == [0, 1, 2, 3, 4]
+    assert [r["reasoning"] for r in results] == ["packed", "single", "packed", "single", "packed"]
+    assert fake.packed == [[job["title"] for job in jobs]]
+    assert sorted(fake.single) == ["Job 1", "Job 3"]
+
+
+def test_invalid_pack_json_falls_back_for_every_job(agent, monkeypatch):
+    fake = use_llm(monkeypatch, FakeLLM(invalid=True))
+
+    results = agent.score_jobs_batch(make_jobs(3), RESUME, pack_size=3)
+
+    assert results == [{"score": i, "reasoning": "single"} for i in range(3)]
+    assert len(fake.packed) == 1 and sorted(fake.single) == ["Job 0", "Job 1", "Job 2"]
+
+
+def test_cached_jobs_skip_the_llm_and_misses_are_chunked(agent, monkeypatch):
+    fake = use_llm(monkeypatch, FakeLLM())
+    jobs = make_jobs(7)
+    for i in (0, 4):
+        agent.score_cache.set(agent._score_cache_key(jobs[i], RESUME), {"score": 10, "reasoning": "cached"})
+
+    results = agent.score_jobs_batch(jobs, RESUME, concurrency=3, pack_size=2)
+
+    assert [r["score"] for r in results] == [10, 1, 2, 3, 10, 5, 6]
+    # 5 misses in packs of 2: two packed requests, the last lone job scored on its own
+    assert sorted(fake.packed) == [["Job 1", "Job 2"], ["Job 3", "Job 5"]]
+    assert fake.single == ["Job 6"]
+
+    # Everything is cached now
+    fake.packed.clear()
+    fake.single.clear()
+    assert agent.score_jobs_batch(jobs, RESUME, pack_size=2) == results
+    assert fake.packed == [] and fake.single == []
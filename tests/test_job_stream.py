@@ -0,0 +1,93 @@
+"""
+Job Streaming Tests
+JobScraper.stream_jobs / scrape_and_save against a local dataset fixture
+(no Apify, no Redis: the cache runs in DEMO mode)
+"""
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("APIFY_API_TOKEN", "test-token")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import modules.job_scraper as job_scraper_module
+from modules.cache_manager import CacheManager
+from modules.database import Base, Job
+from modules.job_scraper import JobScraper, JsonFileDataset
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "apify_indeed_items.json")
+
+# Fixture dates are fixed, so widen the window to cover them but not the 2001 posting
+DAYS_AGO = (datetime.utcnow() - datetime(2026, 9, 1)).days
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    monkeypatch.setenv("CACHE_SQL_TIER", "false")
+    monkeypatch.setattr(job_scraper_module, "cache_manager", CacheManager())
+    return JobScraper()
+
+
+def test_stream_yields_bounded_chunks_and_tracks_offset(scraper):
+    chunks = []
+    offsets = []
+    for chunk in scraper.stream_jobs(JsonFileDataset(FIXTURE), days_ago=DAYS_AGO, chunk_size=2):
+        chunks.append(chunk)
+        offsets.append(scraper.last_offset)
+
+    assert offsets == [2, 4, 6]
+    assert all(len(chunk) <= 2 for chunk in chunks)
+
+    urls = [job["job_url"] for chunk in chunks for job in chunk]
+    # Missing URL and the 2001 posting are dropped; the undated job is kept and flagged
+    assert urls == [
+        "https://ca.indeed.com/viewjob?jk=fixture001",
+        "https://ca.indeed.com/viewjob?jk=fixture002",
+        "https://ca.indeed.com/viewjob?jk=fixture003",
+        "https://ca.indeed.com/viewjob?jk=fixture006",
+    ]
+    jobs = {job["job_url"]: job for chunk in chunks for job in chunk}
+    assert jobs["https://ca.indeed.com/viewjob?jk=fixture003"]["_date_unknown"]
+    assert jobs["https://ca.indeed.com/viewjob?jk=fixture001"]["posted_date"].tzinfo is None
+
+
+def test_stream_resumes_from_offset(scraper):
+    resumed = [job["job_url"] for chunk in scraper.stream_jobs(JsonFileDataset(FIXTURE), days_ago=DAYS_AGO, start_offset=4) for job in chunk]
+    assert resumed == ["https://ca.indeed.com/viewjob?jk=fixture006"]
+    assert scraper.last_offset == 6
+
+
+def test_scrape_and_save_writes_each_chunk(scraper, tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    Base.metadata.create_all(bind=engine, tables=[Job.__table__])
+    monkeypatch.setattr(job_scraper_module, "SessionLocal", sessionmaker(bind=engine))
+
+    result = scraper.scrape_and_save(JsonFileDataset(FIXTURE), days_ago=DAYS_AGO, chunk_size=2)
+
+    assert result["saved"] == 4
+    assert result["next_offset"] == 6
+    assert "error" not in result
+
+
+def test_scrape_and_save_processes_chunks_before_saving(scraper, tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    Base.metadata.create_all(bind=engine, tables=[Job.__table__])
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(job_scraper_module, "SessionLocal", factory)
+    chunk_sizes = []
+
+    def score(chunk):
+        chunk_sizes.append(len(chunk))
+        for job in chunk:
+            job["match_score"] = 7
+
+    result = scraper.scrape_and_save(JsonFileDataset(FIXTURE), days_ago=DAYS_AGO, chunk_size=2, process_chunk=score)
+
+    assert result["jobs"] == 4 and sum(chunk_sizes) == 4 and max(chunk_sizes) <= 2
+    session = factory()
+    assert {job.match_score for job in session.query(Job)} == {7}
+    session.close()
@@ -0,0 +1,135 @@
+"""
+LLM Gateway Tests
+Routing, hedging, fallback, 429 retry and accounting with the provider
+call replaced by a scripted fake (no network)
+"""
+import os
+import sys
+import time
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from modules import llm_gateway as gateway_module
+from modules.llm_gateway import LLMError, LLMGateway, LLMResponse, RateLimited, TokenBucket
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+@pytest.fixture
+def both_providers(monkeypatch):
+    monkeypatch.setattr(LLMGateway, "provider_available", staticmethod(lambda provider: True))
+
+
+def make_gateway(monkeypatch, send, **route):
+    gateway = LLMGateway({"test": {"concurrency": 4, "rpm": 0, "timeout": 5, "hedge_after": None, **route}})
+    monkeypatch.setattr(gateway, "_send", send)
+    return gateway
+
+
+def test_falls_back_to_other_provider(monkeypatch, both_providers):
+    calls = []
+
+    def send(model, request):
+        calls.append(model)
+        if model == "gpt-4o-mini":
+            raise ConnectionError("down")
+        return LLMResponse("from gemini", "gemini", model, prompt_tokens=1000, completion_tokens=1000)
+
+    gateway = make_gateway(monkeypatch, send)
+    response = gateway.complete("test", MESSAGES, model="gpt-4o-mini")
+
+    assert calls == ["gpt-4o-mini", "gemini-2.5-flash"]
+    assert response.text == "from gemini" and response.fallback
+    stats = gateway.get_stats()
+    assert stats["test/gpt-4o-mini"]["errors"] == 1
+    assert stats["test/gemini-2.5-flash"]["cost"] == pytest.approx((1000 * 0.30 + 1000 * 2.50) / 1e6)
+
+
+def test_raises_when_every_provider_fails(monkeypatch, both_providers):
+    def send(model, request):
+        raise ConnectionError("down")
+
+    with pytest.raises(LLMError):
+        make_gateway(monkeypatch, send).complete("test", MESSAGES, model="gpt-4o-mini")
+
+
+def test_slow_request_is_hedged(monkeypatch):
+    monkeypatch.setattr(LLMGateway, "provider_available", staticmethod(lambda provider: provider == "openai"))
+    attempts = []
+    lock = threading.Lock()
+
+    def send(model, request):
+        with lock:
+            attempts.append(model)
+            first = len(attempts) == 1
+        time.sleep(1.0 if first else 0.01)
+        return LLMResponse("slow" if first else "fast", "openai", model)
+
+    gateway = make_gateway(monkeypatch, send, hedge_after=0.05)
+    start = time.perf_counter()
+    response = gateway.complete("test", MESSAGES, model="gpt-4o-mini")
+
+    assert response.text == "fast" and response.hedged
+    assert time.perf_counter() - start < 0.5
+    assert gateway.get_stats()["test/gpt-4o-mini"]["hedge_wins"] == 1
+
+
+def test_hedge_pool_has_a_worker_per_hedged_slot(monkeypatch):
+    monkeypatch.setattr(LLMGateway, "provider_available", staticmethod(lambda provider: provider == "openai"))
+    release = threading.Event()
+    attempts = []
+    lock = threading.Lock()
+
+    def send(model, request):
+        with lock:
+            attempts.append(model)
+            first = len(attempts) == 1
+        if first:
+            release.wait(5)
+        return LLMResponse("slow" if first else "fast", "openai", model)
+
+    gateway = make_gateway(monkeypatch, send, concurrency=2, hedge_after=0.05)
+    assert gateway._hedge_pool._max_workers == 2
+
+    assert gateway.complete("test", MESSAGES, model="gpt-4o-mini").hedged
+    # The losing request is still in flight and keeps its slot
+    slots = gateway._route("test").slots
+    assert slots.acquire(blocking=False)
+    assert not slots.acquire(blocking=False)
+    slots.release()
+
+    release.set()
+    deadline = time.monotonic() + 2
+    for _ in range(2):
+        while not slots.acquire(blocking=False):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+
+def test_rate_limited_requests_are_retried(monkeypatch):
+    monkeypatch.setattr(LLMGateway, "provider_available", staticmethod(lambda provider: provider == "openai"))
+    monkeypatch.setattr(gateway_module, "RATE_LIMIT_BASE_DELAY", 0.001)
+    attempts = []
+
+    def send(model, request):
+        attempts.append(model)
+        if len(attempts) < 3:
+            raise RateLimited("429", retry_after=0.001)
+        return LLMResponse("ok", "openai", model)
+
+    gateway = LLMGateway({"test": {"concurrency": 1, "rpm": 0, "timeout": 5}})
+    monkeypatch.setattr(gateway, "_send", send)
+    assert gateway.complete("test", MESSAGES, model="gpt-4o-mini").text == "ok"
+    assert len(attempts) == 3
+
+
+def test_token_bucket_paces_after_burst():
+    bucket = TokenBucket(rpm=600, burst=2)  # 10/s
+    start = time.perf_counter()
+    for _ in range(4):
+        bucket.acquire()
+    assert 0.15 < time.perf_counter() - start < 0.5
+    assert not bucket.try_acquire()
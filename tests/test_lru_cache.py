@@ -0,0 +1,56 @@
+"""
+LRU Cache Tests
+Eviction order, TTL expiry and byte accounting
+"""
+import os
+import sys
+import json
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.lru_cache import LRUCache
+
+
+def test_evicts_least_recently_used():
+    lru = LRUCache(max_entries=2)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    lru.get("a")
+    lru.set("c", 3)
+
+    assert "a" in lru and "c" in lru
+    assert "b" not in lru
+    assert lru.get_stats()["evictions"] == 1
+
+
+def test_ttl_expiry():
+    lru = LRUCache(max_entries=10, ttl_seconds=0.05)
+    lru.set("a", 1)
+    assert lru.get("a") == 1
+
+    time.sleep(0.06)
+    assert lru.get("a") is None
+    assert lru.get_stats()["expirations"] == 1
+    assert len(lru) == 0
+
+
+def test_byte_limit_bounds_memory():
+    lru = LRUCache(max_entries=10_000, max_bytes=1_000, sizeof=lambda v: len(json.dumps(v)))
+    for i in range(500):
+        lru.set(i, {"score": i, "missing_keywords": ["python", "sql", "aws"]})
+
+    stats = lru.get_stats()
+    assert stats["bytes"] <= 1_000
+    assert stats["evictions"] > 0
+    assert lru.get(499) is not None
+
+
+def test_replace_updates_byte_count():
+    lru = LRUCache(max_entries=10, sizeof=len)
+    lru.set("a", "x" * 10)
+    lru.set("a", "x" * 3)
+    assert lru.get_stats()["bytes"] == 3
+
+    lru.delete("a")
+    assert lru.get_stats()["bytes"] == 0
@@ -0,0 +1,76 @@
+"""
+Rate Limiter Tests
+Reserve/commit against a throwaway SQLite state file, including
+concurrent workers in separate processes
+"""
+import os
+import sys
+import json
+import multiprocessing
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.rate_limiter import RateLimiter, CONNECTION, NOTE
+
+
+def test_reserve_commit_release(tmp_path):
+    limiter = RateLimiter(str(tmp_path / 'limits.db'))
+    limiter.note_limit = 2
+
+    first = limiter.reserve(NOTE)
+    second = limiter.reserve(NOTE)
+    assert first and second
+    assert limiter.reserve(NOTE) is None
+    assert limiter.get_remaining()['notes'] == 0
+
+    first.commit()
+    second.release()
+    assert limiter.get_status()['notes_sent'] == 1
+    with limiter.reserve(NOTE) as third:
+        assert third is not None
+    # Released on exit without commit
+    assert limiter.get_remaining()['notes'] == 1
+
+
+def test_expired_reservations_are_reclaimed(tmp_path):
+    limiter = RateLimiter(str(tmp_path / 'limits.db'))
+    limiter.daily_limit = 1
+
+    assert limiter.reserve(CONNECTION, ttl_seconds=-1) is not None
+    assert limiter.reserve(CONNECTION) is not None
+
+
+def test_imports_legacy_json_state(tmp_path):
+    (tmp_path / 'limits.json').write_text(json.dumps({
+        'date': str(date.today()), 'connections_sent': 7, 'notes_sent': 2
+    }))
+    limiter = RateLimiter(str(tmp_path / 'limits.db'))
+    assert limiter.get_remaining() == {'connections': 13, 'notes': 3}
+    assert not (tmp_path / 'limits.json').exists()
+
+
+def _send_until_full(path, results):
+    limiter = RateLimiter(path)
+    sent = 0
+    while True:
+        slot = limiter.reserve(CONNECTION)
+        if slot is None:
+            break
+        slot.commit()
+        sent += 1
+    results.put(sent)
+
+
+def test_concurrent_processes_never_exceed_limit(tmp_path):
+    path = str(tmp_path / 'limits.db')
+    RateLimiter(path)
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=_send_until_full, args=(path, results)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+
+    assert sum(results.get(timeout=5) for _ in workers) == 20
+    assert RateLimiter(path).get_status()['connections_sent'] == 20
@@ -0,0 +1,65 @@
+"""
+Job Save Tests
+Bulk and per-row JobScraper.save_jobs_to_db against a temporary SQLite database
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("APIFY_API_TOKEN", "test-token")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import modules.job_scraper as job_scraper_module
+from modules.database import Base, Job
+from modules.job_scraper import JobScraper
+
+
+def make_job(i: int) -> dict:
+    return {
+        "title": f"Instructional Designer {i}",
+        "company": f"EdTech Co {i}",
+        "location": "Toronto, ON",
+        "description": "Design learning experiences.",
+        "job_url": f"https://example.com/job/{i}",
+        "_date_unknown": True,  # Scraper flag, not a column
+    }
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    Base.metadata.create_all(bind=engine, tables=[Job.__table__])
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(job_scraper_module, "SessionLocal", factory)
+    return factory
+
+
+@pytest.mark.parametrize("bulk", [True, False])
+def test_save_jobs_skips_existing_and_assigns_ids(session_factory, bulk):
+    scraper = JobScraper()
+    assert scraper.save_jobs_to_db([make_job(0), make_job(1)], bulk=bulk) == 2
+
+    jobs = [make_job(i) for i in range(4)] + [make_job(3)]
+    assert scraper.save_jobs_to_db(jobs, bulk=bulk) == 2
+
+    assert jobs[2]["id"] and jobs[3]["id"]
+    db = session_factory()
+    try:
+        assert db.query(Job).count() == 4
+        assert db.get(Job, jobs[3]["id"]).job_url == jobs[3]["job_url"]
+    finally:
+        db.close()
+
+
+def test_bulk_save_isolates_bad_rows(session_factory):
+    jobs = [make_job(0), dict(make_job(1), posted_date="not a datetime"), make_job(2), {"title": "No URL"}]
+    assert JobScraper().save_jobs_to_db(jobs) == 2
+
+    db = session_factory()
+    try:
+        assert {url for (url,) in db.query(Job.job_url)} == {jobs[0]["job_url"], jobs[2]["job_url"]}
+    finally:
+        db.close()
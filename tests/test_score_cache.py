@@ -0,0 +1,47 @@
+"""
+Score Cache Tests
+Key stability and in-process tier behaviour (no Redis / SQL needed)
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.score_cache import ScoreCache
+
+
+JOB = {
+    "title": "Instructional Designer",
+    "company": "EdTech Corp",
+    "location": "Toronto, ON",
+    "description": "Design   courses\nwith AI tools.",
+    "is_remote": True,
+}
+
+
+def test_key_ignores_cosmetic_differences():
+    rescraped = dict(JOB, title="  instructional designer ", description="Design courses with AI tools.")
+    assert ScoreCache.make_key(JOB, "EdTech pro", "v1", "gpt-4o-mini") == \
+        ScoreCache.make_key(rescraped, "EdTech pro", "v1", "gpt-4o-mini")
+
+
+def test_key_changes_with_prompt_model_and_resume():
+    base = ScoreCache.make_key(JOB, "EdTech pro", "v1", "gpt-4o-mini")
+    assert base != ScoreCache.make_key(JOB, "EdTech pro", "v2", "gpt-4o-mini")
+    assert base != ScoreCache.make_key(JOB, "EdTech pro", "v1", "gpt-4o")
+    assert base != ScoreCache.make_key(JOB, "Data scientist", "v1", "gpt-4o-mini")
+    assert base != ScoreCache.make_key(dict(JOB, description="Something else"), "EdTech pro", "v1", "gpt-4o-mini")
+
+
+def test_lru_tier_hits_and_misses():
+    cache = ScoreCache(use_redis=False, use_sql=False)
+    key = ScoreCache.make_key(JOB, "EdTech pro", "v1", "gpt-4o-mini")
+
+    assert cache.get(key) is None
+    cache.set(key, {"score": 8, "reasoning": "Good match"})
+    assert cache.get(key) == {"score": 8, "reasoning": "Good match"}
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
@@ -0,0 +1,90 @@
+"""
+Single-Flight Tests
+In-process coalescing of concurrent identical calls, error propagation and
+the cross-process Redis lock (against fakeredis)
+"""
+import os
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from modules.single_flight import SingleFlight, get_single_flight_stats
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight("test_shared")
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"score": 8}
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        leader = pool.submit(flight.do, "job-1", slow)
+        started.wait(5)
+        followers = [pool.submit(flight.do, "job-1", slow) for _ in range(4)]
+        # Followers are registered on the leader's future before it finishes
+        while flight.get_stats()["coalesced"] < 4:
+            time.sleep(0.01)
+        release.set()
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert calls == [1]
+    assert results == [{"score": 8}] * 5
+    stats = flight.get_stats()
+    assert stats["calls"] == 5 and stats["executed"] == 1 and stats["saved"] == 4
+    assert stats["in_flight"] == 0
+    assert get_single_flight_stats()["test_shared"]["saved"] == 4
+
+
+def test_completed_calls_are_not_cached_and_errors_propagate():
+    flight = SingleFlight("test_errors")
+    assert flight.do("k", lambda: 1) == 1
+    assert flight.do("k", lambda: 2) == 2
+
+    def boom():
+        raise RuntimeError("API down")
+
+    with pytest.raises(RuntimeError):
+        flight.do("k", boom)
+    assert flight.get_stats()["errors"] == 1
+    assert flight.do("k", lambda: 3) == 3
+
+
+def test_waits_on_remote_lock_holder_via_recheck():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis()
+    flight = SingleFlight("test_remote", redis=lambda: client, distributed=True, poll_interval_seconds=0.01)
+
+    # Another process holds the lock and publishes its result after a moment
+    client.set("single_flight:test_remote:job-1", "other", px=5000)
+    shared = {}
+    threading.Timer(0.05, lambda: shared.update(value={"score": 7})).start()
+
+    result = flight.do("job-1", lambda: pytest.fail("should not compute"), recheck=lambda: shared.get("value"))
+
+    assert result == {"score": 7}
+    assert flight.get_stats()["remote_coalesced"] == 1
+
+
+def test_remote_lock_timeout_computes_locally():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis()
+    flight = SingleFlight(
+        "test_timeout", redis=client, distributed=True,
+        wait_timeout_seconds=0.05, poll_interval_seconds=0.01
+    )
+    client.set("single_flight:test_timeout:job-1", "stuck", px=5000)
+
+    assert flight.do("job-1", lambda: {"score": 4}, recheck=lambda: None) == {"score": 4}
+    stats = flight.get_stats()
+    assert stats["lock_timeouts"] == 1 and stats["executed"] == 1
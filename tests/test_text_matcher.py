@@ -0,0 +1,75 @@
+"""
+Text Matcher Tests
+KeywordMatcher (both engines) against brute-force substring search
+"""
+import os
+import sys
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from modules import text_matcher
+from modules.text_matcher import KeywordMatcher
+
+
+@pytest.fixture(params=["keywords", "automaton"])
+def engine(request, monkeypatch):
+    if request.param == "automaton":
+        monkeypatch.setattr(text_matcher, "AUTOMATON_MIN_KEYWORDS", 1)
+    return request.param
+
+
+def brute_force(keywords, text):
+    lowered = text.lower()
+    return sorted(
+        (i, i + len(k), k) for k in keywords for i in range(len(text)) if lowered.startswith(k.lower(), i)
+    )
+
+
+def test_matches_every_overlapping_occurrence(engine):
+    rng = random.Random(5)
+    keywords = ["a", "ab", "abc", "bca", "c", "cab", "bb", "abcab"]
+    matcher = KeywordMatcher(keywords)
+    assert (matcher._regex is not None) == (engine == "automaton")
+    for _ in range(200):
+        text = "".join(rng.choice("abcAB ") for _ in range(rng.randint(0, 40)))
+        assert sorted((m.start, m.end, m.keyword) for m in matcher.finditer(text)) == brute_force(keywords, text)
+        assert matcher.contains_any(text) == bool(brute_force(keywords, text))
+
+
+def test_whole_words_labels_and_case(engine):
+    matcher = KeywordMatcher.from_groups(
+        {"tech": ["ai", "machine learning"], "ld": ["learning", "ld"]}, whole_words=True
+    )
+    text = "AI-first L&D team; maintain machine learning + learning-design (LD)"
+    assert matcher.labels_in(text) == {"tech": ["ai", "machine learning"], "ld": ["learning", "ld"]}
+    assert list(matcher.first_hits(text)) == ["ai", "machine learning", "learning", "ld"]
+    assert matcher.first_hits(text)["learning"].start == text.index("learning")
+    assert not matcher.contains_any("maintained rigorously")
+    assert KeywordMatcher.from_groups({"x": ["ab", "zz"], "y": ["q"]}).labels_found("xxABc") == {"x"}
+
+    exact = KeywordMatcher(["Co", "Inc"], case_sensitive=True)
+    assert exact.keywords_in("Cooper Inc co inc") == {"Co", "Inc"}
+    assert KeywordMatcher([]).find_all("anything") == []
+
+
+def test_call_sites_keep_legacy_results(monkeypatch):
+    monkeypatch.setenv("APIFY_API_TOKEN", "test")
+    from modules.job_scraper import JobScraper
+    from modules.hidden_job_detector import HiddenJobDetector
+
+    scraper = JobScraper.__new__(JobScraper)
+    assert scraper._categorize_job("Trainer", "Run LMS onboarding") == "edtech"
+    assert scraper._categorize_job("Ops", "Zapier and professional development") == "automation"
+    assert scraper._categorize_job("Chef", "Kitchen") == "other"
+    assert scraper.extract_company_domain("https://careers.boards.greenhouse.io/x") is None
+    assert scraper.extract_company_domain("https://jobs.shopify.com/apply") == "shopify.com"
+
+    post = "Big news: We're Hiring! Join our team as we keep growing team and hiring in Toronto."
+    signals = HiddenJobDetector()._analyze_post(post)
+    assert [(s['keyword'], s['strength']) for s in signals] == [
+        ('hiring', 'strong'), ("we're hiring", 'strong'), ('join our team', 'strong'), ('growing team', 'medium')
+    ]
+    assert signals[0]['context'] == "..." + post[:post.index("Hiring") + len("hiring") + 50] + "..."
@@ -0,0 +1,65 @@
+"""
+Tiered Cache Tests
+L1 + SQL tiers (no Redis) against a temporary SQLite cache_entries table
+"""
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import modules.database as database
+from modules.database import Base, CacheEntry
+from modules.tiered_cache import TieredCache, get_write_behind, purge_expired_cache_entries
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine, tables=[CacheEntry.__table__])
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(database, "SessionLocal", factory)
+    return factory
+
+
+def test_works_with_only_the_in_process_tier():
+    cache = TieredCache("job", "job", use_sql=False)
+    cache.set("job:a", {"title": "A"})
+    value = cache.get("job:a")
+    value["title"] = "mutated"
+
+    assert cache.get("job:a") == {"title": "A"}
+    assert cache.get("job:missing") is None
+    assert cache.get_stats()["lru_hits"] == 2
+
+
+def test_sql_tier_write_behind_and_read_through(session_factory):
+    long_key = "job:" + "x" * 300
+    TieredCache("job", "job").set_many({"job:a": {"title": "A"}, long_key: {"title": "Long"}})
+    get_write_behind().flush()
+
+    cold = TieredCache("job", "job")
+    assert cold.get_many(["job:a", long_key, "job:missing"]) == {"job:a": {"title": "A"}, long_key: {"title": "Long"}}
+    assert cold.get_stats()["sql_hits"] == 2
+    assert cold.get("job:a") == {"title": "A"}
+    assert cold.get_stats()["lru_hits"] == 1
+
+
+def test_sweeper_purges_expired_rows_in_batches(session_factory):
+    db = session_factory()
+    now = datetime.utcnow()
+    for i in range(5):
+        db.add(CacheEntry(cache_key=f"job:old{i}", cache_value={}, cache_type="job", expires_at=now - timedelta(days=1)))
+    db.add(CacheEntry(cache_key="job:live", cache_value={}, cache_type="job", expires_at=now + timedelta(days=1)))
+    db.commit()
+    db.close()
+
+    assert purge_expired_cache_entries(batch_size=2) == 5
+
+    db = session_factory()
+    assert [key for (key,) in db.query(CacheEntry.cache_key)] == ["job:live"]
+    db.close()